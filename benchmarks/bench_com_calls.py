@@ -0,0 +1,131 @@
+"""
+Μέτρηση των κλήσεων COM της μηχανής Excel/COM σε συνθετικό βιβλίο, με το εικονικό object
+model του fake_excel (χωρίς Windows και Excel): κλήσεις ανά φάση και ανά μέλος, και
+προαιρετικά καθυστέρηση ανά κλήση για εκτίμηση του χρόνου σε πραγματικό Excel.
+
+    python benchmarks/bench_com_calls.py --rows 2000 --write-mode rebuild [--latency-us 200] [--max-calls 5000] [--verify]
+
+Με --max-calls ο κωδικός εξόδου είναι 1 αν οι κλήσεις ξεπεράσουν το όριο (έλεγχος παλινδρόμησης).
+Με --verify η έξοδος συγκρίνεται (τιμές και τύποι κελιών) με τη μηχανή OOXML για το ίδιο split
+seed, και επιπλέον σε ένα βιβλίο δύο φύλλων με τύπους (σύνολα, σωρευτικά σύνολα, αναφορές στο
+άλλο φύλλο) που πρέπει να προσαρμοστούν στις εισαγόμενες γραμμές· αν διαφέρουν, ο κωδικός εξόδου είναι 1.
+"""
+import os
+import re
+import sys
+import html
+import json
+import time
+import argparse
+import tempfile
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_excel import FakeExcel
+from benchmarks.synthetic import write_invoice_workbook
+from modules.excel_processor import ExcelProcessor, BACKEND_COM, BACKEND_OOXML, WRITE_MODES, WRITE_MODE_REBUILD
+from modules.ooxml_backend import OoxmlWorkbook, column_index
+
+PROCESS_KWARGS = {'threshold': 500, 'value_col': 6, 'prop_cols': [8], 'max_split_value': 500, 'overwrite': True}
+# Το βιβλίο με τύπους του --verify: γραμμή "Σύνολα" ανά 50 γραμμές σε δύο φύλλα.
+FORMULA_WORKBOOK = {'totals_every': 50, 'sheets': 2, 'formulas': True}
+_FORMULA_CELL_RE = re.compile(r'<(?:[\w.-]+:)?c r="([A-Z]+)(\d+)"[^>]*>\s*<(?:[\w.-]+:)?f>([^<]*)</')
+
+
+def read_values(path):
+    """
+    Οι τιμές όλων των φύλλων ενός βιβλίου: {φύλλο: {γραμμή: {στήλη: τιμή}}}. Για τα κελιά με
+    τύπο η τιμή είναι ο τύπος ('=...'), αφού το εικονικό Excel δεν υπολογίζει τύπους.
+    """
+    with OoxmlWorkbook(path) as workbook, zipfile.ZipFile(path) as package:
+        values = {}
+        for sheet in workbook.sheets:
+            sheet_values = values[sheet.name] = {row: {col: value for col, value in cells.items() if value not in (None, '')}
+                                                 for row, cells in workbook.iter_rows(sheet)}
+            for letters, row, formula in _FORMULA_CELL_RE.findall(package.read(sheet.part).decode('utf-8')):
+                sheet_values.setdefault(int(row), {})[column_index(letters)] = '=' + html.unescape(formula)
+        return values
+
+
+def count_mismatches(processor, input_path, tmp, write_mode, seed):
+    """Οι γραμμές στις οποίες η έξοδος της μηχανής COM διαφέρει από της OOXML (None αν η COM απέτυχε)."""
+    com_output = os.path.join(tmp, 'verify_com.xlsx')
+    ooxml_output = os.path.join(tmp, 'verify_ooxml.xlsx')
+    results = processor.process_file(input_path, com_output, backend=BACKEND_COM, write_mode=write_mode, split_seed=seed, **PROCESS_KWARGS)
+    if results['errors']: return None
+    ExcelProcessor(None).process_file(input_path, ooxml_output, backend=BACKEND_OOXML, split_seed=seed, **PROCESS_KWARGS)
+    com_values, ooxml_values = read_values(com_output), read_values(ooxml_output)
+    return sum(1 for sheet in set(com_values) | set(ooxml_values)
+               for row in set(com_values.get(sheet, {})) | set(ooxml_values.get(sheet, {}))
+               if com_values.get(sheet, {}).get(row, {}) != ooxml_values.get(sheet, {}).get(row, {}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--write-mode', default=WRITE_MODE_REBUILD, choices=WRITE_MODES)
+    parser.add_argument('--latency-us', type=float, default=0.0, help="Καθυστέρηση ανά κλήση COM (μs)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--top', type=int, default=10, help="Πόσα μέλη εμφανίζονται")
+    parser.add_argument('--max-calls', type=int, default=None, help="Όριο κλήσεων COM (κωδικός εξόδου 1 αν ξεπεραστεί)")
+    parser.add_argument('--verify', action='store_true', help="Σύγκριση της εξόδου με τη μηχανή OOXML")
+    parser.add_argument('--json', action='store_true', help="Έξοδος σε JSON")
+    args = parser.parse_args()
+
+    fake = FakeExcel(latency=args.latency_us / 1e6)
+    processor = ExcelProcessor(None, com_dispatch=fake)
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, 'invoices.xlsx')
+        write_invoice_workbook(input_path, args.rows, seed=args.seed)
+        com_output = os.path.join(tmp, 'com.xlsx')
+        start = time.perf_counter()
+        results = processor.process_file(input_path, com_output, backend=BACKEND_COM, write_mode=args.write_mode,
+                                         split_seed=args.seed, row_progress_callback=fake.stats.on_progress, **PROCESS_KWARGS)
+        elapsed = time.perf_counter() - start
+        mismatches = formula_mismatches = None
+        if args.verify and results['errors'] == 0:
+            verifier = ExcelProcessor(None, com_dispatch=FakeExcel())
+            mismatches = count_mismatches(verifier, input_path, tmp, args.write_mode, args.seed)
+            formula_path = os.path.join(tmp, 'formulas.xlsx')
+            write_invoice_workbook(formula_path, args.rows, seed=args.seed, **FORMULA_WORKBOOK)
+            formula_mismatches = count_mismatches(verifier, formula_path, tmp, args.write_mode, args.seed)
+
+    stats = fake.stats
+    report = {
+        'rows': args.rows,
+        'write_mode': args.write_mode,
+        'latency_us': args.latency_us,
+        'split_rows': results['split_rows'],
+        'errors': results['errors'],
+        'calls': stats.total(),
+        'calls_per_row': stats.total() / max(args.rows, 1),
+        'calls_by_phase': stats.by_phase(),
+        'insert_calls': sum(count for member, count in stats.by_member().items() if member.endswith('.Insert')),
+        'top_members': dict(list(stats.by_member().items())[:args.top]),
+        'seconds': elapsed,
+        'mismatched_rows': mismatches,
+        'mismatched_formula_rows': formula_mismatches,
+    }
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print(f"Γραμμές: {report['rows']}, διασπάσεις: {report['split_rows']}, σφάλματα: {report['errors']} ({report['write_mode']})")
+        print(f"Κλήσεις COM: {report['calls']} ({report['calls_per_row']:.2f} ανά γραμμή), χρόνος: {report['seconds']:.2f}s")
+        print(f"Κλήσεις εισαγωγής γραμμών (EntireRow.Insert): {report['insert_calls']}")
+        for phase, count in report['calls_by_phase'].items():
+            print(f"  {phase:<8} {count}")
+        for member, count in report['top_members'].items():
+            print(f"  {member:<28} {count}")
+        if args.verify:
+            print(f"Διαφορές με τη μηχανή OOXML: {mismatches} γραμμές, στο βιβλίο με τύπους: {formula_mismatches} γραμμές")
+    if args.verify and (mismatches or formula_mismatches or None in (mismatches, formula_mismatches)):
+        print("Η έξοδος της μηχανής COM διαφέρει από της OOXML", file=sys.stderr)
+        sys.exit(1)
+    if args.max_calls is not None and report['calls'] > args.max_calls:
+        print(f"Οι κλήσεις COM ({report['calls']}) ξεπερνούν το όριο {args.max_calls}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
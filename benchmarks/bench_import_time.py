@@ -0,0 +1,83 @@
+"""
+Χρόνος φόρτωσης (cold start) του πυρήνα επεξεργασίας, κάθε φορά σε νέα διεργασία Python.
+
+    python benchmarks/bench_import_time.py --repeat 5
+
+Για κάθε module μετριέται ο χρόνος του 'python -X importtime' (αθροιστικός, σε ms) και
+ελέγχεται ότι δεν φορτώθηκαν PyQt5, pywin32 ή οι μηχανές που φορτώνονται μόνο όταν επιλεγούν.
+"""
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Τα modules του πυρήνα (χωρίς UI) που μετριούνται.
+CORE_MODULES = ('modules.excel_processor', 'modules.split_plan', 'modules.file_manager', 'modules.logger', 'cli')
+# Modules που δεν πρέπει να φορτώνονται μαζί με τον πυρήνα.
+LAZY_MODULES = ('PyQt5', 'win32com', 'pythoncom', 'modules.ooxml_backend', 'modules.excel_pool', 'modules.parallel_runner')
+
+_PROBE = """
+import sys, json
+import {module}
+lazy = {lazy!r}
+print(json.dumps(sorted(name for name in lazy if name in sys.modules)))
+"""
+
+
+def measure(module, lazy_modules):
+    """
+    Φορτώνει το module σε νέα διεργασία.
+
+    Returns:
+        tuple: (αθροιστικός χρόνος σε ms, αριθμός modules που φορτώθηκαν, όσα από τα lazy_modules φορτώθηκαν)
+    """
+    # Το cli είναι επιτρεπτό να φορτώνει το excel_pool (μόνο για τον έλεγχο του pywin32).
+    lazy = tuple(name for name in lazy_modules if not (module == 'cli' and name == 'modules.excel_pool'))
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', _PROBE.format(module=module, lazy=lazy)],
+        cwd=ROOT_DIR, capture_output=True, text=True, encoding='utf-8', check=True,
+    )
+    cumulative_us = None
+    imported = 0
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line: continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        imported += 1
+        if name.strip() == module:
+            cumulative_us = int(cumulative)
+    return (cumulative_us or 0) / 1000, imported, json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('modules', nargs='*', default=list(CORE_MODULES), help="Modules προς μέτρηση (προεπιλογή: ο πυρήνας)")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', action='store_true', help="Έξοδος σε JSON")
+    args = parser.parse_args()
+
+    report = {}
+    failed = False
+    for module in args.modules:
+        timings = []
+        for _ in range(args.repeat):
+            milliseconds, imported, loaded = measure(module, LAZY_MODULES)
+            timings.append(milliseconds)
+        report[module] = {'best_ms': min(timings), 'median_ms': sorted(timings)[len(timings) // 2],
+                          'modules_imported': imported, 'unexpected_modules': loaded}
+        failed = failed or bool(loaded)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        for module, result in report.items():
+            print(f"{module:28s} {result['best_ms']:8.1f} ms (διάμεσος {result['median_ms']:.1f} ms, {result['modules_imported']} modules)")
+            if result['unexpected_modules']:
+                print(f"  ΠΡΟΣΟΧΗ: φορτώθηκαν και τα {', '.join(result['unexpected_modules'])}")
+    if failed: sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
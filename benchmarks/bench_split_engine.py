@@ -0,0 +1,74 @@
+"""
+Μέτρηση του υπολογισμού διασπάσεων χωρίς ανάγνωση/εγγραφή αρχείων: ανά γραμμή
+(ExcelProcessor._compute_row_split) ή για όλες μαζί με NumPy (split_plan.plan_splits, --batch).
+
+    python benchmarks/bench_split_engine.py --rows 100000 --max-split 500 [--batch]
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.excel_processor import ExcelProcessor
+from modules.money import to_cents
+from modules.split_plan import (SplitPlan, SeededRandom, plan_splits, seed_key, row_key, SPLIT_NOT_MULTIPLE_5,
+                                SPLIT_IMPOSSIBLE)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--max-split', type=float, default=500)
+    parser.add_argument('--split-mode', default='decimal', choices=('decimal', 'integer_5'))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--reproducible', action='store_true', help="Αναπαραγώγιμες διασπάσεις με κλειδί ανά γραμμή από το --seed")
+    parser.add_argument('--batch', action='store_true', help="Υπολογισμός όλων των γραμμών μαζί (απαιτεί NumPy)")
+    parser.add_argument('--json', action='store_true', help="Έξοδος σε JSON")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    max_split_cents = to_cents(args.max_split)
+    # Αξίες από λίγο πάνω από το μέγιστο κομμάτι έως 20 φορές αυτό (2-way και N-way διασπάσεις).
+    values = [rng.randint(max_split_cents, 20 * max_split_cents) for _ in range(args.rows)]
+    if args.split_mode == 'integer_5':
+        values = [v - v % 500 for v in values]
+
+    processor = ExcelProcessor(None)
+    results = {}
+    random.seed(args.seed)
+    base = seed_key(args.seed, 'bench')
+    start = time.perf_counter()
+    if args.batch:
+        from modules.split_plan import row_keys, random_keys
+        keys = row_keys(base, range(len(values))) if args.reproducible else random_keys(len(values))
+        plan = plan_splits(values, 0, max_split_cents, args.split_mode, keys, stats=results)
+    elif args.reproducible:
+        plan = SplitPlan.from_rows(processor._compute_row_split(v, 0, max_split_cents, args.split_mode, stats=results, rand=SeededRandom(row_key(base, row)))
+                                   for row, v in enumerate(values))
+    else:
+        plan = SplitPlan.from_rows(processor._compute_row_split(v, 0, max_split_cents, args.split_mode, stats=results) for v in values)
+    elapsed = time.perf_counter() - start
+    skipped = sum(1 for code in plan.methods if code in (SPLIT_NOT_MULTIPLE_5, SPLIT_IMPOSSIBLE))
+
+    report = {
+        'rows': args.rows,
+        'batch': args.batch,
+        'reproducible': args.reproducible,
+        'parts': len(plan.parts),
+        'skipped': skipped,
+        'seconds': elapsed,
+        'rows_per_second': args.rows / elapsed,
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"Γραμμές: {report['rows']}, κομμάτια: {report['parts']}, παραλείψεις: {report['skipped']}")
+        print(f"Χρόνος: {report['seconds']:.2f}s ({report['rows_per_second']:.0f} γραμμές/s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+"""
+Χρόνοι ανά φάση (άνοιγμα, έλεγχος, υπολογισμός διασπάσεων, εγγραφή, αποθήκευση) της
+επεξεργασίας ενός συνθετικού βιβλίου τιμολογίων, για κάθε μηχανή, τρόπο διάσπασης και μέγεθος.
+
+    python benchmarks/bench_suite.py --sizes 1000,10000,100000,1000000 --output baseline.json
+    python benchmarks/bench_suite.py --baseline baseline.json --tolerance 0.2
+
+Τα αποτελέσματα γράφονται (--output) ως JSON, ώστε να συγκρίνονται εκδόσεις: με --baseline
+κάθε περίπτωση συγκρίνεται με την αντίστοιχη του αρχείου και ο κωδικός εξόδου είναι 1 αν κάποια
+είναι πιο αργή από το όριο (--tolerance). Η μηχανή COM τρέχει με το εικονικό Excel του
+fake_excel (εκτός αν δοθεί --real-excel), οπότε οι χρόνοι της δείχνουν το κόστος της Python και
+το πλήθος των κλήσεων COM, όχι του ίδιου του Excel. Αν κάποια περίπτωση δεν διασπά καμία
+γραμμή ενώ --above-share > 0, ο κωδικός εξόδου είναι 1 και δεν γράφεται το --output.
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_excel import FakeExcel
+from benchmarks.synthetic import write_invoice_workbook, DISTRIBUTIONS, DISTRIBUTION_UNIFORM
+from modules.excel_processor import ExcelProcessor, BACKEND_COM, BACKENDS, WRITE_MODE_REBUILD
+from modules.progress import PHASES
+
+SPLIT_MODES = ('decimal', 'integer_5')
+# Οι αξίες από το όριο και πάνω του συνθετικού βιβλίου ανά τρόπο διάσπασης: ο integer_5 διασπά
+# μόνο ακέραια πολλαπλάσια του 5, αλλιώς δεν θα διασπούσε καμία γραμμή.
+SPLIT_MODE_MULTIPLE_OF = {'integer_5': 5}
+BASELINE_VERSION = 1
+
+
+class PhaseTimer:
+    """row_progress_callback που μετρά τον χρόνο κάθε φάσης (από την αρχή της ως την αρχή της επόμενης)."""
+
+    def __init__(self, clock=time.perf_counter, on_progress=None):
+        self.clock = clock
+        self.on_progress = on_progress
+        self.seconds = {phase: 0.0 for phase in PHASES}
+        self.phase = None
+        self._started = None
+
+    def __call__(self, info):
+        if self.on_progress is not None: self.on_progress(info)
+        if info['phase'] == self.phase: return
+        self.stop()
+        self.phase = info['phase']
+        self._started = self.clock()
+
+    def stop(self):
+        if self.phase is not None:
+            self.seconds[self.phase] = self.seconds.get(self.phase, 0.0) + self.clock() - self._started
+        self.phase = None
+
+
+def run_case(input_path, output_path, backend, split_mode, rows, args):
+    """Μία επεξεργασία: χρόνοι ανά φάση, συνολικός χρόνος και αποτελέσματα."""
+    fake = FakeExcel() if backend == BACKEND_COM and not args.real_excel else None
+    timer = PhaseTimer(on_progress=fake.stats.on_progress if fake else None)
+    processor = ExcelProcessor(None, com_dispatch=fake)
+    start = time.perf_counter()
+    results = processor.process_file(input_path, output_path, threshold=args.threshold, value_col=6, prop_cols=args.prop_cols,
+                                     overwrite=True, max_split_value=args.max_split, split_mode=split_mode, backend=backend,
+                                     write_mode=WRITE_MODE_REBUILD, split_seed=args.seed, row_progress_callback=timer)
+    elapsed = time.perf_counter() - start
+    timer.stop()
+    case = {
+        'backend': backend, 'split_mode': split_mode, 'rows': rows,
+        'seconds': elapsed, 'rows_per_second': rows / elapsed if elapsed > 0 else 0.0,
+        'phases': timer.seconds,
+        'split_rows': results['split_rows'], 'errors': results['errors'],
+    }
+    if fake is not None: case['com_calls'] = fake.stats.total()
+    return case
+
+
+def case_key(case):
+    return f"{case['backend']}/{case['split_mode']}/{case['rows']}"
+
+
+def compare(cases, baseline_path, tolerance):
+    """Σύγκριση με baseline· επιστρέφει τις περιπτώσεις που είναι πιο αργές από (1 + tolerance) φορές."""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {case_key(case): case for case in json.load(f).get('cases', [])}
+    regressions = []
+    for case in cases:
+        old = baseline.get(case_key(case))
+        if old is None or not old.get('seconds'): continue
+        case['baseline_seconds'] = old['seconds']
+        case['ratio'] = case['seconds'] / old['seconds']
+        if case['ratio'] > 1 + tolerance: regressions.append(case)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default='1000,10000,100000', help="Πλήθη γραμμών χωρισμένα με κόμμα (π.χ. 1000,10000,100000,1000000)")
+    parser.add_argument('--backends', default=','.join(BACKENDS), help="Μηχανές χωρισμένες με κόμμα")
+    parser.add_argument('--split-modes', default=','.join(SPLIT_MODES), help="Τρόποι διάσπασης χωρισμένοι με κόμμα")
+    parser.add_argument('--sheets', type=int, default=1)
+    parser.add_argument('--above-share', type=float, default=0.3, help="Ποσοστό γραμμών με αξία από το όριο και πάνω (0..1)")
+    parser.add_argument('--distribution', default=DISTRIBUTION_UNIFORM, choices=DISTRIBUTIONS)
+    parser.add_argument('--prop-cols', default='8', help="Αναλογικές στήλες χωρισμένες με κόμμα")
+    parser.add_argument('--threshold', type=float, default=500)
+    parser.add_argument('--max-split', type=float, default=500)
+    parser.add_argument('--totals-every', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=1, help="Επαναλήψεις ανά περίπτωση (κρατιέται η ταχύτερη)")
+    parser.add_argument('--real-excel', action='store_true', help="Η μηχανή COM με το πραγματικό Excel (μόνο Windows)")
+    parser.add_argument('--output', help="Αρχείο JSON για τα αποτελέσματα (baseline)")
+    parser.add_argument('--baseline', help="Αρχείο JSON προηγούμενης εκτέλεσης για σύγκριση")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Επιτρεπτή επιβράδυνση σε σχέση με το baseline (0.2 = 20%%)")
+    parser.add_argument('--json', action='store_true', help="Έξοδος σε JSON")
+    args = parser.parse_args()
+    args.prop_cols = [int(col) for col in args.prop_cols.split(',') if col]
+    sizes = [int(size) for size in args.sizes.split(',') if size]
+    backends = [backend for backend in args.backends.split(',') if backend]
+    split_modes = [mode for mode in args.split_modes.split(',') if mode]
+    if not set(backends) <= set(BACKENDS) or not set(split_modes) <= set(SPLIT_MODES):
+        parser.error(f"Μηχανές: {', '.join(BACKENDS)}· τρόποι διάσπασης: {', '.join(SPLIT_MODES)}")
+
+    cases = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in sizes:
+            for split_mode in split_modes:
+                input_path = os.path.join(tmp, f'invoices_{split_mode}_{rows}.xlsx')
+                write_invoice_workbook(input_path, rows, seed=args.seed, totals_every=args.totals_every, sheets=args.sheets,
+                                       above_share=args.above_share, threshold=args.threshold, distribution=args.distribution,
+                                       prop_cols=args.prop_cols, multiple_of=SPLIT_MODE_MULTIPLE_OF.get(split_mode))
+                for backend in backends:
+                    output_path = os.path.join(tmp, f'out_{backend}_{split_mode}_{rows}.xlsx')
+                    runs = [run_case(input_path, output_path, backend, split_mode, rows * args.sheets, args) for _ in range(args.repeat)]
+                    case = min(runs, key=lambda run: run['seconds'])
+                    cases.append(case)
+                    if not args.json:
+                        phases = ', '.join(f"{phase} {seconds:.2f}s" for phase, seconds in case['phases'].items())
+                        print(f"{case_key(case):<28} {case['seconds']:8.2f}s {case['rows_per_second']:10.0f} γραμμές/s  ({phases})")
+                os.remove(input_path)
+
+    # Μια περίπτωση χωρίς διασπάσεις ενώ υπάρχουν αξίες πάνω από το όριο δεν μετρά την εγγραφή.
+    unsplit = [case for case in cases if case['split_rows'] == 0] if args.above_share > 0 else []
+    if unsplit:
+        print(f"Χωρίς διασπάσεις (above_share {args.above_share}): {', '.join(case_key(case) for case in unsplit)}", file=sys.stderr)
+        sys.exit(1)
+
+    regressions = compare(cases, args.baseline, args.tolerance) if args.baseline else []
+    report = {
+        'version': BASELINE_VERSION,
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'settings': {'sheets': args.sheets, 'above_share': args.above_share, 'distribution': args.distribution,
+                     'prop_cols': args.prop_cols, 'threshold': args.threshold, 'max_split': args.max_split,
+                     'totals_every': args.totals_every, 'seed': args.seed, 'real_excel': args.real_excel},
+        'cases': cases,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    elif args.baseline:
+        for case in cases:
+            if 'ratio' in case: print(f"{case_key(case):<28} {case['ratio']:.2f}x του baseline")
+    if regressions:
+        print(f"Πιο αργές από το baseline (+{args.tolerance:.0%}): {', '.join(case_key(case) for case in regressions)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,532 @@
+"""
+Εικονικό object model του Excel (Application, Workbooks, Workbook, Worksheets, Worksheet, Range
+με Cells, Rows, UsedRange, Union, EntireRow.Insert, Value και FormulaR1C1) για τη μηχανή COM
+χωρίς Windows και Excel, με καταμέτρηση κάθε κλήσης ανά φάση και προαιρετική καθυστέρηση ανά κλήση.
+
+    fake = FakeExcel(latency=0.0002)
+    processor = ExcelProcessor(logger, com_dispatch=fake)
+    processor.process_file(..., backend='com', row_progress_callback=fake.stats.on_progress)
+    print(fake.stats.by_phase())
+
+Κάθε ανάγνωση ή ανάθεση ιδιότητας και κάθε κλήση μεθόδου μετρά ως μία κλήση COM (ένα
+round-trip προς τη διεργασία του Excel, όπως με το gencache του pywin32)· η κλήση μιας
+συλλογής, π.χ. worksheet.Cells(r, c) ή workbook.Worksheets(1), μετρά επιπλέον ως Item.
+Τα βιβλία διαβάζονται με τη μηχανή OOXML (.xlsx/.xlsm) και το SaveAs γράφει απλό .xlsx
+με τις τιμές και τους τύπους των κελιών (χωρίς μορφοποίηση). Οι τύποι δεν υπολογίζονται:
+το Value ενός τύπου είναι η αποθηκευμένη τιμή του αρχείου. Το FormulaR1C1 επιστρέφει και
+δέχεται τύπους σε R1C1 και το EntireRow.Insert προσαρμόζει τις αναφορές των τύπων όλων των
+φύλλων όπως το Excel (με το ooxml_backend.shift_formula).
+"""
+import os
+import re
+import sys
+import html
+import time
+import zipfile
+from xml.sax.saxutils import escape, quoteattr
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.excel_pool import SimulatedComError, XL_CALCULATION_AUTOMATIC
+from modules.ooxml_backend import (OoxmlWorkbook, RowMapping, shift_formula, column_letters, column_index,
+                                   _REF_RE, _split_outside_strings)
+
+# Η φάση των κλήσεων πριν την πρώτη αναφορά προόδου (εκκίνηση Excel, έλεγχος υγείας του pool).
+PHASE_SETUP = 'setup'
+# Στήλες ενός φύλλου του Excel (για τις περιοχές ολόκληρων γραμμών).
+MAX_COLUMNS = 16384
+
+# Απλοί τύποι (χωρίς t="shared"/"array") ενός φύλλου .xlsx: (στήλη, γραμμή, τύπος).
+_FORMULA_CELL_RE = re.compile(r'<c r="([A-Z]+)(\d+)"[^>]*>\s*<f>([^<]*)</f>')
+# Αναφορά R1C1: κελί (R[-1]C, R5C6, RC[2]) ή γραμμές (R[-3]:R[-1]).
+_R1C1_REF_RE = re.compile(
+    r"(?<![\w.$\]'])(?:R(?P<row>\[-?\d+\]|\d+)?C(?P<col>\[-?\d+\]|\d+)?"
+    r"|R(?P<r1>\[-?\d+\]|\d+)?:R(?P<r2>\[-?\d+\]|\d+)?)(?![\w(\[])"
+)
+
+
+def a1_to_r1c1(formula, row, col):
+    """Ο τύπος formula (A1, χωρίς '=') του κελιού (row, col) σε R1C1."""
+    def axis(prefix, value, base, absolute):
+        if absolute: return f"{prefix}{value}"
+        return prefix if value == base else f"{prefix}[{value - base}]"
+
+    def cell(col_text, row_abs, row_text):
+        return (axis('R', int(row_text), row, bool(row_abs))
+                + axis('C', column_index(col_text.lstrip('$')), col, col_text.startswith('$')))
+
+    def convert(match):
+        prefix = match.group('sheet') or ''
+        if match.group('row') is not None:
+            ref = prefix + cell(match.group('col'), match.group('rabs'), match.group('row'))
+            if match.group('row2') is not None:
+                ref += ':' + cell(match.group('col2'), match.group('rabs2'), match.group('row2'))
+            return ref
+        return (f"{prefix}{axis('R', int(match.group('r1')), row, bool(match.group('r1abs')))}"
+                f":{axis('R', int(match.group('r2')), row, bool(match.group('r2abs')))}")
+
+    return _split_outside_strings(formula, lambda text: _REF_RE.sub(convert, text))
+
+
+def r1c1_to_a1(formula, row, col):
+    """Ο τύπος formula (R1C1, χωρίς '=') του κελιού (row, col) σε A1."""
+    def axis(token, base):
+        if token is None: return base, ''
+        if token.startswith('['): return base + int(token[1:-1]), ''
+        return int(token), '$'
+
+    def convert(match):
+        if ':' in match.group(0):
+            (r1, abs1), (r2, abs2) = axis(match.group('r1'), row), axis(match.group('r2'), row)
+            return f"{abs1}{r1}:{abs2}{r2}"
+        (ref_row, row_abs), (ref_col, col_abs) = axis(match.group('row'), row), axis(match.group('col'), col)
+        return f"{col_abs}{column_letters(ref_col)}{row_abs}{ref_row}"
+
+    return _split_outside_strings(formula, lambda text: _R1C1_REF_RE.sub(convert, text))
+
+
+class _Formula:
+    """Τύπος κελιού σε A1 (χωρίς '=') με την αποθηκευμένη τιμή του (None για νέους τύπους)."""
+
+    __slots__ = ('text', 'value')
+
+    def __init__(self, text, value=None):
+        self.text = text
+        self.value = value
+
+
+class ComCallStats:
+    """
+    Μετρητές κλήσεων COM ανά φάση ({φάση: {μέλος: πλήθος}}, π.χ. 'Range.Value').
+    Η φάση αλλάζει με την on_progress (row_progress_callback της επεξεργασίας, βλ. modules.progress).
+    """
+
+    def __init__(self, latency=0.0):
+        # Καθυστέρηση (δευτερόλεπτα) που προστίθεται σε κάθε κλήση.
+        self.latency = latency
+        self.phase = PHASE_SETUP
+        self.calls = {}
+
+    def on_progress(self, info):
+        self.phase = info.get('phase') or PHASE_SETUP
+
+    def record(self, member):
+        counts = self.calls.get(self.phase)
+        if counts is None: counts = self.calls[self.phase] = {}
+        counts[member] = counts.get(member, 0) + 1
+        if self.latency:
+            # Ενεργή αναμονή: το time.sleep δεν έχει ακρίβεια μικροδευτερολέπτων.
+            deadline = time.perf_counter() + self.latency
+            while time.perf_counter() < deadline: pass
+
+    def total(self):
+        return sum(sum(counts.values()) for counts in self.calls.values())
+
+    def by_phase(self):
+        return {phase: sum(counts.values()) for phase, counts in self.calls.items()}
+
+    def by_member(self):
+        members = {}
+        for counts in self.calls.values():
+            for member, count in counts.items():
+                members[member] = members.get(member, 0) + count
+        return dict(sorted(members.items(), key=lambda item: -item[1]))
+
+    def reset(self):
+        self.phase = PHASE_SETUP
+        self.calls = {}
+
+
+class FakeExcel:
+    """Factory εικονικών Excel.Application (dispatch του ExcelAppPool, com_dispatch του ExcelProcessor)."""
+
+    def __init__(self, latency=0.0, stats=None):
+        self.stats = stats if stats is not None else ComCallStats(latency)
+
+    def __call__(self):
+        return _ComProxy(_Application(), self.stats)
+
+
+class _ComProxy:
+    """Περιτύλιγμα αντικειμένου του object model που μετρά κάθε πρόσβαση ως κλήση COM."""
+
+    __slots__ = ('_obj', '_stats')
+
+    def __init__(self, obj, stats):
+        object.__setattr__(self, '_obj', obj)
+        object.__setattr__(self, '_stats', stats)
+
+    def __getattr__(self, name):
+        attr = getattr(self._obj, name)
+        member = f"{type(self._obj).__name__.lstrip('_')}.{name}"
+        stats = self._stats
+        if callable(attr):
+            def method(*args, **kwargs):
+                stats.record(member)
+                return _wrap(attr(*map(_unwrap, args), **{k: _unwrap(v) for k, v in kwargs.items()}), stats)
+            return method
+        stats.record(member)
+        return _wrap(attr, stats)
+
+    def __setattr__(self, name, value):
+        self._stats.record(f"{type(self._obj).__name__.lstrip('_')}.{name}=")
+        setattr(self._obj, name, _unwrap(value))
+
+    def __call__(self, *args):
+        self._stats.record(f"{type(self._obj).__name__.lstrip('_')}.Item")
+        return _wrap(self._obj.Item(*map(_unwrap, args)), self._stats)
+
+
+def _wrap(value, stats):
+    return _ComProxy(value, stats) if isinstance(value, _Object) else value
+
+
+def _unwrap(value):
+    return object.__getattribute__(value, '_obj') if isinstance(value, _ComProxy) else value
+
+
+class _Object:
+    pass
+
+
+class _Application(_Object):
+    def __init__(self):
+        self.Visible = True
+        self.DisplayAlerts = True
+        self.ScreenUpdating = True
+        self.EnableEvents = True
+        self.Calculation = XL_CALCULATION_AUTOMATIC
+        self.Workbooks = _Workbooks()
+
+    def Quit(self):
+        self.Workbooks.items.clear()
+
+    def Union(self, *ranges):
+        if not 2 <= len(ranges) <= 30: raise SimulatedComError(f"Το Union δέχεται 2 έως 30 περιοχές, δόθηκαν {len(ranges)}")
+        return _Areas([area for rng in ranges for area in (rng.areas if isinstance(rng, _Areas) else [rng])])
+
+
+class _Workbooks(_Object):
+    def __init__(self):
+        self.items = []
+
+    @property
+    def Count(self):
+        return len(self.items)
+
+    def Item(self, index):
+        return self.items[index - 1]
+
+    def Open(self, path):
+        if not os.path.exists(path): raise SimulatedComError(f"Δεν βρέθηκε το αρχείο '{path}'")
+        workbook = _Workbook(self, path)
+        self.items.append(workbook)
+        return workbook
+
+
+class _Workbook(_Object):
+    def __init__(self, workbooks, path):
+        self.workbooks = workbooks
+        self.FullName = path
+        sheets = []
+        with OoxmlWorkbook(path) as source, zipfile.ZipFile(path) as package:
+            for sheet in source.sheets:
+                rows = []
+                for row_num, cells in source.iter_rows(sheet):
+                    while len(rows) < row_num: rows.append(None)
+                    rows[row_num - 1] = {col: value for col, value in cells.items() if value is not None} or None
+                worksheet = _Worksheet(self, sheet.name, rows)
+                for letters, row_num, text in _FORMULA_CELL_RE.findall(package.read(sheet.part).decode('utf-8')):
+                    row_num, col = int(row_num), column_index(letters)
+                    worksheet.set(row_num, col, _Formula(html.unescape(text), worksheet.get(row_num, col)))
+                sheets.append(worksheet)
+        self.Worksheets = _Worksheets(sheets)
+
+    def SaveAs(self, path):
+        _write_xlsx(path, self.Worksheets.items)
+        self.FullName = path
+
+    def Close(self, SaveChanges=False):
+        if self in self.workbooks.items: self.workbooks.items.remove(self)
+
+
+class _Worksheets(_Object):
+    def __init__(self, items):
+        self.items = items
+
+    @property
+    def Count(self):
+        return len(self.items)
+
+    def Item(self, index):
+        return self.items[index - 1]
+
+
+class _Worksheet(_Object):
+    def __init__(self, workbook, name, rows):
+        self.workbook = workbook
+        self.Name = name
+        # Γραμμή n -> rows[n - 1]: {στήλη: τιμή ή _Formula} ή None για κενή γραμμή.
+        self.rows = rows
+        self.has_formulas = False
+
+    def get(self, row, col):
+        cells = self.rows[row - 1] if row <= len(self.rows) else None
+        return cells.get(col) if cells else None
+
+    def set(self, row, col, value):
+        while len(self.rows) < row: self.rows.append(None)
+        cells = self.rows[row - 1]
+        if value is None or value == '':
+            if cells: cells.pop(col, None)
+            return
+        if cells is None: cells = self.rows[row - 1] = {}
+        if isinstance(value, _Formula): self.has_formulas = True
+        cells[col] = value
+
+    def shift_formulas(self, mappings):
+        """Προσαρμόζει τους τύπους του φύλλου μετά από εισαγωγή γραμμών ({φύλλο: RowMapping})."""
+        if not self.has_formulas: return
+        for cells in self.rows:
+            if not cells: continue
+            for value in cells.values():
+                if isinstance(value, _Formula): value.text = shift_formula(value.text, self.Name, mappings)
+
+    @property
+    def Cells(self):
+        return _Range(self, 1, 1, None, MAX_COLUMNS)
+
+    @property
+    def Rows(self):
+        return _Range(self, 1, 1, None, MAX_COLUMNS)
+
+    @property
+    def UsedRange(self):
+        last_row = len(self.rows)
+        while last_row and not self.rows[last_row - 1]: last_row -= 1
+        columns = [col for cells in self.rows if cells for col in cells]
+        if not columns: return _Range(self, 1, 1, 1, 1)
+        return _Range(self, 1, min(columns), last_row, max(columns))
+
+    def Range(self, first, last=None):
+        last = last or first
+        return _Range(self, min(first.top, last.top), min(first.left, last.left),
+                      max(first.bottom, last.bottom), max(first.right, last.right))
+
+
+class _Range(_Object):
+    """Ορθογώνια περιοχή top..bottom x left..right (bottom None: ως το τέλος του φύλλου)."""
+
+    def __init__(self, sheet, top, left, bottom, right):
+        self.sheet = sheet
+        self.top = top
+        self.left = left
+        self.bottom = bottom
+        self.right = right
+
+    def Item(self, row, col=None):
+        if col is None:
+            # Συλλογή γραμμών (Rows(n)) ή κελιών σε σειρά.
+            if self.left == 1 and self.right == MAX_COLUMNS:
+                row_num = self.top + row - 1
+                return _Range(self.sheet, row_num, 1, row_num, MAX_COLUMNS)
+            col = self.left + (row - 1) % self.width
+            row = 1 + (row - 1) // self.width
+        else:
+            col = self.left + col - 1
+        row_num = self.top + row - 1
+        return _Range(self.sheet, row_num, col, row_num, col)
+
+    @property
+    def width(self):
+        return self.right - self.left + 1
+
+    @property
+    def height(self):
+        return (self.bottom if self.bottom is not None else len(self.sheet.rows)) - self.top + 1
+
+    @property
+    def Row(self):
+        return self.top
+
+    @property
+    def Column(self):
+        return self.left
+
+    @property
+    def Count(self):
+        return self.height * self.width
+
+    @property
+    def Rows(self):
+        return _Axis(self, self.height)
+
+    @property
+    def Columns(self):
+        return _Axis(self, self.width)
+
+    @property
+    def EntireRow(self):
+        return _Range(self.sheet, self.top, 1, self.bottom, MAX_COLUMNS)
+
+    def _get(self, r1c1):
+        def cell(row, col):
+            value = self.sheet.get(row, col)
+            if isinstance(value, _Formula):
+                return '=' + a1_to_r1c1(value.text, row, col) if r1c1 else value.value
+            if not r1c1: return value
+            return '' if value is None else value if isinstance(value, str) else repr(value)
+        if self.height == 1 and self.width == 1:
+            return cell(self.top, self.left)
+        return tuple(tuple(cell(row, col) for col in range(self.left, self.right + 1))
+                     for row in range(self.top, self.top + self.height))
+
+    def _set(self, value, r1c1):
+        def cell(row, col, cell_value):
+            # Όπως στο Excel, ένα κείμενο που αρχίζει με '=' γίνεται τύπος.
+            if isinstance(cell_value, str) and cell_value.startswith('='):
+                cell_value = _Formula(r1c1_to_a1(cell_value[1:], row, col) if r1c1 else cell_value[1:])
+            self.sheet.set(row, col, cell_value)
+        if not isinstance(value, tuple):
+            for row in range(self.top, self.top + self.height):
+                for col in range(self.left, self.right + 1):
+                    cell(row, col, value)
+            return
+        for row_offset, row_values in enumerate(value):
+            if not isinstance(row_values, tuple): row_values = (row_values,)
+            for col_offset, cell_value in enumerate(row_values):
+                cell(self.top + row_offset, self.left + col_offset, cell_value)
+
+    @property
+    def Value(self):
+        return self._get(False)
+
+    @Value.setter
+    def Value(self, value):
+        self._set(value, False)
+
+    @property
+    def FormulaR1C1(self):
+        return self._get(True)
+
+    @FormulaR1C1.setter
+    def FormulaR1C1(self, value):
+        self._set(value, True)
+
+    def Insert(self, Shift=None):
+        _insert_rows(self.sheet, [self])
+
+
+class _Areas(_Object):
+    """
+    Περιοχή με πολλά τμήματα (Areas), από Application.Union. Όπως στο Excel, τα τμήματα με τις
+    ίδιες στήλες που επικαλύπτονται ή είναι γειτονικά συγχωνεύονται σε ένα.
+    """
+
+    def __init__(self, areas):
+        merged = []
+        for area in sorted(areas, key=lambda area: (area.left, area.right, area.top)):
+            last = merged[-1] if merged else None
+            if (last is not None and last.sheet is area.sheet and (last.left, last.right) == (area.left, area.right)
+                    and last.bottom is not None and area.top <= last.bottom + 1):
+                merged[-1] = _Range(area.sheet, last.top, last.left, None if area.bottom is None else max(last.bottom, area.bottom), last.right)
+            else:
+                merged.append(area)
+        self.areas = merged
+
+    @property
+    def Count(self):
+        return sum(area.Count for area in self.areas)
+
+    @property
+    def EntireRow(self):
+        return _Areas([area.EntireRow for area in self.areas])
+
+    def Insert(self, Shift=None):
+        _insert_rows(self.areas[0].sheet, self.areas)
+
+
+def _insert_rows(sheet, areas):
+    """
+    Εισάγει κενές γραμμές πάνω από κάθε περιοχή (όσες και οι γραμμές της, στις αρχικές θέσεις)
+    και προσαρμόζει τους τύπους όλων των φύλλων.
+    """
+    spans = sorted(((area.top, area.height) for area in areas), reverse=True)
+    rows = sheet.rows
+    for top, height in spans:
+        while len(rows) < top - 1: rows.append(None)
+        rows[top - 1:top - 1] = [None] * height
+    mappings = {sheet.Name: RowMapping({top - 1: height for top, height in spans})}
+    for other in sheet.workbook.Worksheets.items:
+        other.shift_formulas(mappings)
+
+
+class _Axis(_Object):
+    """Οι γραμμές (Rows) ή οι στήλες (Columns) μιας περιοχής."""
+
+    def __init__(self, source, count):
+        self.source = source
+        self.Count = count
+
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '{sheets}</Types>'
+)
+_PACKAGE_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+
+def _write_xlsx(path, worksheets):
+    """Γράφει τα φύλλα (τιμές, κείμενα inline και τύποι χωρίς αποθηκευμένη τιμή) σε ένα απλό .xlsx."""
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zout:
+        zout.writestr('[Content_Types].xml', _CONTENT_TYPES.format(sheets=''.join(
+            f'<Override PartName="/xl/worksheets/sheet{i}.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            for i in range(1, len(worksheets) + 1))))
+        zout.writestr('_rels/.rels', _PACKAGE_RELS)
+        zout.writestr('xl/workbook.xml', (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"><sheets>'
+            + ''.join(f'<sheet name={quoteattr(sheet.Name)} sheetId="{i}" r:id="rId{i}"/>' for i, sheet in enumerate(worksheets, 1))
+            + '</sheets></workbook>'))
+        zout.writestr('xl/_rels/workbook.xml.rels', (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            + ''.join(f'<Relationship Id="rId{i}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+                      f'Target="worksheets/sheet{i}.xml"/>' for i in range(1, len(worksheets) + 1))
+            + '</Relationships>'))
+        for i, sheet in enumerate(worksheets, 1):
+            with zout.open(f'xl/worksheets/sheet{i}.xml', 'w', force_zip64=True) as out:
+                out.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                          b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>')
+                chunk = []
+                for row_num, cells in enumerate(sheet.rows, 1):
+                    if not cells: continue
+                    row_cells = []
+                    for col in sorted(cells):
+                        ref = f'{column_letters(col)}{row_num}'
+                        value = cells[col]
+                        if isinstance(value, _Formula):
+                            row_cells.append(f'<c r="{ref}"><f>{escape(value.text)}</f></c>')
+                        elif isinstance(value, bool):
+                            row_cells.append(f'<c r="{ref}" t="b"><v>{int(value)}</v></c>')
+                        elif isinstance(value, (int, float)):
+                            row_cells.append(f'<c r="{ref}"><v>{value!r}</v></c>')
+                        else:
+                            row_cells.append(f'<c r="{ref}" t="inlineStr"><is><t>{escape(str(value))}</t></is></c>')
+                    chunk.append(f'<row r="{row_num}">{"".join(row_cells)}</row>')
+                    if len(chunk) >= 10000:
+                        out.write(''.join(chunk).encode('utf-8'))
+                        chunk = []
+                out.write(''.join(chunk).encode('utf-8'))
+                out.write(b'</sheetData></worksheet>')
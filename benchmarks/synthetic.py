@@ -0,0 +1,174 @@
+import math
+import random
+import zipfile
+
+from xml.sax.saxutils import escape
+
+from modules.ooxml_backend import column_letters
+
+# Κατανομές των αξιών (στήλη F) των γραμμών τιμολογίων.
+DISTRIBUTION_UNIFORM = 'uniform'
+DISTRIBUTION_LOGNORMAL = 'lognormal'
+DISTRIBUTIONS = (DISTRIBUTION_UNIFORM, DISTRIBUTION_LOGNORMAL)
+
+SHEET_NAME = 'Τιμολόγια'
+VALUE_COL = 6
+# Στήλη των τύπων (με formulas=True): σωρευτικό σύνολο στις γραμμές "Σύνολα", γενικό σύνολο στη γραμμή 1.
+FORMULA_COL = 7
+MIN_VALUE = 1
+MAX_VALUE = 3000
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '{sheets}'
+    '<Override PartName="/xl/sharedStrings.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+    '</Types>'
+)
+_SHEET_CONTENT_TYPE = '<Override PartName="/xl/worksheets/sheet{index}.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+_PACKAGE_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets>{sheets}</sheets><calcPr calcId="191029"/></workbook>'
+)
+_WORKBOOK_SHEET = '<sheet name="{name}" sheetId="{index}" r:id="rId{index}"/>'
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '{sheets}'
+    '<Relationship Id="rId{strings_id}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings" Target="sharedStrings.xml"/>'
+    '</Relationships>'
+)
+_WORKBOOK_SHEET_REL = '<Relationship Id="rId{index}" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet{index}.xml"/>'
+_SHEET_HEAD = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<dimension ref="A1:{last_col}{last_row}"/><sheetData>'
+)
+_SHEET_TAIL = '</sheetData><pageMargins left="0.7" right="0.7" top="0.75" bottom="0.75" header="0.3" footer="0.3"/></worksheet>'
+
+
+def _draw(rng, distribution, low, high):
+    """Μια αξία στο [low, high] από την κατανομή (η λογαριθμοκανονική με διάμεσο τον γεωμετρικό μέσο)."""
+    if distribution == DISTRIBUTION_LOGNORMAL:
+        log_low, log_high = math.log(low), math.log(high)
+        value = rng.lognormvariate((log_low + log_high) / 2, (log_high - log_low) / 4)
+        return min(max(value, low), high)
+    return rng.uniform(low, high)
+
+
+def write_invoice_workbook(path, rows, seed=0, totals_every=500, blank_every=97, sheets=1, above_share=None,
+                           threshold=500, distribution=DISTRIBUTION_UNIFORM, prop_cols=(8,), max_value=MAX_VALUE, formulas=False,
+                           multiple_of=None):
+    """
+    Γράφει ένα συνθετικό βιβλίο τιμολογίων .xlsx με `rows` γραμμές δεδομένων ανά φύλλο, στη
+    διάταξη που περιμένει η εφαρμογή: A=Α/Α, B=αριθμός τιμολογίου (shared string),
+    F=αξία και οι αναλογικές στήλες prop_cols (H από προεπιλογή). Κάθε `totals_every`
+    γραμμές υπάρχει γραμμή "Σύνολα" και κάθε `blank_every` γραμμές λείπει ο αριθμός τιμολογίου.
+
+    Οι αξίες ακολουθούν την κατανομή distribution (DISTRIBUTIONS) στο [1, max_value]· με
+    above_share (0..1) το ποσοστό αυτό των γραμμών έχει αξία από threshold και πάνω και οι
+    υπόλοιπες κάτω από αυτό. Κάθε αναλογική στήλη είναι έως 30% της αξίας. Με multiple_of οι
+    αξίες από threshold και πάνω είναι ακέραια πολλαπλάσια του multiple_of (π.χ. 5 για τη
+    διάσπαση integer_5, που διασπά μόνο τέτοιες αξίες).
+
+    Με formulas=True οι γραμμές "Σύνολα" έχουν στη F τον τύπο =SUM των γραμμών από την
+    προηγούμενη γραμμή συνόλων και στη G το σωρευτικό σύνολο (=F+G της προηγούμενης· στην
+    πρώτη γραμμή συνόλων των επόμενων φύλλων με αναφορά στο προηγούμενο φύλλο), και η G1 έχει
+    το γενικό σύνολο του φύλλου: αναφορές που πρέπει να προσαρμοστούν όταν εισάγονται γραμμές.
+
+    Returns:
+        int: Η τελευταία γραμμή κάθε φύλλου.
+    """
+    rng = random.Random(seed)
+    strings = ['Α/Α', 'Τιμολόγιο', 'Αξία', 'Μη Υπ.', 'Σύνολα']
+    prop_cols = sorted(prop_cols)
+    last_row = rows + 1
+    last_col = column_letters(max([VALUE_COL] + prop_cols + ([FORMULA_COL] if formulas else [])))
+    value_letter, formula_letter = column_letters(VALUE_COL), column_letters(FORMULA_COL)
+    header = (b'<c r="A1" t="s"><v>0</v></c><c r="B1" t="s"><v>1</v></c><c r="F1" t="s"><v>2</v></c>'
+              + ''.join(f'<c r="{column_letters(col)}1" t="s"><v>3</v></c>' for col in prop_cols).encode('utf-8'))
+    names = [SHEET_NAME if index == 1 else f'{SHEET_NAME} {index}' for index in range(1, sheets + 1)]
+    # Η τιμή της πρώτης γραμμής συνόλων (στήλη G) κάθε φύλλου, για τις αναφορές του επόμενου φύλλου.
+    first_totals = []
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zout:
+        zout.writestr('[Content_Types].xml', _CONTENT_TYPES.format(
+            sheets=''.join(_SHEET_CONTENT_TYPE.format(index=index) for index in range(1, sheets + 1))))
+        zout.writestr('_rels/.rels', _PACKAGE_RELS)
+        zout.writestr('xl/workbook.xml', _WORKBOOK.format(
+            sheets=''.join(_WORKBOOK_SHEET.format(name=name, index=index) for index, name in enumerate(names, 1))))
+        zout.writestr('xl/_rels/workbook.xml.rels', _WORKBOOK_RELS.format(
+            sheets=''.join(_WORKBOOK_SHEET_REL.format(index=index) for index in range(1, sheets + 1)), strings_id=sheets + 1))
+        for index in range(1, sheets + 1):
+            # Οι αριθμοί τιμολογίων είναι μοναδικοί σε όλο το βιβλίο.
+            prefix = 'ΤΔΑ' if index == 1 else f'ΤΔΑ{index}'
+            with zout.open(f'xl/worksheets/sheet{index}.xml', 'w', force_zip64=True) as out:
+                out.write(_SHEET_HEAD.format(last_col=last_col, last_row=last_row).encode('utf-8'))
+                grand_total = (f'<c r="{formula_letter}1"><f>SUM({value_letter}2:{value_letter}{last_row})</f></c>'
+                               .encode('utf-8') if formulas else b'')
+                out.write(b'<row r="1">' + header + grand_total + b'</row>')
+                chunk = []
+                section_start, section_sum, running_total, previous_totals = 2, 0.0, 0.0, None
+                for row in range(2, last_row + 1):
+                    if totals_every and (row - 1) % totals_every == 0 and formulas:
+                        if previous_totals is not None:
+                            cumulative = f'{value_letter}{row}+{formula_letter}{previous_totals}'
+                            running_total += section_sum
+                        elif index > 1:
+                            cumulative = f"'{names[index - 2]}'!{formula_letter}{row}+{value_letter}{row}"
+                            running_total = first_totals[index - 2] + section_sum
+                        else:
+                            cumulative = f'{value_letter}{row}'
+                            running_total = section_sum
+                        if previous_totals is None: first_totals.append(running_total)
+                        chunk.append(f'<row r="{row}"><c r="A{row}" t="s"><v>4</v></c>'
+                                     f'<c r="{value_letter}{row}"><f>SUM({value_letter}{section_start}:{value_letter}{row - 1})</f>'
+                                     f'<v>{round(section_sum, 2)}</v></c>'
+                                     f'<c r="{formula_letter}{row}"><f>{escape(cumulative)}</f><v>{round(running_total, 2)}</v></c></row>')
+                        section_start, section_sum, previous_totals = row + 1, 0.0, row
+                    elif totals_every and (row - 1) % totals_every == 0:
+                        chunk.append(f'<row r="{row}"><c r="A{row}" t="s"><v>4</v></c>'
+                                     f'<c r="F{row}"><v>{rng.randint(10000, 500000)}</v></c></row>')
+                    else:
+                        if above_share is None:
+                            value = round(_draw(rng, distribution, MIN_VALUE, max_value), 2)
+                        elif rng.random() < above_share:
+                            value = round(_draw(rng, distribution, threshold, max_value), 2)
+                        else:
+                            value = min(round(_draw(rng, distribution, MIN_VALUE, threshold), 2), threshold - 0.01)
+                        if multiple_of and value >= threshold:
+                            value = max(math.ceil(threshold / multiple_of), round(value / multiple_of)) * multiple_of
+                        props = ''.join(f'<c r="{column_letters(col)}{row}" s="1"><v>{round(value * rng.uniform(0, 0.3), 2)}</v></c>'
+                                        for col in prop_cols)
+                        if blank_every and row % blank_every == 0:
+                            invoice = ''
+                        else:
+                            strings.append(f'{prefix}-{row:07d}')
+                            invoice = f'<c r="B{row}" t="s"><v>{len(strings) - 1}</v></c>'
+                        section_sum += value
+                        chunk.append(f'<row r="{row}"><c r="A{row}"><v>{row - 1}</v></c>{invoice}'
+                                     f'<c r="F{row}" s="1"><v>{value}</v></c>{props}</row>')
+                    if len(chunk) >= 10000:
+                        out.write(''.join(chunk).encode('utf-8'))
+                        chunk = []
+                out.write(''.join(chunk).encode('utf-8'))
+                out.write(_SHEET_TAIL.encode('utf-8'))
+        with zout.open('xl/sharedStrings.xml', 'w', force_zip64=True) as out:
+            out.write(('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                       '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+                       f'count="{len(strings)}" uniqueCount="{len(strings)}">').encode('utf-8'))
+            for start in range(0, len(strings), 10000):
+                out.write(''.join(f'<si><t>{s}</t></si>' for s in strings[start:start + 10000]).encode('utf-8'))
+            out.write(b'</sst>')
+    return last_row
@@ -0,0 +1,227 @@
+"""
+Επεξεργασία αρχείων Excel από τη γραμμή εντολών, χωρίς γραφικό περιβάλλον (και χωρίς PyQt5).
+
+    python cli.py "C:\\Τιμολόγια\\*.xlsx" φάκελος_εισόδου -o φάκελος_εξόδου --threshold 500 --workers 4
+
+Με --resume συνεχίζεται η τελευταία μαζική επεξεργασία του φακέλου εξόδου (π.χ. μετά από
+κατάρρευση), με τα αρχεία και τις ρυθμίσεις που είναι καταγεγραμμένα στο journal του:
+
+    python cli.py -o φάκελος_εξόδου --resume
+
+Τα μηνύματα καταγραφής γράφονται στο stderr και η σύνοψη (ίδια μορφή με τα συνολικά
+αποτελέσματα της ExcelProcessor.process_multiple_files) σε JSON στο stdout ή στο --summary.
+Με --metrics-json / --metrics-prom γράφονται και οι μετρήσεις (χρόνοι ανά φάση, διασπάσεις
+ανά μέθοδο, μέγιστη μνήμη) σε JSON ή σε αρχείο κειμένου Prometheus.
+Κωδικός εξόδου: 0 χωρίς σφάλματα, 1 αν υπήρξαν σφάλματα, 2 για λάθος παραμέτρους.
+"""
+import os
+import sys
+import glob
+import json
+import logging
+import argparse
+import multiprocessing
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, current_dir)
+
+from modules.excel_processor import (ExcelProcessor, BACKEND_COM, BACKEND_OOXML, BACKENDS,
+                                     WRITE_MODE_INSERT, WRITE_MODE_REBUILD, SEED_SCOPES, SEED_SCOPE_ROW)
+from modules.excel_pool import com_available
+from modules.backup import BackupManager
+from modules.logger import BaseLogger, start_background_writer
+from modules.metrics import write_json, write_prometheus
+from modules.profiling import profile_dir_for
+
+EXCEL_EXTENSIONS = ('.xls', '.xlsx', '.xlsm')
+
+
+class ConsoleLogger(BaseLogger):
+    """Logger με τις ίδιες μεθόδους με τον Logger της εφαρμογής, που γράφει στο stderr και προαιρετικά σε αρχείο."""
+
+    def __init__(self, log_level=logging.INFO, log_file=None, quiet_hot_path=True):
+        super().__init__(quiet_hot_path)
+        self.logger = logging.getLogger('invoice_splitter_cli')
+        self.logger.setLevel(log_level)
+        self.logger.propagate = False
+        self.log_file = log_file
+        console_handler = logging.StreamHandler(sys.stderr)
+        console_handler.setFormatter(logging.Formatter('%(levelname)s: %(message)s'))
+        self.logger.addHandler(console_handler)
+        if log_file:
+            file_handler = logging.FileHandler(log_file, encoding='utf-8')
+            file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S'))
+            self.logger.addHandler(file_handler)
+        self.writer = start_background_writer(self.logger)
+
+    def is_enabled(self, level):
+        return self.logger.isEnabledFor(level)
+
+    def _write(self, level, message, exc_info, category=None):
+        self.logger.log(level, message, exc_info=exc_info)
+
+    def get_log_file(self):
+        return self.log_file
+
+
+def expand_inputs(patterns, recursive=False):
+    """
+    Αρχεία Excel από διαδρομές αρχείων, φακέλους ή μοτίβα glob, χωρίς διπλότυπα και με τη σειρά
+    που δόθηκαν. Τα αντίγραφα ασφαλείας και τα προσωρινά αρχεία του Excel (~$...) αγνοούνται.
+    """
+    files = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = []
+            for ext in EXCEL_EXTENSIONS:
+                sub_pattern = os.path.join(pattern, '**', f'*{ext}') if recursive else os.path.join(pattern, f'*{ext}')
+                matches.extend(glob.glob(sub_pattern, recursive=recursive))
+            matches.sort()
+        elif glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern, recursive=recursive))
+        else:
+            matches = [pattern]
+        for path in matches:
+            if os.path.basename(path).startswith('~$'): continue
+            if os.path.splitext(path)[1].lower() not in EXCEL_EXTENSIONS: continue
+            files.append(os.path.abspath(path))
+    return list(dict.fromkeys(files))
+
+
+def parse_columns(text):
+    """'8,19' -> [8, 19]"""
+    try:
+        columns = [int(part) for part in text.split(',') if part.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"μη έγκυροι αριθμοί στηλών: '{text}'")
+    if not columns or any(c < 1 for c in columns):
+        raise argparse.ArgumentTypeError(f"μη έγκυροι αριθμοί στηλών: '{text}'")
+    return list(dict.fromkeys(columns))
+
+
+def build_parser():
+    default_backend = BACKEND_COM if com_available() else BACKEND_OOXML
+    parser = argparse.ArgumentParser(prog='cli.py', description=__doc__.strip().splitlines()[0],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('inputs', nargs='*', help="Αρχεία, φάκελοι ή μοτίβα glob (π.χ. 'τιμολόγια/*.xlsx')")
+    parser.add_argument('-o', '--output-dir', required=True, help="Φάκελος αποθήκευσης (δημιουργείται αν δεν υπάρχει)")
+    parser.add_argument('-r', '--recursive', action='store_true', help="Αναζήτηση και σε υποφακέλους (και '**' στα μοτίβα)")
+
+    split = parser.add_argument_group('ρυθμίσεις διάσπασης')
+    split.add_argument('--threshold', type=float, default=500.0, help="Όριο ποσού για διάσπαση (προεπιλογή: 500)")
+    split.add_argument('--max-split', type=float, default=None, help="Μέγιστη τιμή κάθε κομματιού (προεπιλογή: το όριο)")
+    split.add_argument('--value-col', type=int, default=6, help="Στήλη βασικής αξίας (προεπιλογή: 6 = F)")
+    split.add_argument('--prop-cols', type=parse_columns, default=[8, 19], help="Στήλες αναλογικής διάσπασης (προεπιλογή: 8,19)")
+    split.add_argument('--integer-split', action='store_true', help="Διάσπαση μόνο σε ακέραια ποσά πολλαπλάσια του 5")
+    split.add_argument('--auto-numbering', action='store_true', help="Αυτόματη αρίθμηση τιμολογίων")
+    split.add_argument('--invoice-num-col', type=int, default=2, help="Στήλη αριθμού τιμολογίου (προεπιλογή: 2 = B)")
+    split.add_argument('--seed', type=int, default=None, help="Αναπαραγώγιμες διασπάσεις με αυτό το seed")
+    split.add_argument('--seed-scope', choices=SEED_SCOPES, default=SEED_SCOPE_ROW,
+                       help="Εμβέλεια του seed: ανά γραμμή (αρχείο, φύλλο, γραμμή) ή ανά ποσό (προεπιλογή: row)")
+
+    run = parser.add_argument_group('εκτέλεση')
+    run.add_argument('--backend', choices=BACKENDS, default=default_backend,
+                     help=f"Μηχανή επεξεργασίας (προεπιλογή: {default_backend})")
+    run.add_argument('--bulk-write', action='store_true', help="Γρήγορη εγγραφή φύλλου με ένα πέρασμα (μηχανή COM)")
+    run.add_argument('-j', '--workers', type=int, default=1, help="Παράλληλες διεργασίες (προεπιλογή: 1)")
+    run.add_argument('--overwrite', action='store_true', help="Αντικατάσταση αρχείων εξόδου που υπάρχουν ήδη")
+    run.add_argument('--incremental', action='store_true', help="Επεξεργασία μόνο νέων ή αλλαγμένων αρχείων (manifest)")
+    run.add_argument('--backup', action='store_true', help="Αντίγραφο ασφαλείας (.backup) κάθε αρχείου εισόδου πριν την επεξεργασία")
+    run.add_argument('--backup-archive', action='store_true',
+                     help="Τα αντίγραφα ασφαλείας σε ένα συμπιεσμένο zip στον φάκελο εξόδου (μόνο όσα αρχεία άλλαξαν)")
+    run.add_argument('--resume', action='store_true',
+                     help="Συνέχιση της τελευταίας μαζικής επεξεργασίας του φακέλου εξόδου (αρχεία και ρυθμίσεις από το journal)")
+
+    output = parser.add_argument_group('έξοδος')
+    output.add_argument('--summary', default='-', help="Αρχείο για τη σύνοψη JSON ('-' για stdout, προεπιλογή)")
+    output.add_argument('--log-file', default=None, help="Καταγραφή και σε αυτό το αρχείο")
+    output.add_argument('--metrics-json', default=None, help="Χρόνοι ανά φάση, μετρητές και μέγιστη μνήμη σε αυτό το αρχείο JSON")
+    output.add_argument('--metrics-prom', default=None, help="Οι ίδιες μετρήσεις σε αρχείο κειμένου Prometheus (textfile collector)")
+    output.add_argument('--profile', action='store_true',
+                        help="Profile (cProfile) κάθε αρχείου δίπλα στο --log-file (ή στον φάκελο εξόδου) και hotspots στο log")
+    output.add_argument('-v', '--verbose', action='store_true', help="Αναλυτική καταγραφή (DEBUG)")
+    output.add_argument('-q', '--quiet', action='store_true', help="Μόνο προειδοποιήσεις και σφάλματα")
+    output.add_argument('--log-rows', action='store_true', help="Καταγραφή κάθε γραμμής ξεχωριστά (αλλιώς συγκεντρωτικά ανά αρχείο)")
+    return parser
+
+
+def write_summary(results, destination):
+    text = json.dumps(results, ensure_ascii=False, indent=2, default=str)
+    if destination == '-':
+        sys.stdout.write(text + '\n')
+    else:
+        with open(destination, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+
+
+def write_metrics(results, args, logger):
+    for path, write in ((args.metrics_json, write_json), (args.metrics_prom, write_prometheus)):
+        if not path: continue
+        try:
+            write(results, path)
+        except OSError as e:
+            logger.error(f"Αδυναμία εγγραφής μετρήσεων '{path}': {str(e)}")
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.max_split is not None and args.max_split < 0.01:
+        parser.error("η --max-split πρέπει να είναι τουλάχιστον 0.01")
+    if args.workers < 1:
+        parser.error("η --workers πρέπει να είναι τουλάχιστον 1")
+    if args.resume and args.inputs:
+        parser.error("με --resume τα αρχεία διαβάζονται από το journal του φακέλου εξόδου· μην δίνετε αρχεία εισόδου")
+    if not args.resume and not args.inputs:
+        parser.error("δώστε τουλάχιστον ένα αρχείο, φάκελο ή μοτίβο εισόδου (ή --resume)")
+
+    log_level = logging.DEBUG if args.verbose else logging.WARNING if args.quiet else logging.INFO
+    logger = ConsoleLogger(log_level, args.log_file, quiet_hot_path=not args.log_rows)
+    profile_dir = profile_dir_for(logger, args.output_dir) if args.profile else None
+
+    if args.resume:
+        results = ExcelProcessor(logger).resume_batch(args.output_dir, workers=args.workers, profile_dir=profile_dir)
+        if results is None: return 2
+        write_summary(results, args.summary)
+        write_metrics(results, args, logger)
+        return 1 if results.get('errors', 0) else 0
+
+    files = expand_inputs(args.inputs, args.recursive)
+    if not files:
+        logger.error("Δεν βρέθηκαν αρχεία Excel (.xls, .xlsx, .xlsm) στις διαδρομές που δόθηκαν.")
+        return 2
+    missing = [path for path in files if not os.path.isfile(path)]
+    if missing:
+        for path in missing: logger.error(f"Το αρχείο δεν υπάρχει: {path}")
+        return 2
+
+    try:
+        os.makedirs(args.output_dir, exist_ok=True)
+    except OSError as e:
+        logger.error(f"Αδυναμία δημιουργίας φακέλου εξόδου '{args.output_dir}': {str(e)}")
+        return 2
+
+    if args.backup or args.backup_archive:
+        backup_results = BackupManager(logger, args.output_dir if args.backup_archive else None).backup_files(files)
+        if backup_results['failed']:
+            logger.error("Κρίσιμο σφάλμα κατά τη δημιουργία αντιγράφων ασφαλείας. Η επεξεργασία ακυρώνεται.")
+            return 1
+
+    processor = ExcelProcessor(logger)
+    results = processor.process_multiple_files(
+        files, args.output_dir, args.threshold, args.value_col, args.prop_cols, args.overwrite,
+        args.max_split, 'integer_5' if args.integer_split else 'decimal',
+        backend=args.backend, write_mode=WRITE_MODE_REBUILD if args.bulk_write else WRITE_MODE_INSERT,
+        auto_numbering=args.auto_numbering, invoice_num_col=args.invoice_num_col, workers=args.workers,
+        split_seed=args.seed, seed_scope=args.seed_scope, incremental=args.incremental, profile_dir=profile_dir,
+    )
+    write_summary(results, args.summary)
+    write_metrics(results, args, logger)
+    return 1 if results.get('errors', 0) else 0
+
+
+if __name__ == '__main__':
+    # Απαραίτητο για την παράλληλη επεξεργασία σε εκτελέσιμο PyInstaller (Windows).
+    multiprocessing.freeze_support()
+    sys.exit(main())
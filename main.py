@@ -1,5 +1,6 @@
 import sys
 import os
+import multiprocessing
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 project_root = current_dir 
@@ -22,5 +23,6 @@ except ImportError as e:
     sys.exit(1)
 
 if __name__ == '__main__':
-        
+    # Απαραίτητο για την παράλληλη επεξεργασία σε εκτελέσιμο PyInstaller (Windows).
+    multiprocessing.freeze_support()
     run_application()
\ No newline at end of file
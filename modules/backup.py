@@ -0,0 +1,238 @@
+import os
+import sys
+import json
+import shutil
+import zipfile
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from modules.file_manager import FileManager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+BACKUP_EXTENSION = '.backup'
+# Παράλληλες αντιγραφές (η αντιγραφή περιμένει κυρίως τον δίσκο ή το δίκτυο, όχι τη CPU).
+BACKUP_WORKERS = 4
+# Συμπιεσμένα αντίγραφα: ένα zip ανά μαζική επεξεργασία και ένα ευρετήριο με το hash κάθε αρχείου.
+BACKUP_ARCHIVE_PREFIX = 'splitter_backup_'
+BACKUP_INDEX_FILE = 'splitter_backups.json'
+BACKUP_INDEX_VERSION = 1
+
+# Πώς δημιουργήθηκε ένα αντίγραφο.
+BACKUP_REFLINK = 'reflink'
+BACKUP_COPY = 'copy'
+BACKUP_ARCHIVED = 'archived'
+BACKUP_UNCHANGED = 'unchanged'
+
+# ioctl του Linux για αντίγραφο copy-on-write (Btrfs, XFS, ...): τα δεδομένα δεν αντιγράφονται.
+_FICLONE = 0x40049409
+
+
+def clone_file(src, dst):
+    """
+    Αντιγράφει το src στο dst (με τα μεταδεδομένα, όπως το shutil.copy2): με reflink όπου το
+    σύστημα αρχείων το υποστηρίζει, αλλιώς με κανονική αντιγραφή.
+
+    Returns:
+        str: BACKUP_REFLINK ή BACKUP_COPY
+    """
+    if fcntl is not None and sys.platform.startswith('linux'):
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            shutil.copystat(src, dst)
+            return BACKUP_REFLINK
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+    return BACKUP_COPY
+
+
+class BackupManager:
+    """
+    Αντίγραφα ασφαλείας των αρχείων εισόδου πριν την επεξεργασία, παράλληλα σε νήματα.
+
+    Χωρίς archive_dir κάθε αρχείο αντιγράφεται στο '<αρχείο>.backup' δίπλα του (όπως η
+    FileManager.create_backup), ατομικά (προσωρινό αρχείο και os.replace). Ένα υπάρχον
+    .backup με το ίδιο περιεχόμενο δεν ξαναγράφεται: ίδιο μέγεθος και χρόνος τροποποίησης
+    (διατηρούνται στην αντιγραφή), αλλιώς ίδιο SHA-256.
+
+    Με archive_dir τα αρχεία που άλλαξαν από το τελευταίο αντίγραφο μπαίνουν σε ένα
+    συμπιεσμένο splitter_backup_<ώρα>.zip στον archive_dir, και το BACKUP_INDEX_FILE κρατά
+    το hash κάθε αρχείου (με μέγεθος και χρόνο τροποποίησης, ώστε τα αμετάβλητα αρχεία να
+    μην ξαναδιαβάζονται).
+    """
+
+    def __init__(self, logger=None, archive_dir=None, workers=BACKUP_WORKERS):
+        self.logger = logger
+        self.archive_dir = archive_dir
+        self.workers = max(1, int(workers or 1))
+
+    def backup_files(self, files, progress_callback=None, should_stop=None):
+        """
+        Αντίγραφα ασφαλείας όλων των files. progress_callback(done, total) καλείται μετά από κάθε
+        αρχείο και το should_stop() ελέγχεται πριν από κάθε νέο αρχείο.
+
+        Returns:
+            dict: backed_up, reflinked, unchanged, failed ({αρχείο: μήνυμα}), archive (διαδρομή ή None), cancelled
+        """
+        results = {'backed_up': 0, 'reflinked': 0, 'unchanged': 0, 'failed': {}, 'archive': None, 'cancelled': False}
+        if not files: return results
+        if self.archive_dir is None:
+            task, index = self._backup_copy, None
+        else:
+            index = self._load_index()
+            task = lambda path: self._check_archive(path, index)
+
+        done = 0
+        outcomes = {}
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(files))) as executor:
+            futures = {}
+            for path in files:
+                if should_stop and should_stop():
+                    results['cancelled'] = True
+                    break
+                futures[executor.submit(self._run_task, task, path, should_stop)] = path
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    outcome = future.result()
+                except OSError as e:
+                    results['failed'][path] = str(e)
+                    if self.logger: self.logger.error(f"Σφάλμα αντιγράφου ασφαλείας για το '{os.path.basename(path)}': {str(e)}")
+                else:
+                    if outcome is None: results['cancelled'] = True
+                    else: outcomes[path] = outcome
+                done += 1
+                if progress_callback: progress_callback(done, len(files))
+
+        if index is not None:
+            self._write_archive(files, outcomes, index, results)
+        for path, outcome in outcomes.items():
+            if outcome[0] == BACKUP_UNCHANGED: results['unchanged'] += 1
+            elif outcome[0] in (BACKUP_REFLINK, BACKUP_COPY):
+                results['backed_up'] += 1
+                if outcome[0] == BACKUP_REFLINK: results['reflinked'] += 1
+        if self.logger:
+            self.logger.info(f"Αντίγραφα ασφαλείας: {results['backed_up']} νέα ({results['reflinked']} reflink), "
+                             f"{results['unchanged']} αμετάβλητα, {len(results['failed'])} σφάλματα"
+                             + (f" — {results['archive']}" if results['archive'] else ""))
+        return results
+
+    @staticmethod
+    def _run_task(task, path, should_stop):
+        if should_stop and should_stop(): return None
+        return task(path)
+
+    def _backup_copy(self, path):
+        """Αντίγραφο '<αρχείο>.backup' δίπλα στο αρχείο, αν δεν υπάρχει ήδη με το ίδιο περιεχόμενο."""
+        backup_path = f"{path}{BACKUP_EXTENSION}"
+        source = os.stat(path)
+        try:
+            existing = os.stat(backup_path)
+        except FileNotFoundError:
+            existing = None
+        if existing is not None and existing.st_size == source.st_size:
+            if existing.st_mtime_ns == source.st_mtime_ns or FileManager.file_sha256(backup_path) == FileManager.file_sha256(path):
+                if self.logger: self.logger.debug(f"Αμετάβλητο αντίγραφο ασφαλείας: {os.path.basename(backup_path)}")
+                return (BACKUP_UNCHANGED, backup_path)
+        temp_path = f"{backup_path}.tmp"
+        try:
+            method = clone_file(path, temp_path)
+            os.replace(temp_path, backup_path)
+        finally:
+            if os.path.exists(temp_path): os.remove(temp_path)
+        if self.logger: self.logger.info(f"OK Backup: {os.path.basename(backup_path)}")
+        return (method, backup_path)
+
+    def _check_archive(self, path, index):
+        """(BACKUP_UNCHANGED, sha256) αν το αρχείο είναι ίδιο με το τελευταίο αντίγραφό του, αλλιώς (BACKUP_ARCHIVED, sha256)."""
+        stat = os.stat(path)
+        entry = index.get(os.path.abspath(path))
+        if entry and entry.get('size') == stat.st_size and entry.get('mtime_ns') == stat.st_mtime_ns:
+            return (BACKUP_UNCHANGED, entry['sha256'])
+        sha256 = FileManager.file_sha256(path)
+        if entry and entry.get('sha256') == sha256:
+            return (BACKUP_UNCHANGED, sha256)
+        return (BACKUP_ARCHIVED, sha256)
+
+    def _write_archive(self, files, outcomes, index, results):
+        """Γράφει στο zip τα αρχεία που άλλαξαν και ενημερώνει το ευρετήριο (με τη σειρά των files)."""
+        changed = [path for path in files if path in outcomes and outcomes[path][0] == BACKUP_ARCHIVED]
+        archive_path = None
+        if changed:
+            os.makedirs(self.archive_dir, exist_ok=True)
+            stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            archive_path = os.path.join(self.archive_dir, f"{BACKUP_ARCHIVE_PREFIX}{stamp}.zip")
+            # Ένα προηγούμενο αντίγραφο του ίδιου δευτερολέπτου δεν αντικαθίσταται.
+            counter = 1
+            while os.path.exists(archive_path):
+                counter += 1
+                archive_path = os.path.join(self.archive_dir, f"{BACKUP_ARCHIVE_PREFIX}{stamp}_{counter}.zip")
+            temp_path = f"{archive_path}.tmp"
+            names = set()
+            try:
+                with zipfile.ZipFile(temp_path, 'w', zipfile.ZIP_DEFLATED) as archive:
+                    for path in changed:
+                        name = os.path.basename(path)
+                        # Ίδιο όνομα από διαφορετικούς φακέλους: πρόθεμα με αύξοντα αριθμό.
+                        counter = 1
+                        while name in names:
+                            counter += 1
+                            name = f"{counter}_{os.path.basename(path)}"
+                        names.add(name)
+                        try:
+                            archive.write(path, name)
+                        except OSError as e:
+                            results['failed'][path] = str(e)
+                            outcomes.pop(path)
+                            if self.logger: self.logger.error(f"Σφάλμα αντιγράφου ασφαλείας για το '{os.path.basename(path)}': {str(e)}")
+                os.replace(temp_path, archive_path)
+            except OSError as e:
+                for path in changed:
+                    if path in outcomes:
+                        results['failed'][path] = str(e)
+                        outcomes.pop(path)
+                if self.logger: self.logger.error(f"Αδυναμία εγγραφής συμπιεσμένου αντιγράφου '{archive_path}': {str(e)}")
+                archive_path = None
+            finally:
+                if os.path.exists(temp_path): os.remove(temp_path)
+            results['archive'] = archive_path
+
+        for path, (outcome, sha256) in list(outcomes.items()):
+            stat = os.stat(path)
+            entry = index.get(os.path.abspath(path), {})
+            if outcome == BACKUP_ARCHIVED:
+                entry = {'sha256': sha256, 'archive': os.path.basename(archive_path)}
+                outcomes[path] = (BACKUP_COPY, archive_path)
+            entry.update({'sha256': sha256, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns})
+            index[os.path.abspath(path)] = entry
+        self._save_index(index)
+
+    @property
+    def index_path(self):
+        return os.path.join(self.archive_dir, BACKUP_INDEX_FILE)
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == BACKUP_INDEX_VERSION: return data.get('files', {})
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            if self.logger: self.logger.warning(f"Το ευρετήριο αντιγράφων '{self.index_path}' δεν διαβάστηκε ({str(e)}). Όλα τα αρχεία θα αντιγραφούν.")
+        return {}
+
+    def _save_index(self, index):
+        try:
+            os.makedirs(self.archive_dir, exist_ok=True)
+            temp_path = f"{self.index_path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': BACKUP_INDEX_VERSION, 'files': index}, f, ensure_ascii=False, indent=1)
+            os.replace(temp_path, self.index_path)
+        except OSError as e:
+            if self.logger: self.logger.warning(f"Αδυναμία αποθήκευσης ευρετηρίου αντιγράφων '{self.index_path}': {str(e)}")
@@ -0,0 +1,203 @@
+import time
+import threading
+import importlib.util
+
+# Μετά από πόσα βιβλία εργασίας ανακυκλώνεται (κλείνει και ξαναξεκινά) μια συνεδρία Excel.
+DEFAULT_MAX_WORKBOOKS_PER_SESSION = 50
+# Μετά από πόσα σφάλματα COM ανακυκλώνεται μια συνεδρία Excel.
+DEFAULT_MAX_COM_ERRORS = 3
+
+# Σταθερές του Excel που χρησιμοποιεί η μηχανή COM (ίδιες τιμές με τα win32com.client.constants,
+# ώστε να μη χρειάζονται τα constants του gencache ούτε με εικονικό object model).
+XL_CALCULATION_AUTOMATIC = -4105
+XL_CALCULATION_MANUAL = -4135
+XL_SHIFT_DOWN = -4121
+
+
+# Τα win32com.client/pythoncom φορτώνονται μόνο όταν χρησιμοποιηθεί η μηχανή COM.
+_com_modules = None
+
+
+def load_com():
+    """
+    Φορτώνει (μία φορά) τα win32com.client και pythoncom.
+
+    Returns:
+        tuple: (win32com.client, pythoncom) ή (None, None) αν δεν υπάρχει το pywin32.
+    """
+    global _com_modules
+    if _com_modules is None:
+        try:
+            import win32com.client as win32
+            import pythoncom
+        except ImportError:
+            win32 = None
+            pythoncom = None
+        _com_modules = (win32, pythoncom)
+    return _com_modules
+
+
+class SimulatedComError(Exception):
+    """Σφάλμα ενός εικονικού object model του Excel· η μηχανή COM το χειρίζεται όπως το pythoncom.com_error."""
+
+
+def com_error_types():
+    """Οι εξαιρέσεις που θεωρούνται σφάλματα COM (pythoncom.com_error, αν υπάρχει το pywin32, και SimulatedComError)."""
+    _, pythoncom = load_com()
+    return (SimulatedComError,) if pythoncom is None else (pythoncom.com_error, SimulatedComError)
+
+
+def com_available():
+    """True αν είναι εγκατεστημένο το pywin32, χωρίς να φορτωθεί."""
+    try:
+        return importlib.util.find_spec('win32com') is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def _default_dispatch():
+    win32, _ = load_com()
+    return win32.gencache.EnsureDispatch('Excel.Application')
+
+
+class ExcelSession:
+    """Μια ανοιχτή εφαρμογή Excel του pool, με μετρητές χρήσης."""
+
+    def __init__(self, app, session_id):
+        self.app = app
+        self.session_id = session_id
+        self.workbooks_processed = 0
+        self.com_errors = 0
+        self.started_at = time.time()
+
+
+class ExcelAppPool:
+    """
+    Pool από μακρόβιες εφαρμογές Excel για επεξεργασία πολλών αρχείων χωρίς
+    εκκίνηση νέου Excel ανά αρχείο.
+
+    Τα αντικείμενα COM ανήκουν στο νήμα (apartment) που τα δημιούργησε, γι' αυτό
+    το pool χρησιμοποιείται μόνο από το νήμα που το δημιούργησε: εκεί γίνεται και
+    το CoInitialize (στο πρώτο acquire) και το CoUninitialize (στο shutdown).
+
+    Κάθε συνεδρία ελέγχεται πριν δοθεί (health check) και ανακυκλώνεται μετά από
+    max_workbooks βιβλία ή max_com_errors σφάλματα COM. Το dispatch είναι factory
+    που επιστρέφει νέο αντικείμενο Excel.Application, ώστε να μπορεί να δοθεί
+    ένα εικονικό object model αντί για το πραγματικό Excel.
+    """
+
+    def __init__(self, logger=None, dispatch=None, max_workbooks=DEFAULT_MAX_WORKBOOKS_PER_SESSION,
+                 max_com_errors=DEFAULT_MAX_COM_ERRORS, com_init=None):
+        self.logger = logger
+        self.dispatch = dispatch or _default_dispatch
+        # True αν το dispatch δεν είναι το πραγματικό Excel (π.χ. εικονικό object model).
+        self.simulated = dispatch is not None
+        self.max_workbooks = max_workbooks
+        self.max_com_errors = max_com_errors
+        # Το CoInitialize χρειάζεται μόνο για το πραγματικό Excel.
+        self.com_init = (dispatch is None and load_com()[1] is not None) if com_init is None else com_init
+        self._idle = []
+        self._sessions = []
+        self._next_id = 1
+        self._com_initialized = False
+        self._thread_id = None
+        self.stats = {'sessions_started': 0, 'sessions_recycled': 0, 'health_check_failures': 0, 'workbooks_processed': 0}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+        return False
+
+    def _ensure_com(self):
+        if self._thread_id is None:
+            self._thread_id = threading.get_ident()
+        elif self._thread_id != threading.get_ident():
+            raise RuntimeError("Το ExcelAppPool χρησιμοποιείται μόνο από το νήμα που το δημιούργησε.")
+        if self.com_init and not self._com_initialized:
+            _, pythoncom = load_com()
+            try:
+                pythoncom.CoInitialize()
+            except pythoncom.com_error as e:
+                if self.logger: self.logger.warning(f"Pythoncom.CoInitialize com_error: {e} (Maybe ignorable)")
+            self._com_initialized = True
+
+    def _start_session(self):
+        if self.dispatch is _default_dispatch and load_com()[0] is None:
+            raise RuntimeError("Η μηχανή COM απαιτεί Windows, εγκατεστημένο Microsoft Excel και pywin32.")
+        app = self.dispatch()
+        app.Visible = False
+        app.DisplayAlerts = False
+        session = ExcelSession(app, self._next_id)
+        self._next_id += 1
+        self._sessions.append(session)
+        self.stats['sessions_started'] += 1
+        if self.logger: self.logger.debug(f"Excel pool: εκκίνηση συνεδρίας #{session.session_id}.")
+        return session
+
+    def _is_healthy(self, session):
+        """Ελέγχει ότι η εφαρμογή Excel απαντά και δεν έχει ξεχασμένα ανοιχτά βιβλία."""
+        try:
+            app = session.app
+            if app.Workbooks.Count > 0:
+                for idx in range(app.Workbooks.Count, 0, -1):
+                    app.Workbooks(idx).Close(SaveChanges=False)
+            app.DisplayAlerts = False
+            return True
+        except Exception as e:
+            if self.logger: self.logger.warning(f"Excel pool: η συνεδρία #{session.session_id} δεν απαντά ({e}). Αντικατάσταση...")
+            return False
+
+    def _quit_session(self, session):
+        if session in self._sessions:
+            self._sessions.remove(session)
+        try:
+            session.app.DisplayAlerts = True
+            session.app.Quit()
+        except Exception:
+            pass
+        session.app = None
+        if self.logger: self.logger.debug(f"Excel pool: τερματισμός συνεδρίας #{session.session_id} ({session.workbooks_processed} βιβλία, {session.com_errors} σφάλματα COM).")
+
+    def acquire(self):
+        """Επιστρέφει μια υγιή συνεδρία Excel (υπάρχουσα ή νέα)."""
+        self._ensure_com()
+        while self._idle:
+            session = self._idle.pop()
+            if self._is_healthy(session):
+                return session
+            self.stats['health_check_failures'] += 1
+            self._quit_session(session)
+        return self._start_session()
+
+    def release(self, session, com_error=False):
+        """
+        Επιστρέφει μια συνεδρία στο pool μετά την επεξεργασία ενός βιβλίου.
+        Αν ξεπεράστηκαν τα όρια βιβλίων/σφαλμάτων, η συνεδρία κλείνει.
+        """
+        if session is None or session.app is None:
+            return
+        session.workbooks_processed += 1
+        self.stats['workbooks_processed'] += 1
+        if com_error:
+            session.com_errors += 1
+        if (session.workbooks_processed >= self.max_workbooks or
+                session.com_errors >= self.max_com_errors):
+            self.stats['sessions_recycled'] += 1
+            if self.logger: self.logger.debug(f"Excel pool: ανακύκλωση συνεδρίας #{session.session_id}.")
+            self._quit_session(session)
+        else:
+            self._idle.append(session)
+
+    def shutdown(self):
+        """Κλείνει όλες τις εφαρμογές Excel του pool και απελευθερώνει το COM."""
+        for session in list(self._sessions):
+            self._quit_session(session)
+        self._idle = []
+        if self._com_initialized:
+            try:
+                load_com()[1].CoUninitialize()
+            except Exception:
+                pass
+            self._com_initialized = False
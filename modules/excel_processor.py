@@ -1,38 +1,103 @@
 import os
+import logging
 import decimal
 import random
-import win32com.client as win32
-import pythoncom
+import itertools
+import contextlib
 import time
 
+from modules.file_manager import FileManager
+from modules.manifest import BatchManifest, settings_sha256
+from modules.journal import BatchJournal, JOURNAL_FILE
+from modules.logger import CATEGORY_UI
+from modules.metrics import peak_memory_bytes, merge_timings, timings_summary
+from modules.progress import RowProgress, ProcessingCancelled, PHASE_OPEN, PHASE_SCAN, PHASE_SPLIT, PHASE_WRITE, PHASE_SAVE
+from modules.money import to_cents, from_cents, format_cents, div_round_half_up
+from modules.split_plan import (SplitPlan, SplitCache, SeededRandom, plan_splits, seed_key, row_key, row_keys, random_keys,
+                                SPLIT_CACHE_SIZE, SEED_SCOPE_ROW, SEED_SCOPE_GLOBAL, SEED_SCOPES,
+                                SPLIT_NONE, SPLIT_BELOW_MAX, SPLIT_NOT_MULTIPLE_5, SPLIT_IMPOSSIBLE, SPLIT_RANDOM_2,
+                                SPLIT_HALF_2, SPLIT_RANDOM_N, SPLIT_INTEGER_5, np)
+
+# Οι μηχανές (modules.ooxml_backend, modules.excel_pool με το pywin32) και η παράλληλη
+# εκτέλεση (modules.parallel_runner) φορτώνονται μόνο όταν επιλεγούν, ώστε ο πυρήνας
+# να φορτώνεται γρήγορα και χωρίς pywin32 ή PyQt5.
+
+# Εκτιμώμενο μέρος του χρόνου ενός αρχείου που αναλογεί στην αποθήκευση με τη μηχανή OOXML.
+OOXML_SAVE_PROGRESS_SHARE = 0.6
+
+BACKEND_COM = 'com'
+BACKEND_OOXML = 'ooxml'
+BACKENDS = (BACKEND_COM, BACKEND_OOXML)
+
+# Πόσες γραμμές διαβάζονται με μία κλήση Range.Value στη μηχανή COM.
+COM_READ_WINDOW_ROWS = 10000
+
+# Τρόπος εγγραφής διασπάσεων στη μηχανή COM:
+# 'insert': EntireRow.Insert ανά διασπασμένη γραμμή (αρχική συμπεριφορά).
+# 'rebuild': εισαγωγή των γραμμών όλων των διασπάσεων με λίγες κλήσεις EntireRow.Insert σε ένωση
+# περιοχών και μαζική εγγραφή Range μόνο των γραμμών των διασπάσεων.
+WRITE_MODE_INSERT = 'insert'
+WRITE_MODE_REBUILD = 'rebuild'
+WRITE_MODES = (WRITE_MODE_INSERT, WRITE_MODE_REBUILD)
+# Πόσες περιοχές γραμμών εισάγονται το πολύ με μία κλήση EntireRow.Insert στη λειτουργία 'rebuild'.
+COM_INSERT_MAX_AREAS = 500
+# Πόσες περιοχές δέχεται μία κλήση Application.Union του Excel.
+COM_UNION_MAX_ARGS = 30
+
+# Μετρητές του υπολογισμού διασπάσεων στα αποτελέσματα (ανά αρχείο και συνολικά):
+# τυχαίος διαχωρισμός N-way (και γραμμές N-way χωρίς έγκυρο διαχωρισμό), κρυφή μνήμη διασπάσεων
+# (SplitCache) και διασπασμένες γραμμές ανά μέθοδο.
+SPLIT_STATS_KEYS = ('sampler_calls', 'sampler_clamped_parts', 'impossible_n_way', 'split_cache_hits', 'split_cache_misses',
+                    'random_splits', 'deterministic_splits')
+# Ο μετρητής κάθε μεθόδου διάσπασης (SPLIT_*): τυχαίες και ντετερμινιστικές (μισά, ακέραια x5).
+SPLIT_METHOD_STATS = {SPLIT_RANDOM_2: 'random_splits', SPLIT_RANDOM_N: 'random_splits', SPLIT_HALF_2: 'deterministic_splits',
+                      SPLIT_INTEGER_5: 'deterministic_splits'}
+
+# Κατηγορίες κειμένου για τον διανυσματικό έλεγχο υποψήφιων γραμμών.
+TEXT_EMPTY = 0
+TEXT_VALUE = 1
+TEXT_TOTALS = 2
+
+
+def classify_text(value):
+    """Κατηγορία κειμένου κελιού, με τους κανόνες του ExcelProcessor._is_split_candidate."""
+    text = str(value)
+    if text.strip() == "": return TEXT_EMPTY
+    if "σύνολα" in text.lower(): return TEXT_TOTALS
+    return TEXT_VALUE
+
 class ExcelProcessor:
     
-    def __init__(self, logger=None):
+    def __init__(self, logger=None, split_cache_size=SPLIT_CACHE_SIZE, com_dispatch=None):
         self.logger = logger
+        # Factory εφαρμογών Excel για τη μηχανή COM (dispatch του ExcelAppPool)· None για το πραγματικό Excel.
+        self.com_dispatch = com_dispatch
+        # Κοινή για όλα τα φύλλα και αρχεία που επεξεργάζεται αυτός ο processor.
+        self.split_cache = SplitCache(split_cache_size)
         
-    def _generate_n_splits_integer_multiple_of_5(self, value_decimal, N, max_split_decimal):
+    def _generate_n_splits_integer_multiple_of_5(self, value_cents, N, max_split_cents):
         """
         Διασπά μια τιμή (πολλαπλάσιο του 5) σε Ν ακέραια κομμάτια, πολλαπλάσια του 5.
-        Κάθε κομμάτι πρέπει να είναι < max_split_decimal.
+        Κάθε κομμάτι πρέπει να είναι < max_split_cents. Τα ποσά είναι σε ακέραια λεπτά.
         """
-        if self.logger: self.logger.info(f"Integer (x5) split: V={value_decimal}, N={N}, Max={max_split_decimal}")
+        if self.logger: self.logger.row_event('integer_5_attempt', lambda: f"Integer (x5) split: V={format_cents(value_cents)}, N={N}, Max={format_cents(max_split_cents)}")
 
         
-        if value_decimal % 5 != 0:
-            if self.logger: self.logger.error(f"Integer (x5) split: Η αρχική τιμή {value_decimal} δεν είναι πολλαπλάσιο του 5. Αδύνατη η διάσπαση.")
+        if value_cents % 500 != 0:
+            if self.logger: self.logger.error(f"Integer (x5) split: Η αρχική τιμή {format_cents(value_cents)} δεν είναι πολλαπλάσιο του 5. Αδύνατη η διάσπαση.")
             return None
 
         
-        value_units = int(value_decimal / 5)
+        value_units = value_cents // 500
         
-        max_split_units = int((max_split_decimal - 1) / 5)
+        max_split_units = max((max_split_cents - 100) // 500, 0)
 
-        if self.logger: self.logger.debug(f"Integer (x5) split -> Units: Value={value_units}, N={N}, Max={max_split_units}")
+        if self.logger: self.logger.debug("Integer (x5) split -> Units: Value=%d, N=%d, Max=%d", value_units, N, max_split_units)
 
         if N <= 0 or value_units < N:
             return None
         if max_split_units <= 0:
-            if self.logger: self.logger.error(f"Integer (x5) split: Το μέγιστο όριο ({max_split_decimal}) είναι πολύ μικρό.")
+            if self.logger: self.logger.error(f"Integer (x5) split: Το μέγιστο όριο ({format_cents(max_split_cents)}) είναι πολύ μικρό.")
             return None
 
         
@@ -40,10 +105,10 @@ class ExcelProcessor:
         remainder_units = value_units % N
 
         if base_part_units > max_split_units:
-             if self.logger: self.logger.warning(f"Integer (x5) split: Το βασικό κομμάτι ({base_part_units*5}€) υπερβαίνει το όριο.")
+             if self.logger: self.logger.row_event('integer_5_over_max', "Integer (x5) split: Το βασικό κομμάτι (%d€) υπερβαίνει το όριο.", base_part_units * 5, level=logging.WARNING)
              return None
         if base_part_units + 1 > max_split_units and remainder_units > 0:
-            if self.logger: self.logger.warning(f"Integer (x5) split: Η προσθήκη υπολοίπου υπερβαίνει το όριο.")
+            if self.logger: self.logger.row_event('integer_5_over_max', "Integer (x5) split: Η προσθήκη υπολοίπου υπερβαίνει το όριο.", level=logging.WARNING)
             return None
 
         parts_units = [base_part_units] * N
@@ -56,99 +121,355 @@ class ExcelProcessor:
             return None
 
         
-        final_parts_decimal = [decimal.Decimal(p * 5) for p in parts_units]
+        final_parts_cents = [p * 500 for p in parts_units]
         
-        if self.logger: self.logger.info(f"Integer (x5) split success. Parts: {final_parts_decimal}")
-        return final_parts_decimal
-
-    def generate_n_splits_normalized(self, value_decimal, N, max_split_decimal, epsilon, max_retries=100):
-        rounding_precision = decimal.Decimal('0.01')
-        current_context = decimal.getcontext()
-        original_prec = current_context.prec
-        current_context.prec = max(original_prec, 34)
-        try:
-            if N <= 0 or value_decimal < N * epsilon:
-                if self.logger: self.logger.error(f"generate_n_splits_normalized: Αδύνατη η διάσπαση του {value_decimal} σε {N} κομμάτια >= {epsilon}.")
-                return None
-            for attempt in range(max_retries):
-                rand_nums = [decimal.Decimal(str(random.uniform(0.01, 1.0))) for _ in range(N)]
-                total_rand = sum(rand_nums)
-                if total_rand == 0: continue
-                parts_initial = [(r / total_rand) * value_decimal for r in rand_nums]
-                parts_quantized = [p.quantize(rounding_precision, rounding=decimal.ROUND_HALF_UP) for p in parts_initial]
-                all_valid_pre_adjust = all(pq >= epsilon and pq < max_split_decimal for pq in parts_quantized)
-                if not all_valid_pre_adjust: continue
-                current_sum = sum(parts_quantized)
-                diff = value_decimal - current_sum
-                idx = 0
-                max_adjust_loops = N * 5
-                adjustment_step = rounding_precision if diff > 0 else -rounding_precision
-                while abs(diff) >= rounding_precision / 2 and idx < max_adjust_loops:
-                    part_idx = random.randrange(N)
-                    adjusted_part = parts_quantized[part_idx] + adjustment_step
-                    if adjusted_part >= epsilon and adjusted_part < max_split_decimal:
-                        parts_quantized[part_idx] = adjusted_part
-                        diff -= adjustment_step
-                    idx += 1
-                final_sum = sum(parts_quantized)
-                if abs(value_decimal - final_sum) < rounding_precision / 2:
-                    all_valid_final = all(pq >= epsilon and pq < max_split_decimal for pq in parts_quantized)
-                    if all_valid_final:
-                        if self.logger: self.logger.debug(f"generate_n_splits_normalized success after {attempt+1} tries.")
-                        return parts_quantized
-            if self.logger: self.logger.error(f"Αποτυχία generate_n_splits_normalized για V={value_decimal}, N={N}, max_split={max_split_decimal} μετά από {max_retries}.")
+        if self.logger: self.logger.row_event('integer_5_split', lambda: f"Integer (x5) split success. Parts: {[format_cents(p) for p in final_parts_cents]}")
+        return final_parts_cents
+
+    def generate_n_splits_normalized(self, value_cents, N, max_split_cents, epsilon_cents=1, stats=None, rand=None):
+        """
+        Τυχαία διάσπαση σε N κομμάτια, σε ένα πέρασμα O(N) χωρίς απόρριψη/επανάληψη.
+
+        Κάθε κομμάτι παίρνει από το υπόλοιπο ποσό μερίδιο ανάλογο ενός τυχαίου βάρους
+        random.uniform(0.01, 1.0) (ROUND_HALF_UP) και περιορίζεται στο διάστημα που αφήνει
+        τα επόμενα κομμάτια εφικτά, άρα κάθε κομμάτι είναι στο [epsilon_cents, max_split_cents)
+        και το άθροισμα είναι ακριβώς η τιμή. Τα ποσά είναι σε ακέραια λεπτά.
+        rand: πηγή τυχαίων τιμών (SeededRandom για αναπαραγώγιμη διάσπαση· προεπιλογή το module random).
+
+        Returns:
+            list: Τα κομμάτια, ή None αν δεν υπάρχει έγκυρη διάσπαση σε N κομμάτια.
+        """
+        capacity = max_split_cents - 1 - epsilon_cents
+        remaining = value_cents - N * epsilon_cents
+        if N <= 0 or remaining < 0 or capacity < 0 or remaining > N * capacity:
+            # Η γραμμή αναφέρεται ήδη στις παραλείψεις (skipped_details)· εδώ μόνο καταμετράται.
+            if self.logger: self.logger.row_event('n_way_impossible', lambda: f"Αποτυχία generate_n_splits_normalized για V={format_cents(value_cents)}, N={N}, max_split={format_cents(max_split_cents)}: δεν υπάρχει έγκυρη διάσπαση.", level=logging.DEBUG)
             return None
-        finally:
-             current_context.prec = original_prec
-
-    def _generate_n_splits_deterministic(self, value_decimal, N, max_split_decimal, epsilon):
-        rounding_precision = decimal.Decimal('0.01')
-        with decimal.localcontext() as ctx:
-             ctx.prec = max(ctx.prec, 28)
-             if N <= 0 or value_decimal < N * epsilon:
-                 if self.logger: self.logger.debug(f"_generate_n_splits_deterministic: Αδύνατη είσοδος N={N}, V={value_decimal}")
-                 return None
-             base_part = (value_decimal / N).quantize(rounding_precision, rounding=decimal.ROUND_FLOOR)
-             if base_part < epsilon:
-                 if self.logger: self.logger.debug(f"_deterministic fallback: Base part {base_part} < epsilon for N={N}.")
-                 return None
-             remainder = value_decimal - (base_part * N)
-             num_parts_to_increment = int(remainder / epsilon)
-             if base_part + epsilon >= max_split_decimal and num_parts_to_increment > 0:
-                 if self.logger: self.logger.debug(f"_deterministic fallback: Incrementing base part {base_part} would exceed max_split {max_split_decimal}.")
-                 return None
-             parts = [base_part] * N
-             for i in range(num_parts_to_increment):
-                 if i < N: parts[i] += epsilon
-             final_sum = sum(parts)
-             if abs(final_sum - value_decimal) >= rounding_precision / 2:
-                 if self.logger: self.logger.error(f"_deterministic fallback: Σφάλμα αθροίσματος! Αναμενόταν {value_decimal}, βρέθηκε {final_sum}. Parts: {parts}")
-                 return None
-             all_valid = all(p >= epsilon and p < max_split_decimal for p in parts)
-             if all_valid:
-                 if self.logger: self.logger.info(f"Η ντετερμινιστική διάσπαση (fallback) παρήγαγε {N} έγκυρα κομμάτια.")
-                 return parts
-             else:
-                 if self.logger: self.logger.warning(f"Η ντετερμινιστική διάσπαση (fallback) απέτυχε ελέγχους ορίων για V={value_decimal}, N={N}, max_split={max_split_decimal}.")
-                 return None
+        if rand is None: rand = random
+        uniform = rand.uniform
+        weights = [uniform(0.01, 1.0) for _ in range(N)]
+        # Άθροισμα από αριστερά προς τα δεξιά, με την ίδια σειρά πράξεων με το split_plan._sample_n_way.
+        weights_left = 0.0
+        for weight in weights: weights_left += weight
+        parts = []
+        clamped = 0
+        for i, weight in enumerate(weights):
+            lower = max(0, remaining - (N - 1 - i) * capacity)
+            upper = min(capacity, remaining)
+            if i == N - 1: extra = remaining
+            else: extra = int(remaining * weight / weights_left + 0.5)
+            if extra < lower: extra = lower; clamped += 1
+            elif extra > upper: extra = upper; clamped += 1
+            parts.append(epsilon_cents + extra)
+            remaining -= extra
+            weights_left -= weight
+        # Ο περιορισμός στα όρια επηρεάζει περισσότερο τα τελευταία κομμάτια· η ανακατάταξη
+        # αφήνει όλες τις θέσεις με την ίδια κατανομή.
+        if clamped: rand.shuffle(parts)
+        if stats is not None:
+            stats['sampler_calls'] = stats.get('sampler_calls', 0) + 1
+            stats['sampler_clamped_parts'] = stats.get('sampler_clamped_parts', 0) + clamped
+        return parts
 
-    
-    def process_file(self, input_path, output_path, threshold=500, value_col=6, prop_cols=None, overwrite=False, max_split_value=None, split_mode='decimal', auto_numbering=False, invoice_num_col=2):
+    def _is_split_candidate(self, cell_a_value, value, cell_b_value, threshold):
+        """
+        Ελέγχει αν μια γραμμή είναι υποψήφια για διάσπαση: δεν είναι γραμμή συνόλων,
+        η αξία είναι >= όριο και οι στήλες A και B δεν είναι κενές.
+        """
+        if cell_a_value and "σύνολα" in str(cell_a_value).lower(): return False
+        if not (value and isinstance(value, (int, float)) and value >= threshold): return False
+        return (cell_a_value is not None and str(cell_a_value).strip() != "" and
+                cell_b_value is not None and str(cell_b_value).strip() != "")
+
+    def _scan_sheet_rows(self, workbook, sheet, threshold, value_col, prop_cols, progress=None):
+        """
+        Βρίσκει τις υποψήφιες γραμμές ενός φύλλου OOXML ελέγχοντας κάθε γραμμή καθώς διαβάζεται.
+
+        Returns:
+            tuple: ([(γραμμή, αξία, (τιμές αναλογικών στηλών))], τελευταία γραμμή, τιμή A1)
+        """
+        last_row = 0
+        first_cell_value = None
+
+        def is_candidate(row, cells):
+            nonlocal last_row, first_cell_value
+            if row > last_row: last_row = row
+            if progress is not None and not row & 1023: progress.update(row)
+            if row == 1:
+                first_cell_value = cells.get(1)
+                return False
+            return self._is_split_candidate(cells.get(1), cells.get(value_col), cells.get(2), threshold)
+
+        # Κρατούνται μόνο οι υποψήφιες γραμμές, και από αυτές μόνο η αξία και οι αναλογικές στήλες.
+        candidates = [
+            (row, cells.get(value_col), tuple(cells.get(c) for c in prop_cols))
+            for row, cells in workbook.iter_rows(sheet, {1, 2, value_col, *prop_cols}, is_candidate)
+        ]
+        return candidates, last_row, first_cell_value
+
+    def _scan_sheet_columns(self, workbook, sheet, threshold, value_col, prop_cols, progress=None):
+        """
+        Ίδιο αποτέλεσμα με την _scan_sheet_rows, αλλά οι στήλες A, B και αξίας διαβάζονται ανά
+        τμήμα σε πίνακες NumPy και ο έλεγχος γίνεται με διανυσματικές μάσκες.
+
+        Raises:
+            ColumnScanUnsupported: αν δεν υπάρχει NumPy ή το φύλλο δεν διαβάζεται ανά στήλη.
+        """
+        from modules.ooxml_backend import KIND_EMPTY, KIND_NUMBER, KIND_BOOL, KIND_TEXT
+        candidates = []
+        last_row = 0
+        first_cell_value = None
+        for block in workbook.iter_column_blocks(sheet, {1, 2, value_col, *prop_cols}, classify_text):
+            last_row = max(last_row, block.last_row)
+            if progress is not None: progress.update(block.last_row)
+            if block.first_row == 1:
+                first_cell_value = block.value(1, 1)
+
+            value_kind = block.kinds[value_col]
+            values = block.numbers[value_col]
+            with np.errstate(invalid='ignore'):
+                mask = ((value_kind == KIND_NUMBER) | (value_kind == KIND_BOOL)) & (values != 0) & (values >= threshold)
+            a_kind, a_code = block.kinds[1], block.codes[1]
+            mask &= (a_kind != KIND_EMPTY) & ((a_kind != KIND_TEXT) | (a_code == TEXT_VALUE))
+            b_kind, b_code = block.kinds[2], block.codes[2]
+            mask &= (b_kind != KIND_EMPTY) & ((b_kind != KIND_TEXT) | (b_code != TEXT_EMPTY))
+            if block.first_row == 1:
+                mask[0] = False
+
+            rows = np.nonzero(mask)[0] + block.first_row
+            prop_values = zip(*(block.values(c, rows) for c in prop_cols)) if prop_cols else itertools.repeat(())
+            candidates.extend(zip(rows.tolist(), block.values(value_col, rows), prop_values))
+        return candidates, last_row, first_cell_value
+
+    def _compute_row_split(self, value_cents, threshold_cents, max_split_cents, split_mode, stats=None, rand=None):
+        """
+        Υπολογίζει τα κομμάτια διάσπασης μιας τιμής σύμφωνα με τη λειτουργία διάσπασης.
+        Όλα τα ποσά είναι σε ακέραια λεπτά. rand: πηγή τυχαίων τιμών (προεπιλογή το module random).
+
+        Returns:
+            tuple: (κωδικός SPLIT_*, λίστα κομματιών σε λεπτά ή None)
+        """
+        epsilon = 1
+        if value_cents < threshold_cents:
+            return SPLIT_NONE, None
+
+        if split_mode == 'integer_5':
+            if value_cents % 500 != 0:
+                return SPLIT_NOT_MULTIPLE_5, None
+            N = max(-(-value_cents // max_split_cents), 2)
+            parts = self._generate_n_splits_integer_multiple_of_5(value_cents, N, max_split_cents)
+            return (SPLIT_INTEGER_5, parts) if parts else (SPLIT_IMPOSSIBLE, None)
+
+        if value_cents < max_split_cents:
+            return SPLIT_BELOW_MAX, None
+
+        if value_cents < 2 * max_split_cents:
+            lower_bound = max(epsilon, value_cents - max_split_cents + epsilon)
+            upper_bound = min(value_cents - epsilon, max_split_cents - epsilon)
+            if lower_bound > upper_bound:
+                return SPLIT_IMPOSSIBLE, None
+            if lower_bound == upper_bound: split1 = lower_bound
+            else:
+                split1 = int((rand or random).uniform(lower_bound, upper_bound) + 0.5)
+                if split1 < lower_bound: split1 = lower_bound
+                if split1 > upper_bound: split1 = upper_bound
+            split2 = value_cents - split1
+            if epsilon <= split1 < max_split_cents and epsilon <= split2 < max_split_cents:
+                return SPLIT_RANDOM_2, [split1, split2]
+            s1_half = (value_cents + 1) // 2
+            s2_half = value_cents - s1_half
+            if epsilon <= s1_half < max_split_cents and epsilon <= s2_half < max_split_cents:
+                return SPLIT_HALF_2, [s1_half, s2_half]
+            return SPLIT_IMPOSSIBLE, None
+
+        N = max(-(-value_cents // max_split_cents), 3)
+        parts = self.generate_n_splits_normalized(value_cents, N, max_split_cents, epsilon, stats=stats, rand=rand)
+        if parts is not None:
+            return SPLIT_RANDOM_N, parts
+        # Ο τυχαίος διαχωρισμός αποτυγχάνει μόνο αν δεν υπάρχει κανένας έγκυρος διαχωρισμός σε N κομμάτια.
+        if stats is not None: stats['impossible_n_way'] = stats.get('impossible_n_way', 0) + 1
+        return SPLIT_IMPOSSIBLE, None
+
+    def _split_cache_key(self, split_mode, max_split_cents, seeding=None):
+        """
+        Το πρόθεμα κλειδιού του SplitCache για τις ρυθμίσεις αυτές, ή None αν οι διασπάσεις δεν
+        εξαρτώνται μόνο από την τιμή (τυχαίες) και άρα δεν αποθηκεύονται. Με seed ανά ποσό
+        (SEED_SCOPE_GLOBAL) και οι τυχαίες διασπάσεις εξαρτώνται μόνο από την τιμή.
+        """
+        if split_mode == 'integer_5':
+            return (split_mode, max_split_cents)
+        if seeding is not None and seeding[0] == SEED_SCOPE_GLOBAL:
+            return (split_mode, max_split_cents, SEED_SCOPE_GLOBAL, seeding[1])
+        return None
+
+    def _split_seeding(self, split_seed, seed_scope, input_path, input_sha256=None):
+        """
+        Οι παράμετροι αναπαραγώγιμης διάσπασης ενός αρχείου: None χωρίς seed, αλλιώς
+        (εμβέλεια, seed, hash περιεχομένου αρχείου ή None για SEED_SCOPE_GLOBAL).
+        input_sha256: το hash του αρχείου, αν έχει ήδη υπολογιστεί (π.χ. για το manifest).
+        """
+        if split_seed is None: return None
+        if seed_scope not in SEED_SCOPES:
+            raise ValueError(f"Άγνωστη εμβέλεια seed: '{seed_scope}'. Διαθέσιμες: {', '.join(SEED_SCOPES)}")
+        if seed_scope == SEED_SCOPE_GLOBAL:
+            return (seed_scope, int(split_seed), None)
+        return (seed_scope, int(split_seed), input_sha256 or FileManager.file_sha256(input_path))
+
+    def _split_random_keys(self, seeding, sheet_name, rows, values_cents):
+        """
+        Κλειδιά τυχαιότητας (βλ. split_plan.row_key) για γραμμές με αριθμούς rows και αξίες
+        values_cents: πίνακας NumPy αν υπάρχει NumPy, αλλιώς λίστα· None χωρίς seed και NumPy.
+        """
+        if seeding is None:
+            return random_keys(len(values_cents)) if np is not None else None
+        scope, seed, file_hash = seeding
+        if scope == SEED_SCOPE_GLOBAL:
+            base, idents = seed_key(seed), values_cents
+        else:
+            base, idents = seed_key(seed, file_hash, sheet_name), rows
+        if np is not None: return row_keys(base, idents)
+        return [row_key(base, ident) for ident in idents]
+
+    def _plan_rows(self, values_cents, keys, threshold_cents, max_split_cents, split_mode, results):
+        """Σχέδιο διάσπασης: με NumPy για όλες τις γραμμές μαζί, αλλιώς γραμμή προς γραμμή."""
+        if np is not None:
+            return plan_splits(values_cents, threshold_cents, max_split_cents, split_mode, keys, stats=results)
+        if keys is None:
+            return SplitPlan.from_rows(self._compute_row_split(v, threshold_cents, max_split_cents, split_mode, stats=results)
+                                       for v in values_cents)
+        return SplitPlan.from_rows(self._compute_row_split(v, threshold_cents, max_split_cents, split_mode, stats=results, rand=SeededRandom(key))
+                                   for v, key in zip(values_cents, keys))
+
+    def _plan_cached_splits(self, values_cents, threshold_cents, max_split_cents, split_mode, cache_key, results, seeding=None, sheet_name=''):
+        """
+        Σχέδιο διάσπασης (SplitPlan) μέσω του SplitCache: κάθε διαφορετική τιμή υπολογίζεται
+        μία φορά (όσες λείπουν από την κρυφή μνήμη, μαζί με NumPy αν υπάρχει) και οι
+        επαναλήψεις της παίρνουν το ίδιο αποτέλεσμα. Ενημερώνει τα split_cache_hits/misses.
+        """
+        cache = self.split_cache
+        entries = {}
+        missing = []
+        for value_cents in values_cents:
+            if value_cents < threshold_cents or value_cents in entries: continue
+            entry = cache.get(cache_key + (value_cents,))
+            if entry is None: missing.append(value_cents)
+            entries[value_cents] = entry
+
+        if missing:
+            # Εδώ το seed (αν υπάρχει) είναι ανά ποσό, άρα τα κλειδιά εξαρτώνται μόνο από τις τιμές.
+            keys = self._split_random_keys(seeding, sheet_name, missing, missing)
+            plan = self._plan_rows(missing, keys, threshold_cents, max_split_cents, split_mode, results)
+            for j, value_cents in enumerate(missing):
+                parts = plan.parts_of(j)
+                entry = (int(plan.methods[j]), tuple(parts) if parts else None)
+                entries[value_cents] = entry
+                cache.put(cache_key + (value_cents,), entry)
+
+        # Ανά γραμμή: miss η πρώτη εμφάνιση μιας τιμής που υπολογίστηκε, hit όλες οι άλλες.
+        candidates = sum(1 for value_cents in values_cents if value_cents >= threshold_cents)
+        results['split_cache_misses'] = results.get('split_cache_misses', 0) + len(missing)
+        results['split_cache_hits'] = results.get('split_cache_hits', 0) + candidates - len(missing)
+        return SplitPlan.from_rows(entries[v] if v >= threshold_cents else (SPLIT_NONE, None) for v in values_cents)
+
+    def _plan_row_splits(self, rows, values, sheet_name, file_basename, threshold_cents, max_split_cents, split_mode, results, seeding=None):
+        """
+        Υπολογίζει μαζικά τα σχέδια διάσπασης (SplitPlan) των υποψήφιων γραμμών rows με αξίες
+        values: με NumPy για όλες τις γραμμές μαζί, αλλιώς γραμμή προς γραμμή. Καταγράφει τις
+        γραμμές που παραμένουν ή δεν μπορούν να διασπαστούν (skipped_details).
+        seeding: βλ. _split_seeding (None: τυχαίες διασπάσεις από το module random).
+
+        Yields:
+            tuple: (θέση στο rows, αξία σε λεπτά, κομμάτια σε λεπτά, περιγραφή μεθόδου)
+                   για κάθε γραμμή που διασπάται, με τη σειρά του rows.
+        """
+        positions = []
+        values_cents = []
+        for i, value in enumerate(values):
+            try:
+                values_cents.append(to_cents(value)); positions.append(i)
+            except Exception as e:
+                results['errors'] += 1
+                if self.logger: self.logger.error(f"Γενικό σφάλμα κατά τη διάσπαση γραμμής {rows[i]}, φύλλο '{sheet_name}': {str(e)}", exc_info=True)
+
+        cache_key = self._split_cache_key(split_mode, max_split_cents, seeding)
+        if cache_key is not None and self.split_cache.maxsize > 0:
+            plan = self._plan_cached_splits(values_cents, threshold_cents, max_split_cents, split_mode, cache_key, results, seeding, sheet_name)
+        else:
+            keys = self._split_random_keys(seeding, sheet_name, [rows[i] for i in positions], values_cents)
+            plan = self._plan_rows(values_cents, keys, threshold_cents, max_split_cents, split_mode, results)
+
+        for j in plan.unsplit_indexes():
+            code = plan.methods[j]
+            row = rows[positions[j]]
+            if code == SPLIT_BELOW_MAX:
+                if self.logger: self.logger.row_event('below_max', lambda: f"Η τιμή {format_cents(values_cents[j])} (Γρ.{row}) >= όριο αλλά < μέγιστο. Παραμένει.")
+            elif code == SPLIT_NOT_MULTIPLE_5 or code == SPLIT_IMPOSSIBLE:
+                if code == SPLIT_NOT_MULTIPLE_5 and self.logger:
+                    self.logger.row_event('not_multiple_5', lambda: f"Η λειτουργία 'Ακέραια Διάσπαση' απαιτεί πολλαπλάσια του 5. Παράλειψη για {format_cents(values_cents[j])} στη Γρ.{row}.", level=logging.WARNING)
+                if 'skipped_details' not in results: results['skipped_details'] = []
+                results['skipped_details'].append({'file': file_basename, 'sheet': sheet_name, 'row': row, 'value': format_cents(values_cents[j])})
+
+        for j in plan.split_indexes():
+            stats_key = SPLIT_METHOD_STATS.get(int(plan.methods[j]))
+            if stats_key: results[stats_key] = results.get(stats_key, 0) + 1
+            yield positions[j], values_cents[j], plan.parts_of(j), plan.method_name(j)
+
+    def _proportional_parts(self, original_value, split_values_cents, value_cents):
+        """
+        Διασπά αναλογικά μια αριθμητική τιμή με βάση τα κομμάτια της κύριας διάσπασης
+        (ROUND_HALF_UP στο λεπτό). Το τελευταίο κομμάτι παίρνει το υπόλοιπο, ώστε το άθροισμα
+        να είναι ακριβές. Επιστρέφει λίστα σε λεπτά ή None αν η τιμή δεν είναι αριθμητική.
+        """
+        if original_value is None or not isinstance(original_value, (int, float)):
+            return None
+        prop_cents = to_cents(original_value)
+        N = len(split_values_cents)
+        if value_cents:
+            parts = [div_round_half_up(prop_cents * s, value_cents) for s in split_values_cents[:-1]]
+        else:
+            parts = [div_round_half_up(prop_cents, N)] * (N - 1)
+        last_part = prop_cents - sum(parts)
+        if last_part < 0 and prop_cents >= 0: last_part = 0
+        parts.append(last_part)
+        return parts
+
+
+    def process_file(self, input_path, output_path, threshold=500, value_col=6, prop_cols=None, overwrite=False, max_split_value=None, split_mode='decimal', auto_numbering=False, invoice_num_col=2, backend=BACKEND_COM, write_mode=WRITE_MODE_INSERT, excel_pool=None, split_seed=None, seed_scope=SEED_SCOPE_ROW,
+                     row_progress_callback=None, should_stop=None, profile_dir=None, input_sha256=None):
+        """
+        Επεξεργασία ενός αρχείου. Με split_seed (ακέραιος) οι τυχαίες διασπάσεις είναι
+        αναπαραγώγιμες: εξαρτώνται από το seed και, ανάλογα με το seed_scope, από το περιεχόμενο
+        του αρχείου, το φύλλο και τη γραμμή (SEED_SCOPE_ROW) ή μόνο από το ποσό (SEED_SCOPE_GLOBAL).
+
+        Το row_progress_callback(info) λαμβάνει την πρόοδο μέσα στο αρχείο (φάση, γραμμές,
+        γραμμές/δευτερόλεπτο, εκτίμηση υπολοιπόμενου χρόνου· βλ. RowProgress) έως 10 φορές το δευτερόλεπτο.
+
+        Το should_stop() ελέγχεται μέσα στους βρόχους σάρωσης και διάσπασης (ανά παρτίδα γραμμών)·
+        αν επιστρέψει True, το αρχείο ακυρώνεται ('cancelled': True στα αποτελέσματα). Το αρχείο
+        εξόδου γράφεται σε προσωρινή διαδρομή και μετονομάζεται μόνο αν αποθηκευτεί επιτυχώς,
+        οπότε ένα αρχείο που ακυρώθηκε ή απέτυχε δεν αφήνει μισή έξοδο.
+
+        Στα αποτελέσματα περιλαμβάνονται οι χρόνοι ανά φάση (timings: {φάση: δευτερόλεπτα}, βλ.
+        modules.progress), οι διασπασμένες γραμμές ανά μέθοδο (random_splits, deterministic_splits)
+        και η μέγιστη μνήμη της διεργασίας ως τώρα (peak_memory_bytes).
+
+        Με profile_dir η επεξεργασία τρέχει με profiler (cProfile): το profile γράφεται σε αυτόν
+        τον φάκελο και τα hotspots στο log (βλ. modules.profiling.FileProfiler).
+
+        input_sha256: το SHA-256 του αρχείου εισόδου αν είναι ήδη γνωστό (η process_multiple_files
+        το περνά από το manifest), ώστε το αρχείο να μην ξαναδιαβάζεται για το seed.
+        """
         if prop_cols is None: prop_cols = [8, 19]
         if max_split_value is None: max_split_value = threshold
 
-        rounding_precision = decimal.Decimal('0.01')
-        epsilon = decimal.Decimal('0.01')
         try:
-             with decimal.localcontext() as ctx:
-                 ctx.prec = 34
-                 max_split_decimal = decimal.Decimal(str(max_split_value)).quantize(rounding_precision)
-                 if max_split_decimal < epsilon:
-                     if self.logger: self.logger.warning(f"max_split_value ({max_split_value}) πολύ μικρό, χρησιμοποιείται {epsilon}.")
-                     max_split_decimal = epsilon
+             max_split_cents = to_cents(max_split_value)
+             if max_split_cents < 1:
+                 if self.logger: self.logger.warning(f"max_split_value ({max_split_value}) πολύ μικρό, χρησιμοποιείται 0.01.")
+                 max_split_cents = 1
         except decimal.InvalidOperation:
              if self.logger: self.logger.error(f"Μη έγκυρη τιμή max_split_value: {max_split_value}. Χρησιμοποιείται threshold ({threshold}).")
-             max_split_decimal = decimal.Decimal(str(threshold)).quantize(rounding_precision)
+             max_split_cents = to_cents(threshold)
 
         file_basename = os.path.basename(input_path)
         output_basename = os.path.basename(output_path)
@@ -162,58 +483,241 @@ class ExcelProcessor:
         results = {
             'processed_rows': 0, 'split_rows': 0, 'errors': 0,
             'skipped_impossible_splits': 0, 'multi_splits_performed': 0,
-            'skipped': False, 'message': ''
+            'sampler_calls': 0, 'sampler_clamped_parts': 0, 'impossible_n_way': 0,
+            'split_cache_hits': 0, 'split_cache_misses': 0,
+            'random_splits': 0, 'deterministic_splits': 0,
+            'split_seed': split_seed, 'seed_scope': seed_scope if split_seed is not None else None,
+            'skipped': False, 'cancelled': False, 'sheets': {}, 'timings': {}, 'peak_memory_bytes': None, 'message': ''
         }
-        excel = None
-        workbook = None
-        original_calculation_mode = None 
 
         try:
-            pythoncom.CoInitialize()
-        except pythoncom.com_error as e:
-             if self.logger: self.logger.warning(f"Pythoncom.CoInitialize com_error: {e} (Maybe ignorable)")
+            seeding = self._split_seeding(split_seed, seed_scope, input_path, input_sha256)
+        except (ValueError, OSError) as e:
+            if self.logger: self.logger.error(f"Αδυναμία ρύθμισης αναπαραγώγιμης διάσπασης για '{file_basename}': {str(e)}")
+            results['errors'] += 1; results['message'] = f"Invalid split seed settings: {str(e)}"
+            return results
+        if seeding is not None and self.logger:
+            self.logger.info(f"Αναπαραγώγιμη διάσπαση: seed={split_seed}, εμβέλεια={seed_scope}")
+
+        progress = RowProgress(row_progress_callback, file_basename, should_stop=should_stop)
+        if profile_dir:
+            from modules.profiling import FileProfiler
+            profiler = FileProfiler(profile_dir, file_basename, self.logger)
+        else:
+            profiler = contextlib.nullcontext()
+        with profiler:
+            if backend == BACKEND_OOXML:
+                self._process_file_ooxml(input_path, output_path, threshold, value_col, prop_cols, max_split_cents, split_mode, results, seeding, progress)
+            elif backend == BACKEND_COM:
+                self._process_file_com(input_path, output_path, threshold, value_col, prop_cols, max_split_cents, split_mode, results, write_mode, excel_pool, seeding, progress)
+            else:
+                if self.logger: self.logger.error(f"Άγνωστη μηχανή επεξεργασίας: '{backend}'. Διαθέσιμες: {', '.join(BACKENDS)}")
+                results['errors'] += 1; results['message'] = f"Unknown backend: {backend}"
+        if profile_dir: results['profile'] = profiler.path
+        progress.finish()
+        results['timings'] = progress.timings
+        results['peak_memory_bytes'] = peak_memory_bytes()
+
+        if self.logger:
+            if results['timings']: self.logger.debug(f"Χρόνοι ανά φάση ({file_basename}): {timings_summary(results['timings'])}")
+            self.logger.flush_row_events(file_basename)
+            self.logger.info(f"--- Ολοκλήρωση επεξεργασίας: {file_basename} (Errors: {results['errors']}) ---")
+        return results
+
+    def _iter_com_rows(self, worksheet, last_row, last_col, window_rows=COM_READ_WINDOW_ROWS):
+        """
+        Διαβάζει τις γραμμές last_row..2 (από κάτω προς τα πάνω) σε παράθυρα των
+        window_rows γραμμών, με μία κλήση Range.Value ανά παράθυρο αντί για μία ανά κελί.
+        Επιστρέφει (row, values) με values tuple των στηλών 1..last_col.
+        Αν αποτύχει η ανάγνωση παραθύρου, γίνεται ανάγνωση ανά γραμμή.
+        """
+        window_end = last_row
+        while window_end >= 2:
+            window_start = max(2, window_end - window_rows + 1)
+            try:
+                data = worksheet.Range(worksheet.Cells(window_start, 1), worksheet.Cells(window_end, last_col)).Value
+                if not isinstance(data, tuple): data = ((data,),)
+            except Exception as window_err:
+                if self.logger: self.logger.warning(f"Σφάλμα ανάγνωσης γραμμών {window_start}-{window_end}, φύλλο '{worksheet.Name}': {window_err}. Ανάγνωση ανά γραμμή...")
+                data = None
+            for row in range(window_end, window_start - 1, -1):
+                if data is not None:
+                    yield row, data[row - window_start]
+                    continue
+                try:
+                    row_data = worksheet.Range(worksheet.Cells(row, 1), worksheet.Cells(row, last_col)).Value
+                    yield row, row_data[0] if isinstance(row_data, tuple) else (row_data,)
+                except Exception as row_err:
+                    if self.logger: self.logger.warning(f"Σφάλμα ανάγνωσης γραμμής {row}, φύλλο '{worksheet.Name}': {row_err}. Παράλειψη.")
+            window_end = window_start - 1
+
+    def _split_block_cells(self, N, original_row_data, value_col, split_values_float, prop_cols, prop_parts, original_prop_values):
+        """
+        Επιστρέφει, για κάθε μία από τις N γραμμές μιας διάσπασης, τα κελιά {στήλη: τιμή}
+        που γράφονται σε αυτή, με την ίδια λογική που ακολουθεί η εγγραφή ανά κελί.
+        """
+        block = []
+        for i in range(N):
+            cells = dict(original_row_data) if i > 0 else {}
+            cells[value_col] = split_values_float[i]
+            for prop_col in prop_cols:
+                original_value = original_prop_values.get(prop_col)
+                if prop_parts.get(prop_col) is not None:
+                    cells[prop_col] = from_cents(prop_parts[prop_col][i])
+                elif original_value is not None and i > 0:
+                    cells[prop_col] = original_value
+            block.append(cells)
+        return block
+
+    def _insert_rows_com(self, excel, worksheet, inserts):
+        """
+        Εισάγει γραμμές κάτω από πολλές γραμμές ενός φύλλου με λίγες κλήσεις EntireRow.Insert,
+        μία ανά ένωση (Application.Union) έως COM_INSERT_MAX_AREAS περιοχών, ώστε το ίδιο το
+        Excel να προσαρμόσει τύπους (και σε άλλα φύλλα), ονόματα, μορφοποίηση υπό όρους και
+        επικυρώσεις όπως στη λειτουργία εισαγωγής.
+
+        inserts: {γραμμή: πλήθος νέων γραμμών κάτω από αυτή}, στις αρχικές θέσεις.
+
+        Το Excel συγχωνεύει γειτονικές ή επικαλυπτόμενες περιοχές μιας ένωσης, οπότε κάθε γύρος
+        εισάγει μόνο γραμμές που απέχουν αρκετά από την προηγούμενη της ίδιας ένωσης· οι υπόλοιπες
+        μένουν για τον επόμενο γύρο, στις θέσεις τους μετά τις εισαγωγές του γύρου.
+
+        Returns:
+            int: Οι κλήσεις EntireRow.Insert.
+        """
+        from modules.excel_pool import XL_SHIFT_DOWN
+        pending = [(row, count) for row, count in sorted(inserts.items()) if count > 0]
+        insert_calls = 0
+        while pending:
+            batch, rest, last_end = [], [], 0
+            for row, count in pending:
+                # Η περιοχή row+1..row+count δεν πρέπει να αγγίζει την προηγούμενη (έως last_end).
+                if row > last_end:
+                    batch.append((row, count)); last_end = row + count
+                else:
+                    rest.append((row, count))
+            # Από κάτω προς τα πάνω, ώστε οι θέσεις των περιοχών πιο πάνω να ισχύουν.
+            for chunk_end in range(len(batch), 0, -COM_INSERT_MAX_AREAS):
+                areas = [worksheet.Range(worksheet.Cells(row + 1, 1), worksheet.Cells(row + count, 1))
+                         for row, count in batch[max(chunk_end - COM_INSERT_MAX_AREAS, 0):chunk_end]]
+                union = areas[0]
+                for i in range(1, len(areas), COM_UNION_MAX_ARGS - 1):
+                    union = excel.Union(union, *areas[i:i + COM_UNION_MAX_ARGS - 1])
+                union.EntireRow.Insert(Shift=XL_SHIFT_DOWN)
+                insert_calls += 1
+            # Οι γραμμές που μένουν μετακινούνται κατά όσες εισήχθησαν πάνω από αυτές.
+            pending, shift, i = [], 0, 0
+            for row, count in rest:
+                while i < len(batch) and batch[i][0] < row:
+                    shift += batch[i][1]; i += 1
+                pending.append((row + shift, count))
+        return insert_calls
+
+    def _rebuild_sheet_com(self, excel, worksheet, blocks):
+        """
+        Γράφει όλες τις διασπάσεις ενός φύλλου με μαζικές εγγραφές, αντί για εγγραφή ανά κελί.
+
+        blocks: {row: [cells γραμμής 0, cells γραμμής 1, ...]} όπως από _split_block_cells.
+        Οι νέες γραμμές όλων των διασπάσεων εισάγονται με _insert_rows_com. Στη συνέχεια γράφονται
+        μόνο οι γραμμές των διασπάσεων: οι νέες γραμμές κάθε διάσπασης με μία ανάθεση Range.Value
+        και, στην αρχική γραμμή, μόνο τα κελιά που αλλάζουν (μία ανάθεση ανά συνεχόμενες στήλες),
+        ώστε οι υπόλοιπες τιμές και οι τύποι του φύλλου να μη γράφονται ξανά.
+        """
+        split_rows = sorted(blocks)
+        insert_calls = self._insert_rows_com(excel, worksheet, {row: len(blocks[row]) - 1 for row in split_rows})
+        if self.logger: self.logger.debug(f"Εισαγωγή γραμμών για {len(split_rows)} διασπάσεις με {insert_calls} κλήσεις EntireRow.Insert.")
+
+        extra = 0
+        for row in split_rows:
+            block = blocks[row]
+            new_row = row + extra
+            columns = sorted(block[0])
+            run_start = 0
+            for i in range(1, len(columns) + 1):
+                if i == len(columns) or columns[i] != columns[i - 1] + 1:
+                    if i - run_start == 1:
+                        worksheet.Cells(new_row, columns[run_start]).Value = block[0][columns[run_start]]
+                    else:
+                        worksheet.Range(worksheet.Cells(new_row, columns[run_start]), worksheet.Cells(new_row, columns[i - 1])).Value = (
+                            tuple(block[0][col] for col in columns[run_start:i]),)
+                    run_start = i
+            if len(block) > 1:
+                width = max(max(cells, default=1) for cells in block[1:])
+                worksheet.Range(worksheet.Cells(new_row + 1, 1), worksheet.Cells(new_row + len(block) - 1, width)).Value = tuple(
+                    tuple(cells.get(col) for col in range(1, width + 1)) for cells in block[1:])
+            extra += len(block) - 1
+
+    def _process_file_com(self, input_path, output_path, threshold, value_col, prop_cols, max_split_cents, split_mode, results, write_mode=WRITE_MODE_INSERT, excel_pool=None, seeding=None, progress=None):
+        """
+        Επεξεργασία αρχείου μέσω Microsoft Excel (COM).
+        Αν δοθεί excel_pool, χρησιμοποιείται συνεδρία Excel από αυτό· αλλιώς ξεκινά
+        και κλείνει ένα Excel μόνο για αυτό το αρχείο.
+        """
+        file_basename = os.path.basename(input_path)
+        output_basename = os.path.basename(output_path)
+        threshold_cents = to_cents(threshold)
+
+        from modules.excel_pool import (ExcelAppPool, load_com, com_error_types,
+                                        XL_CALCULATION_AUTOMATIC, XL_CALCULATION_MANUAL, XL_SHIFT_DOWN)
+        simulated = excel_pool.simulated if excel_pool is not None else self.com_dispatch is not None
+        if not simulated and load_com()[0] is None:
+            if self.logger: self.logger.error("Η μηχανή COM απαιτεί Windows, εγκατεστημένο Microsoft Excel και pywin32. Χρησιμοποιήστε τη μηχανή 'ooxml'.")
+            results['errors'] += 1; results['message'] = "COM backend unavailable (pywin32 not installed)."
+            return results
+
+        com_errors = com_error_types()
+        own_pool = excel_pool is None
+        if own_pool: excel_pool = ExcelAppPool(logger=self.logger, dispatch=self.com_dispatch, max_workbooks=1)
+        session = None
+        com_failed = False
+        excel = None
+        workbook = None
+        original_calculation_mode = None
+        if progress is None: progress = RowProgress(None, file_basename)
+        partial_path = FileManager.get_partial_path(output_path)
+        saved = False
 
         try:
-            excel = win32.gencache.EnsureDispatch('Excel.Application')
-            
-            excel.Visible = False
-            excel.DisplayAlerts = False
-            
+            progress.start_phase(PHASE_OPEN)
+            session = excel_pool.acquire()
+            excel = session.app
 
             try:
                  workbook = excel.Workbooks.Open(os.path.abspath(input_path))
                  if self.logger: self.logger.debug(f"Workbook '{file_basename}' opened successfully.")
-                 
+
                  try:
-                      original_calculation_mode = excel.Calculation 
-                      excel.Calculation = win32.constants.xlCalculationManual
+                      original_calculation_mode = excel.Calculation
+                      excel.Calculation = XL_CALCULATION_MANUAL
                       excel.ScreenUpdating = False
                       excel.EnableEvents = False
                       if self.logger: self.logger.debug("Excel optimization settings applied.")
-                 except pythoncom.com_error as opt_err:
+                 except com_errors as opt_err:
                       if self.logger: self.logger.warning(f"Σφάλμα COM κατά την εφαρμογή ρυθμίσεων βελτιστοποίησης: {opt_err}. Η επεξεργασία συνεχίζεται...")
-                      
-                 except Exception as gen_opt_err: 
+
+                 except Exception as gen_opt_err:
                        if self.logger: self.logger.warning(f"Γενικό σφάλμα κατά την εφαρμογή ρυθμίσεων βελτιστοποίησης: {gen_opt_err}. Η επεξεργασία συνεχίζεται...")
 
 
-            except pythoncom.com_error as open_error:
+            except com_errors as open_error:
                  if self.logger: self.logger.error(f"Σφάλμα COM ανοίγματος workbook '{file_basename}': {open_error}")
                  results['errors'] += 1; results['message'] = f"COM Error opening workbook: {open_error}"
-                 if excel: excel.Quit()
-                 pythoncom.CoUninitialize()
+                 com_failed = True
                  return results
 
-            
-            for worksheet_idx in range(1, workbook.Worksheets.Count + 1):
-                 
-                 
+
+            worksheet_count = workbook.Worksheets.Count
+            for worksheet_idx in range(1, worksheet_count + 1):
+
+
                 worksheet = workbook.Worksheets(worksheet_idx)
                 if self.logger: self.logger.info(f"Επεξεργασία φύλλου: '{worksheet.Name}'")
+                progress.start_sheet(worksheet.Name, worksheet_idx - 1, worksheet_count)
 
-                try: 
+                try:
                     last_row = worksheet.UsedRange.Rows.Count
-                    if last_row <= 1: 
+                    last_col = max(2, value_col, *prop_cols)
+                    if last_row <= 1:
                          cell_val = None
                          try: cell_val = worksheet.Cells(1,1).Value
                          except: pass
@@ -222,301 +726,548 @@ class ExcelProcessor:
                              continue
 
                     rows_to_split = []
-                    sheet_processed_rows = 0
-                    
-                    for row in range(last_row, 1, -1):
-                        sheet_processed_rows += 1
+                    row_values = {}
+                    sheet_processed_rows = max(last_row - 1, 0)
+
+                    progress.start_phase(PHASE_SCAN, sheet_processed_rows)
+                    for row, values in self._iter_com_rows(worksheet, last_row, last_col):
+                        progress.update(last_row - row + 1)
                         try:
-                             cell_a_value = worksheet.Cells(row, 1).Value
-                             if cell_a_value and "σύνολα" in str(cell_a_value).lower(): continue
-                             value = worksheet.Cells(row, value_col).Value
-                             if not (value and isinstance(value, (int, float)) and value >= threshold): continue
-                             cell_b_value = worksheet.Cells(row, 2).Value
-                             if cell_a_value is not None and str(cell_a_value).strip() != "" and \
-                                cell_b_value is not None and str(cell_b_value).strip() != "":
+                             if self._is_split_candidate(values[0], values[value_col - 1], values[1], threshold):
                                  rows_to_split.append(row)
-                        except pythoncom.com_error as cell_read_err:
-                              if self.logger: self.logger.warning(f"Σφάλμα COM ανάγνωσης κελιού γραμμής {row}, φύλλο '{worksheet.Name}': {cell_read_err}. Παράλειψη.")
+                                 row_values[row] = values
                         except Exception as gen_read_err:
                               if self.logger: self.logger.warning(f"Σφάλμα ανάγνωσης δεδομένων γραμμής {row}, φύλλο '{worksheet.Name}': {gen_read_err}. Παράλειψη.")
 
+                except ProcessingCancelled:
+                     raise
                 except Exception as sheet_prep_err:
                      if self.logger: self.logger.error(f"Σφάλμα κατά την προετοιμασία φύλλου '{worksheet.Name}': {sheet_prep_err}")
                      results['errors'] += 1
-                     continue 
+                     continue
+
 
-                
                 sheet_split_count = 0
-                for row in rows_to_split:
-                    try: 
-                        value = worksheet.Cells(row, value_col).Value
-                        if not (value and isinstance(value, (int, float))): continue
-
-                        with decimal.localcontext() as ctx:
-                            ctx.prec = 34
-                            value_decimal = decimal.Decimal(str(value))
-                            N = 1
-                            split_values_decimal = None
-                            split_method_used = "None"
-
-                            
-                            if value_decimal >= threshold:
-                                
-                                if split_mode == 'integer_5':
-                                    
-                                    if value_decimal % 5 != 0:
-                                        if self.logger: self.logger.warning(f"Η λειτουργία 'Ακέραια Διάσπαση' απαιτεί πολλαπλάσια του 5. Παράλειψη για {value_decimal:.2f} στη Γρ.{row}.")
-                                        if 'skipped_details' not in results: results['skipped_details'] = []
-                                        results['skipped_details'].append({'file': file_basename, 'sheet': worksheet.Name, 'row': row, 'value': f"{value_decimal:.2f}"})
-                                        split_values_decimal = None
-                                        N = 1
-                                    else:
-                                        N_calc = int((value_decimal / max_split_decimal).to_integral_value(rounding=decimal.ROUND_CEILING))
-                                        if N_calc < 2: N_calc = 2
-                                        N = N_calc
-                                        split_values_decimal = self._generate_n_splits_integer_multiple_of_5(value_decimal, N, max_split_decimal)
-                                        if split_values_decimal:
-                                            split_method_used = f"Integer x5 ({N}-way)"
-                                        else:
-                                            if 'skipped_details' not in results: results['skipped_details'] = []
-                                            results['skipped_details'].append({'file': file_basename, 'sheet': worksheet.Name, 'row': row, 'value': f"{value_decimal:.2f}"})
-                                            N = 1
-
-                                else:
-                                    if value_decimal < max_split_decimal:
-                                        if self.logger: self.logger.info(f"Η τιμή {value_decimal:.2f} (Γρ.{row}) >= όριο αλλά < μέγιστο. Παραμένει.")
-                                        N = 1; split_values_decimal = None; split_method_used = "None (Below Max)"
-                                    elif value_decimal < 2 * max_split_decimal:
-                                        N = 2
-                                        lower_bound = max(epsilon, value_decimal - max_split_decimal + epsilon)
-                                        upper_bound = min(value_decimal - epsilon, max_split_decimal - epsilon)
-                                        lower_bound = lower_bound.quantize(rounding_precision, rounding=decimal.ROUND_CEILING)
-                                        upper_bound = upper_bound.quantize(rounding_precision, rounding=decimal.ROUND_FLOOR)
-                                        split_possible_2way = False; temp_split_values = None
-                                        if lower_bound <= upper_bound:
-                                            try:
-                                                if lower_bound == upper_bound: split1_decimal = lower_bound
-                                                else:
-                                                    rand_float = random.uniform(float(lower_bound), float(upper_bound))
-                                                    split1_decimal = decimal.Decimal(str(rand_float)).quantize(rounding_precision, rounding=decimal.ROUND_HALF_UP)
-                                                    if split1_decimal < lower_bound: split1_decimal = lower_bound
-                                                    if split1_decimal > upper_bound: split1_decimal = upper_bound
-                                                split2_decimal = (value_decimal - split1_decimal).quantize(rounding_precision, rounding=decimal.ROUND_HALF_UP)
-                                                sum_check_tolerance = epsilon / 10
-                                                if (split1_decimal >= epsilon and split1_decimal < max_split_decimal and
-                                                    split2_decimal >= epsilon and split2_decimal < max_split_decimal and
-                                                    abs(split1_decimal + split2_decimal - value_decimal) < sum_check_tolerance):
-                                                    temp_split_values = [split1_decimal, split2_decimal]; split_possible_2way = True; split_method_used = "Random (2-way)"
-                                                else:
-                                                    s1_half = (value_decimal / 2).quantize(rounding_precision, rounding=decimal.ROUND_HALF_UP)
-                                                    s2_half = value_decimal - s1_half
-                                                    if (s1_half >= epsilon and s1_half < max_split_decimal and
-                                                        s2_half >= epsilon and s2_half < max_split_decimal and
-                                                        abs(s1_half + s2_half - value_decimal) < sum_check_tolerance):
-                                                        temp_split_values = [s1_half, s2_half]; split_possible_2way = True; split_method_used = "Half (2-way)"
-                                            except Exception as e_2way:
-                                                if self.logger: self.logger.error(f"Σφάλμα υπολ. 2-way split για γραμμή {row}: {e_2way}")
-                                        if split_possible_2way: split_values_decimal = temp_split_values
-                                        else:
-                                            if 'skipped_details' not in results: results['skipped_details'] = []
-                                            results['skipped_details'].append({'file': file_basename, 'sheet': worksheet.Name, 'row': row, 'value': f"{value_decimal:.2f}"})
-                                    else: 
-                                        try:
-                                            N_calc = int((value_decimal / max_split_decimal).to_integral_value(rounding=decimal.ROUND_CEILING))
-                                            if N_calc <= 2: N_calc = 3
-                                        except Exception as calc_n_err:
-                                            N_calc = 1; split_values_decimal = None
-                                            if self.logger: self.logger.error(f"Σφάλμα υπολ. N για γραμμή {row}: {calc_n_err}", exc_info=True)
-                                        if N_calc > 1:
-                                            N = N_calc; temp_split_values_n = None
-                                            if self.logger: self.logger.info(f"Τιμή {value_decimal:.2f} (Γρ.{row}) -> N={N} κομμάτια (< {max_split_value:.2f}). Προσπάθεια random...")
-                                            temp_split_values_n = self.generate_n_splits_normalized(value_decimal, N, max_split_decimal, epsilon)
-                                            if temp_split_values_n is None:
-                                                if self.logger: self.logger.warning(f"Random N-way split απέτυχε για Γρ.{row}. Δοκιμή deterministic fallback...")
-                                                temp_split_values_n = self._generate_n_splits_deterministic(value_decimal, N, max_split_decimal, epsilon)
-                                                if temp_split_values_n is not None: split_method_used = "Deterministic Fallback"
-                                                else:
-                                                    if 'skipped_details' not in results: results['skipped_details'] = []
-                                                    results['skipped_details'].append({'file': file_basename, 'sheet': worksheet.Name, 'row': row, 'value': f"{value_decimal:.2f}"})
-                                            else: split_method_used = f"Random ({N}-way)"
-                                            if temp_split_values_n is not None: split_values_decimal = temp_split_values_n
-                                        else: N = 1; split_values_decimal = None; split_method_used = "None (N Calc Error?)"
-                            
-
-                            
-                            if N <= 1 or split_values_decimal is None:
-                                continue 
-
-                            
-                            if self.logger: self.logger.info(f"Διάσπαση γραμμής {row} σε {N} κομμάτια ({split_method_used}): {', '.join(f'{s:.2f}' for s in split_values_decimal)}")
-                            split_values_float = [float(s) for s in split_values_decimal]
-                            ratios = [s / value_decimal if value_decimal else decimal.Decimal(1/N) for s in split_values_decimal]
-
-                            
-                            original_row_data = {}
-                            first_col=1; last_col_to_copy=value_col-1; other_static_cols=[]
-                            columns_to_copy_indices = list(range(first_col, last_col_to_copy + 1)) + other_static_cols
-                            columns_to_copy_indices = [c for c in columns_to_copy_indices if c not in prop_cols and c != value_col]
-                            if self.logger: self.logger.debug(f"Θα αντιγραφούν δεδομένα από στήλες: {columns_to_copy_indices}")
-                            for col_idx in columns_to_copy_indices:
-                                try: original_row_data[col_idx] = worksheet.Cells(row, col_idx).Value
-                                except: original_row_data[col_idx] = None
-                            original_prop_values = {}
-                            for prop_col in prop_cols:
-                                try: original_prop_values[prop_col] = worksheet.Cells(row, prop_col).Value
-                                except: original_prop_values[prop_col] = None
+                pending_blocks = {}
+                # Στη λειτουργία εισαγωγής οι γραμμές γράφονται μέσα στον ίδιο βρόχο με τη διάσπαση.
+                progress.start_phase(PHASE_SPLIT if write_mode == WRITE_MODE_REBUILD else PHASE_WRITE, len(rows_to_split))
+                row_splits = self._plan_row_splits(rows_to_split, [row_values[row][value_col - 1] for row in rows_to_split],
+                                                   worksheet.Name, file_basename, threshold_cents, max_split_cents, split_mode, results, seeding)
+                for i, value_cents, split_values_cents, split_method_used in row_splits:
+                    row = rows_to_split[i]
+                    progress.update(i + 1)
+                    try:
+                        values = row_values[row]
+                        N = len(split_values_cents)
+
+                        if self.logger: self.logger.row_event('split_row', lambda: f"Διάσπαση γραμμής {row} σε {N} κομμάτια ({split_method_used}): {', '.join(format_cents(c) for c in split_values_cents)}")
+                        split_values_float = [from_cents(c) for c in split_values_cents]
+
+
+                        original_row_data = {}
+                        first_col=1; last_col_to_copy=value_col-1; other_static_cols=[]
+                        columns_to_copy_indices = list(range(first_col, last_col_to_copy + 1)) + other_static_cols
+                        columns_to_copy_indices = [c for c in columns_to_copy_indices if c not in prop_cols and c != value_col]
+                        if self.logger: self.logger.debug("Θα αντιγραφούν δεδομένα από στήλες: %s", columns_to_copy_indices)
+                        for col_idx in columns_to_copy_indices:
+                            original_row_data[col_idx] = values[col_idx - 1]
+                        original_prop_values = {}
+                        prop_parts = {}
+                        for prop_col in prop_cols:
+                            original_prop_values[prop_col] = values[prop_col - 1]
+                            try: prop_parts[prop_col] = self._proportional_parts(original_prop_values[prop_col], split_values_cents, value_cents)
+                            except Exception as prop_calc_e:
+                                 prop_parts[prop_col] = None; original_prop_values[prop_col] = None
+                                 if self.logger: self.logger.warning(f"Σφάλμα υπολ. αναλ. στήλης {prop_col} γραμμής {row}: {prop_calc_e}")
 
+                        if write_mode == WRITE_MODE_REBUILD:
+                            pending_blocks[row] = self._split_block_cells(N, original_row_data, value_col, split_values_float, prop_cols, prop_parts, original_prop_values)
+                        else:
                             if N > 1:
                                  try:
                                       start_cell = worksheet.Cells(row + 1, 1); end_cell = worksheet.Cells(row + N - 1, 1)
-                                      if self.logger: self.logger.debug(f"Προσπάθεια εισαγωγής {N-1} γραμμών από {row + 1}...")
-                                      worksheet.Range(start_cell, end_cell).EntireRow.Insert(Shift=win32.constants.xlShiftDown)
-                                      if self.logger: self.logger.debug(f"Επιτυχής εισαγωγή {N-1} γραμμών. Παύση...")
-                                      time.sleep(0.2) 
+                                      if self.logger: self.logger.debug("Προσπάθεια εισαγωγής %d γραμμών από %d...", N - 1, row + 1)
+                                      worksheet.Range(start_cell, end_cell).EntireRow.Insert(Shift=XL_SHIFT_DOWN)
+                                      if self.logger: self.logger.debug("Επιτυχής εισαγωγή %d γραμμών. Παύση...", N - 1)
+                                      time.sleep(0.2)
                                  except Exception as insert_err:
                                       if self.logger: self.logger.error(f"Σφάλμα εισαγωγής {N-1} γραμμών στη γραμμή {row+1}: {insert_err}")
                                       results['errors'] += 1; continue
 
-                            prop_sums_calculated = {pc: decimal.Decimal(0) for pc in prop_cols}
                             for i in range(N):
                                 current_row_index = row + i
-                                if i > 0: 
+                                if i > 0:
                                      for col_idx, value_to_copy in original_row_data.items():
                                          try: worksheet.Cells(current_row_index, col_idx).Value = value_to_copy
                                          except Exception as write_err:
                                               if self.logger: self.logger.warning(f"Σφάλμα εγγραφής αντιγραφής στο ({current_row_index},{col_idx}): {write_err}")
-                                
+
                                 try:
                                      worksheet.Cells(current_row_index, value_col).Value = split_values_float[i]
                                 except Exception as write_err:
-                                    
+
                                     results['errors'] += 1
                                     if self.logger:
                                         self.logger.error(f"Σφάλμα εγγραφής βασικής τιμής στο ({current_row_index},{value_col}): {write_err}")
-                                
+
                                 for prop_col in prop_cols:
                                     original_value = original_prop_values.get(prop_col)
-                                    if original_value is not None and isinstance(original_value, (int, float)):
-                                        prop_decimal = decimal.Decimal(str(original_value))
+                                    if prop_parts.get(prop_col) is not None:
                                         try:
-                                            if i < N - 1: prop_i_decimal = (prop_decimal * ratios[i]).quantize(rounding_precision, rounding=decimal.ROUND_HALF_UP)
-                                            else:
-                                                prop_i_decimal = prop_decimal - prop_sums_calculated[prop_col]
-                                                if prop_i_decimal < 0 and prop_decimal >= 0: prop_i_decimal = decimal.Decimal(0)
-                                            worksheet.Cells(current_row_index, prop_col).Value = float(prop_i_decimal)
-                                            prop_sums_calculated[prop_col] += prop_i_decimal
+                                            worksheet.Cells(current_row_index, prop_col).Value = from_cents(prop_parts[prop_col][i])
                                         except Exception as prop_calc_e:
                                              if self.logger: self.logger.warning(f"Σφάλμα υπολ./εγγραφής αναλ. στήλης {prop_col} γραμμής {current_row_index}: {prop_calc_e}")
                                     elif original_value is not None and i > 0:
                                            try: worksheet.Cells(current_row_index, prop_col).Value = original_value
                                            except: pass
 
-                            
-                            sheet_split_count += 1
-                            results['split_rows'] += 1
-                            if N > 2: results['multi_splits_performed'] = results.get('multi_splits_performed', 0) + 1
-                        
-                    except pythoncom.com_error as split_com_err:
+                        sheet_split_count += 1
+                        results['split_rows'] += 1
+                        if N > 2: results['multi_splits_performed'] = results.get('multi_splits_performed', 0) + 1
+
+                    except com_errors as split_com_err:
                          results['errors'] += 1
                          if self.logger: self.logger.error(f"Σφάλμα COM κατά τη διάσπαση γραμμής {row}, φύλλο '{worksheet.Name}': {split_com_err}")
                     except Exception as e:
                          results['errors'] += 1
                          if self.logger: self.logger.error(f"Γενικό σφάλμα κατά τη διάσπαση γραμμής {row}, φύλλο '{worksheet.Name}': {str(e)}", exc_info=True)
-                
+
+
+                if pending_blocks:
+                    progress.start_phase(PHASE_WRITE)
+                    try:
+                        if self.logger: self.logger.debug(f"Ενιαία ανακατασκευή φύλλου '{worksheet.Name}' για {len(pending_blocks)} διασπάσεις...")
+                        self._rebuild_sheet_com(excel, worksheet, pending_blocks)
+                    except Exception as rebuild_err:
+                        results['errors'] += 1
+                        if self.logger: self.logger.error(f"Σφάλμα ανακατασκευής φύλλου '{worksheet.Name}': {rebuild_err}", exc_info=True)
 
                 if self.logger: self.logger.info(f"Ολοκληρώθηκε το φύλλο '{worksheet.Name}'. Διασπάστηκαν {sheet_split_count} γραμμές.")
                 results['processed_rows'] += sheet_processed_rows
-            
-            
+                results['sheets'][worksheet.Name] = sheet_split_count
+
+
             try:
 
                 try:
                     excel.ScreenUpdating = True
                     excel.EnableEvents = True
-                    
+
                     if original_calculation_mode is not None:
                         excel.Calculation = original_calculation_mode
-                    else: 
-                        excel.Calculation = win32.constants.xlCalculationAutomatic
+                    else:
+                        excel.Calculation = XL_CALCULATION_AUTOMATIC
                     if self.logger: self.logger.debug("Excel optimization settings restored before save.")
                 except Exception as restore_err:
                      if self.logger: self.logger.warning(f"Σφάλμα επαναφοράς ρυθμίσεων Excel πριν την αποθήκευση: {restore_err}")
 
-                workbook.SaveAs(os.path.abspath(output_path))
-                if self.logger: self.logger.info(f"Το επεξεργασμένο αρχείο αποθηκεύτηκε ως: {output_basename}")
-                results['message'] = f"Successfully processed and saved to {output_basename}"
-            except pythoncom.com_error as save_error:
+                progress.start_phase(PHASE_SAVE)
+                if os.path.exists(partial_path): os.remove(partial_path)
+                workbook.SaveAs(os.path.abspath(partial_path))
+                saved = True
+            except com_errors as save_error:
                  if self.logger: self.logger.error(f"Σφάλμα COM κατά την αποθήκευση '{output_basename}': {save_error}")
                  results['errors'] += 1; results['message'] = f"COM Error saving file: {save_error}"
 
             workbook.Close(SaveChanges=False)
             workbook = None
 
-        except pythoncom.com_error as main_com_error:
+            # Το αρχείο εξόδου εμφανίζεται μόνο ολοκληρωμένο (και μετά το κλείσιμο του προσωρινού).
+            if saved:
+                os.replace(partial_path, output_path)
+                if self.logger: self.logger.info(f"Το επεξεργασμένο αρχείο αποθηκεύτηκε ως: {output_basename}")
+                results['message'] = f"Successfully processed and saved to {output_basename}"
+
+        except ProcessingCancelled:
+            results['cancelled'] = True; results['message'] = "Cancelled by the user; no output was written."
+            if self.logger: self.logger.warning(f"Η επεξεργασία του '{file_basename}' ακυρώθηκε. Δεν γράφτηκε αρχείο εξόδου.")
+        except com_errors as main_com_error:
+            com_failed = True
             results['errors'] += 1; results['message'] = f"Main processing COM Error: {main_com_error}"
             if self.logger: self.logger.error(f"Κύριο σφάλμα COM επεξεργασίας '{file_basename}': {main_com_error}")
         except Exception as general_error:
             results['errors'] += 1; results['message'] = f"General processing error: {general_error}"
             if self.logger: self.logger.error(f"Γενικό σφάλμα επεξεργασίας '{file_basename}': {str(general_error)}", exc_info=True)
         finally:
-            
+
             if workbook is not None:
                 try: workbook.Close(SaveChanges=False)
                 except: pass
             if excel is not None:
                 try:
-                     
+
                      excel.ScreenUpdating = True; excel.EnableEvents = True
                      if original_calculation_mode is not None:
                           excel.Calculation = original_calculation_mode
                      else:
-                          excel.Calculation = win32.constants.xlCalculationAutomatic
-                     excel.DisplayAlerts = True; excel.Quit()
+                          excel.Calculation = XL_CALCULATION_AUTOMATIC
                 except: pass
-            pythoncom.CoUninitialize()
-            if self.logger: self.logger.info(f"--- Ολοκλήρωση επεξεργασίας: {file_basename} (Errors: {results['errors']}) ---")
+            excel_pool.release(session, com_error=com_failed)
+            if own_pool: excel_pool.shutdown()
+            try:
+                if os.path.exists(partial_path): os.remove(partial_path)
+            except OSError:
+                pass
 
         return results
 
-    
-    def process_multiple_files(self, input_files, output_dir, threshold=500, value_col=6, prop_cols=None, overwrite=False, max_split_value=None):
+    def _process_file_ooxml(self, input_path, output_path, threshold, value_col, prop_cols, max_split_cents, split_mode, results, seeding=None, progress=None):
+        """
+        Επεξεργασία αρχείου .xlsx/.xlsm απευθείας από το XML του, χωρίς Excel/COM.
+        Οι κανόνες επιλογής και διάσπασης γραμμών είναι ίδιοι με της μηχανής COM.
+        """
+        file_basename = os.path.basename(input_path)
+        output_basename = os.path.basename(output_path)
+        threshold_cents = to_cents(threshold)
+
+        from modules.ooxml_backend import OoxmlWorkbook, RowSplit, OOXML_EXTENSIONS, ColumnScanUnsupported
+        if os.path.splitext(input_path)[1].lower() not in OOXML_EXTENSIONS:
+            if self.logger: self.logger.error(f"Η μηχανή 'ooxml' υποστηρίζει μόνο αρχεία {', '.join(OOXML_EXTENSIONS)}. Παράλειψη '{file_basename}'.")
+            results['errors'] += 1; results['message'] = f"Unsupported file type for the OOXML backend: {file_basename}"
+            return results
+
+        columns_to_copy_indices = [c for c in range(1, value_col) if c not in prop_cols and c != value_col]
+        # Τα σχέδια διάσπασης μένουν στη μνήμη μέχρι την αποθήκευση· οι (λίγοι) διαφορετικοί
+        # συνδυασμοί στηλών μοιράζονται μεταξύ γραμμών.
+        split_layouts = {}
+        if progress is None: progress = RowProgress(None, file_basename)
+        partial_path = FileManager.get_partial_path(output_path)
+        # Η μηχανή OOXML ξαναγράφει όλες τις γραμμές κατά την αποθήκευση.
+        progress.save_share = OOXML_SAVE_PROGRESS_SHARE
+
+        try:
+            progress.start_phase(PHASE_OPEN)
+            with OoxmlWorkbook(input_path) as workbook:
+                if self.logger: self.logger.debug(f"Workbook '{file_basename}' opened successfully (OOXML).")
+                plans = {}
+                sheet_rows = {}
+                for sheet_index, sheet in enumerate(workbook.sheets):
+                    if self.logger: self.logger.info(f"Επεξεργασία φύλλου: '{sheet.name}'")
+                    progress.start_sheet(sheet.name, sheet_index, len(workbook.sheets))
+                    # Το πλήθος των γραμμών του φύλλου είναι γνωστό μόνο μετά τη σάρωση.
+                    progress.start_phase(PHASE_SCAN)
+
+                    try:
+                        try:
+                            candidates, last_row, first_cell_value = self._scan_sheet_columns(workbook, sheet, threshold, value_col, prop_cols, progress)
+                        except ColumnScanUnsupported as scan_err:
+                            if self.logger: self.logger.debug(f"Έλεγχος ανά γραμμή για το φύλλο '{sheet.name}': {scan_err}")
+                            candidates, last_row, first_cell_value = self._scan_sheet_rows(workbook, sheet, threshold, value_col, prop_cols, progress)
+                    except ProcessingCancelled:
+                        raise
+                    except Exception as sheet_prep_err:
+                        if self.logger: self.logger.error(f"Σφάλμα κατά την προετοιμασία φύλλου '{sheet.name}': {sheet_prep_err}")
+                        results['errors'] += 1
+                        continue
+
+                    if last_row <= 1 and (first_cell_value is None or str(first_cell_value).strip() == ""):
+                        if self.logger: self.logger.info(f"Παράλειψη (πιθανώς) κενού φύλλου: '{sheet.name}'")
+                        continue
+                    sheet_processed_rows = max(last_row - 1, 0)
+                    sheet_rows[sheet.name] = last_row
+
+                    plan = {}
+                    sheet_split_count = 0
+                    candidates.sort(reverse=True)
+                    progress.start_phase(PHASE_SPLIT, len(candidates))
+                    row_splits = self._plan_row_splits([c[0] for c in candidates], [c[1] for c in candidates],
+                                                       sheet.name, file_basename, threshold_cents, max_split_cents, split_mode, results, seeding)
+                    for i, value_cents, split_values_cents, split_method_used in row_splits:
+                        row, _, prop_values = candidates[i]
+                        progress.update(i + 1)
+                        try:
+                            N = len(split_values_cents)
+                            if self.logger: self.logger.row_event('split_row', lambda: f"Διάσπαση γραμμής {row} σε {N} κομμάτια ({split_method_used}): {', '.join(format_cents(c) for c in split_values_cents)}")
+
+                            columns = [value_col]
+                            column_parts = [split_values_cents]
+                            copied_props = []
+                            for prop_col, original_value in zip(prop_cols, prop_values):
+                                try:
+                                    prop_parts = self._proportional_parts(original_value, split_values_cents, value_cents)
+                                except Exception as prop_calc_e:
+                                    if self.logger: self.logger.warning(f"Σφάλμα υπολ. αναλ. στήλης {prop_col} γραμμής {row}: {prop_calc_e}")
+                                    continue
+                                if prop_parts is not None:
+                                    columns.append(prop_col); column_parts.append(prop_parts)
+                                elif original_value is not None:
+                                    copied_props.append(prop_col)
+                            layout_key = (tuple(columns), tuple(copied_props))
+                            layout = split_layouts.get(layout_key)
+                            if layout is None:
+                                layout = split_layouts[layout_key] = (tuple(columns), frozenset(columns_to_copy_indices).union(copied_props))
+                            values = [from_cents(column_values[k]) for k in range(N) for column_values in column_parts]
+                            plan[row] = RowSplit(layout[0], values, layout[1])
+
+                            sheet_split_count += 1
+                            results['split_rows'] += 1
+                            if N > 2: results['multi_splits_performed'] = results.get('multi_splits_performed', 0) + 1
+                        except Exception as e:
+                            results['errors'] += 1
+                            if self.logger: self.logger.error(f"Γενικό σφάλμα κατά τη διάσπαση γραμμής {row}, φύλλο '{sheet.name}': {str(e)}", exc_info=True)
+
+                    if plan: plans[sheet.name] = plan
+                    if self.logger: self.logger.info(f"Ολοκληρώθηκε το φύλλο '{sheet.name}'. Διασπάστηκαν {sheet_split_count} γραμμές.")
+                    results['processed_rows'] += sheet_processed_rows
+                    results['sheets'][sheet.name] = sheet_split_count
+
+                try:
+                    progress.start_phase(PHASE_SAVE, sum(sheet_rows.values()))
+                    saved_rows = dict.fromkeys(sheet_rows, 0)
+                    def save_progress(sheet_name, row):
+                        saved_rows[sheet_name] = row
+                        progress.update(sum(saved_rows.values()))
+                    workbook.save_as(os.path.abspath(partial_path), plans, save_progress)
+                    os.replace(partial_path, output_path)
+                    if self.logger: self.logger.info(f"Το επεξεργασμένο αρχείο αποθηκεύτηκε ως: {output_basename}")
+                    results['message'] = f"Successfully processed and saved to {output_basename}"
+                except ProcessingCancelled:
+                    raise
+                except Exception as save_error:
+                    if self.logger: self.logger.error(f"Σφάλμα κατά την αποθήκευση '{output_basename}': {save_error}", exc_info=True)
+                    results['errors'] += 1; results['message'] = f"Error saving file: {save_error}"
+
+        except ProcessingCancelled:
+            results['cancelled'] = True; results['message'] = "Cancelled by the user; no output was written."
+            if self.logger: self.logger.warning(f"Η επεξεργασία του '{file_basename}' ακυρώθηκε. Δεν γράφτηκε αρχείο εξόδου.")
+        except Exception as general_error:
+            results['errors'] += 1; results['message'] = f"General processing error: {general_error}"
+            if self.logger: self.logger.error(f"Γενικό σφάλμα επεξεργασίας '{file_basename}': {str(general_error)}", exc_info=True)
+        finally:
+            try:
+                if os.path.exists(partial_path): os.remove(partial_path)
+            except OSError:
+                pass
+
+        return results
+
+
+    @staticmethod
+    def merge_file_results(overall_results, file_name, results):
+        """Προσθέτει τα αποτελέσματα ενός αρχείου στα συνολικά αποτελέσματα μιας μαζικής επεξεργασίας."""
+        if results.get('cache_hit'): overall_results['cache_hits'] = overall_results.get('cache_hits', 0) + 1
+        elif results.get('skipped'): overall_results['skipped_files'] += 1
+        elif results.get('cancelled'): overall_results['cancelled_files'] = overall_results.get('cancelled_files', 0) + 1
+        else:
+            
+            if results.get('errors', 0) == 0:
+                 overall_results['processed_files'] += 1
+            overall_results['total_rows_processed'] += results.get('processed_rows', 0)
+            overall_results['total_rows_split'] += results.get('split_rows', 0)
+            overall_results['skipped_impossible_splits'] += results.get('skipped_impossible_splits', 0)
+            overall_results['multi_splits_performed'] += results.get('multi_splits_performed', 0)
+            for key in SPLIT_STATS_KEYS:
+                overall_results[key] = overall_results.get(key, 0) + results.get(key, 0)
+            merge_timings(overall_results.setdefault('timings', {}), results.get('timings'))
+            # Με παράλληλες διεργασίες: η μέγιστη από τις μέγιστες μνήμες των διεργασιών.
+            if results.get('peak_memory_bytes') is not None:
+                overall_results['peak_memory_bytes'] = max(overall_results.get('peak_memory_bytes') or 0, results['peak_memory_bytes'])
+        overall_results['errors'] += results.get('errors', 0)
+        overall_results['file_results'][file_name] = results
+
+    def process_multiple_files(self, input_files, output_dir, threshold=500, value_col=6, prop_cols=None, overwrite=False, max_split_value=None, split_mode='decimal', backend=BACKEND_COM, write_mode=WRITE_MODE_INSERT,
+                               auto_numbering=False, invoice_num_col=2, workers=1, progress_callback=None, file_callback=None, should_stop=None,
+                               split_seed=None, seed_scope=SEED_SCOPE_ROW, incremental=False, row_progress_callback=None, resume=False,
+                               profile_dir=None):
         """
         Επεξεργασία πολλαπλών αρχείων Excel καλώντας την process_file για το καθένα.
+
+        Με workers > 1 τα αρχεία μοιράζονται σε ισάριθμες διεργασίες, η καθεμία με
+        δικό της ExcelProcessor (και δικό της Excel για τη μηχανή COM).
+        progress_callback(done, total) καλείται μετά από κάθε αρχείο, file_callback(file_name)
+        όταν ξεκινά ένα αρχείο και should_stop() ελέγχεται για διακοπή πριν από κάθε νέο αρχείο και
+        μέσα στο αρχείο που επεξεργάζεται (βλ. process_file)· τα αρχεία που διακόπηκαν μετρώνται στα cancelled_files.
+        Το row_progress_callback(info) λαμβάνει την πρόοδο μέσα σε κάθε αρχείο (βλ. process_file).
+        Με split_seed οι διασπάσεις είναι αναπαραγώγιμες (βλ. process_file), ανεξάρτητα από το
+        πλήθος των διεργασιών και τη σειρά επεξεργασίας.
+
+        Με incremental=True χρησιμοποιείται το manifest του φακέλου εξόδου (βλ. BatchManifest):
+        αρχεία των οποίων η είσοδος και οι ρυθμίσεις δεν άλλαξαν από την τελευταία επιτυχή
+        επεξεργασία παραλείπονται (cache_hits), ενώ όσα άλλαξαν ξαναγράφονται.
+
+        Η πορεία της μαζικής επεξεργασίας καταγράφεται στο journal του φακέλου εξόδου (βλ.
+        BatchJournal). Με resume=True το journal συνεχίζεται: τα αρχεία που ολοκληρώθηκαν σε
+        προηγούμενη εκτέλεση δεν ξαναγίνονται και τα αποτελέσματά τους μπαίνουν στη σύνοψη
+        από το journal (βλ. resume_batch).
+
+        Με profile_dir κάθε αρχείο επεξεργάζεται με profiler και το profile του γράφεται σε
+        αυτόν τον φάκελο (βλ. process_file)· η ρύθμιση δεν καταγράφεται στο journal.
         """
         if self.logger: self.logger.info(f"Ξεκινά η μαζική επεξεργασία {len(input_files)} αρχείων...")
+        batch_started = time.monotonic()
         overall_results = {
             'total_files': len(input_files), 'processed_files': 0, 'skipped_files': 0,
             'total_rows_processed': 0, 'total_rows_split': 0,
             'skipped_impossible_splits': 0, 'multi_splits_performed': 0,
-            'errors': 0, 'file_results': {}
+            'sampler_calls': 0, 'sampler_clamped_parts': 0, 'impossible_n_way': 0,
+            'split_cache_hits': 0, 'split_cache_misses': 0,
+            'random_splits': 0, 'deterministic_splits': 0,
+            'split_seed': split_seed, 'seed_scope': seed_scope if split_seed is not None else None,
+            'cache_hits': 0, 'cancelled_files': 0, 'errors': 0,
+            'timings': {}, 'peak_memory_bytes': None, 'elapsed_seconds': 0.0, 'file_results': {}
+        }
+        file_kwargs = {
+            'threshold': threshold, 'value_col': value_col, 'prop_cols': prop_cols,
+            'overwrite': overwrite, 'max_split_value': max_split_value, 'split_mode': split_mode,
+            'auto_numbering': auto_numbering, 'invoice_num_col': invoice_num_col,
+            'backend': backend, 'write_mode': write_mode,
+            'split_seed': split_seed, 'seed_scope': seed_scope,
         }
+        manifest = None
+        if incremental:
+            manifest = BatchManifest(output_dir, logger=self.logger).load()
+            settings_hash = settings_sha256(threshold, max_split_value, value_col, prop_cols, split_mode,
+                                            auto_numbering, invoice_num_col, split_seed, seed_scope)
+        input_hashes = {}  # file_name -> (input_file, output_path, hash εισόδου) για την ενημέρωση του manifest
+        journal = BatchJournal(output_dir, logger=self.logger)
+        try:
+            if resume:
+                journal.load().resume()
+            else:
+                journal.start(input_files, dict(file_kwargs, incremental=incremental))
+        except OSError as e:
+            if self.logger: self.logger.warning(f"Αδυναμία εγγραφής journal '{journal.path}': {str(e)}. Η επεξεργασία δεν θα μπορεί να συνεχιστεί μετά από διακοπή.")
+        if profile_dir: file_kwargs['profile_dir'] = profile_dir
+
+        # Κάθε εργασία: (αρχείο εισόδου, αρχείο εξόδου, ρυθμίσεις που αλλάζουν μόνο για αυτό το αρχείο).
+        jobs = []
         for input_file in input_files:
             file_name = os.path.basename(input_file)
+            file_name_base, file_ext = os.path.splitext(file_name)
+            output_path = os.path.join(output_dir, f"{file_name_base}_διασπασμένο{file_ext}")
+            if file_name in journal.finished:
+                if self.logger: self.logger.info(f"Ολοκληρώθηκε σε προηγούμενη εκτέλεση: {file_name} (αποτελέσματα από το journal).")
+                self.merge_file_results(overall_results, file_name, journal.finished[file_name])
+                continue
+            job_kwargs = {}
+            if manifest is not None:
+                try:
+                    input_hash = manifest.input_hash(input_file, output_path)
+                    if manifest.is_current(output_path, input_hash, settings_hash):
+                        if self.logger: self.logger.info(f"Αμετάβλητο από την προηγούμενη εκτέλεση: {file_name} (παράλειψη).")
+                        self.merge_file_results(overall_results, file_name, {
+                            'processed_rows': 0, 'split_rows': 0, 'errors': 0, 'skipped': True, 'cache_hit': True,
+                            'message': f"Unchanged since the last run: '{os.path.basename(output_path)}'."})
+                        continue
+                    input_hashes[file_name] = (input_file, output_path, input_hash)
+                    # Το ίδιο hash χρησιμεύει και για το seed ανά γραμμή (SEED_SCOPE_ROW).
+                    if split_seed is not None and seed_scope == SEED_SCOPE_ROW: job_kwargs['input_sha256'] = input_hash[0]
+                    # Ένα παλιό αρχείο εξόδου του manifest ξαναγράφεται ακόμα και χωρίς overwrite.
+                    if manifest.is_known_output(output_path): job_kwargs['overwrite'] = True
+                except OSError as e:
+                    if self.logger: self.logger.warning(f"Αδυναμία ελέγχου manifest για '{file_name}': {str(e)}")
+            jobs.append((input_file, output_path, job_kwargs))
+
+        def merge_results(overall_results, file_name, results):
+            self.merge_file_results(overall_results, file_name, results)
             try:
-                file_name_base, file_ext = os.path.splitext(file_name)
-                output_name = f"{file_name_base}_διασπασμένο{file_ext}"
-                output_path = os.path.join(output_dir, output_name)
-                results = self.process_file(
-                    input_file, output_path, threshold, value_col, prop_cols,
-                    overwrite, max_split_value
-                )
-                if results.get('skipped'): overall_results['skipped_files'] += 1
-                else:
-                    
-                    if results.get('errors', 0) == 0:
-                         overall_results['processed_files'] += 1
-                    overall_results['total_rows_processed'] += results.get('processed_rows', 0)
-                    overall_results['total_rows_split'] += results.get('split_rows', 0)
-                    overall_results['skipped_impossible_splits'] += results.get('skipped_impossible_splits', 0)
-                    overall_results['multi_splits_performed'] += results.get('multi_splits_performed', 0)
-                overall_results['errors'] += results.get('errors', 0)
-                overall_results['file_results'][file_name] = results
-            except Exception as e:
-                overall_results['errors'] += 1
-                error_msg = f"Κρίσιμο σφάλμα διαχείρισης {file_name}: {str(e)}"
-                if self.logger: self.logger.error(error_msg, exc_info=True)
-                overall_results['file_results'][file_name] = {'error': True, 'message': error_msg, 'skipped': False}
+                journal.record_file(file_name, results)
+            except OSError as e:
+                if self.logger: self.logger.warning(f"Αδυναμία καταγραφής στο journal για '{file_name}': {str(e)}")
+            if file_name in input_hashes and not results.get('skipped') and not results.get('cancelled') and results.get('errors', 0) == 0:
+                input_file, output_path, input_hash = input_hashes[file_name]
+                try:
+                    manifest.record(input_file, output_path, input_hash, settings_hash)
+                except OSError as e:
+                    if self.logger: self.logger.warning(f"Αδυναμία καταγραφής στο manifest για '{file_name}': {str(e)}")
+
+        def file_started(file_name):
+            try:
+                journal.record_started(file_name)
+            except OSError as e:
+                if self.logger: self.logger.warning(f"Αδυναμία καταγραφής στο journal για '{file_name}': {str(e)}")
+            if file_callback: file_callback(file_name)
+
+        workers = max(1, min(int(workers or 1), len(jobs)))
+        batch_done = False
+        try:
+            if workers > 1:
+                from modules.parallel_runner import run_parallel
+                run_parallel(jobs, file_kwargs, workers, overall_results, merge_results, logger=self.logger, com_dispatch=self.com_dispatch,
+                             progress_callback=progress_callback, file_callback=file_started, should_stop=should_stop,
+                             row_progress_callback=row_progress_callback)
+            elif jobs:
+                self._run_serial(jobs, file_kwargs, overall_results, merge_results, backend,
+                                 progress_callback=progress_callback, file_callback=file_started, should_stop=should_stop,
+                                 row_progress_callback=row_progress_callback)
+            batch_done = not (should_stop and should_stop())
+        finally:
+            if manifest is not None:
+                try:
+                    manifest.save()
+                except OSError as e:
+                    if self.logger: self.logger.error(f"Αδυναμία αποθήκευσης manifest '{manifest.path}': {str(e)}")
+            try:
+                if batch_done: journal.finish()
+                else: journal.close()
+            except OSError as e:
+                if self.logger: self.logger.warning(f"Αδυναμία ολοκλήρωσης journal '{journal.path}': {str(e)}")
+        if progress_callback and workers <= 1: progress_callback(len(jobs), len(jobs))
+
+        # Τα αποτελέσματα ανά αρχείο με τη σειρά των αρχείων εισόδου (οι παράλληλες διεργασίες
+        # και οι παραλείψεις του manifest τα προσθέτουν με άλλη σειρά).
+        file_results = overall_results['file_results']
+        ordered = {}
+        for input_file in input_files:
+            file_name = os.path.basename(input_file)
+            if file_name in file_results: ordered[file_name] = file_results[file_name]
+        file_results.clear(); file_results.update(ordered)
+        overall_results['elapsed_seconds'] = time.monotonic() - batch_started
         if self.logger:
             self.logger.info(f"Ολοκληρώθηκε η μαζική επεξεργασία.")
-            self.logger.info(f"Σύνοψη: Επεξεργάστηκαν={overall_results['processed_files']}, Παραλείφθηκαν={overall_results['skipped_files']}, Σφάλματα={overall_results['errors']}, Διασπάσεις={overall_results['total_rows_split']}")
-        return overall_results
\ No newline at end of file
+            self.logger.info(f"Σύνοψη: Επεξεργάστηκαν={overall_results['processed_files']}, Παραλείφθηκαν={overall_results['skipped_files']}, Αμετάβλητα={overall_results['cache_hits']}, Ακυρώθηκαν={overall_results['cancelled_files']}, Σφάλματα={overall_results['errors']}, Διασπάσεις={overall_results['total_rows_split']}")
+            self.logger.info(f"Τυχαίες διασπάσεις N-way: {overall_results['sampler_calls']} (κομμάτια στα όρια: {overall_results['sampler_clamped_parts']}, χωρίς έγκυρο διαχωρισμό: {overall_results['impossible_n_way']})")
+            self.logger.info(f"Κρυφή μνήμη διασπάσεων: {overall_results['split_cache_hits']} επιτυχίες, {overall_results['split_cache_misses']} υπολογισμοί")
+            self.logger.info(f"Μέθοδοι διάσπασης: τυχαίες={overall_results['random_splits']}, ντετερμινιστικές={overall_results['deterministic_splits']}")
+            if overall_results['timings']:
+                self.logger.info(f"Χρόνοι ανά φάση: {timings_summary(overall_results['timings'])} (συνολικά {overall_results['elapsed_seconds']:.1f}s)")
+        return overall_results
+
+    def resume_batch(self, output_dir, workers=1, progress_callback=None, file_callback=None, should_stop=None, row_progress_callback=None,
+                     profile_dir=None):
+        """
+        Συνεχίζει την τελευταία μαζική επεξεργασία του output_dir από το journal της, με τα ίδια
+        αρχεία και τις ίδιες ρυθμίσεις: ξαναγίνονται μόνο τα αρχεία που δεν ολοκληρώθηκαν
+        (δεν ξεκίνησαν, διακόπηκαν ή είχαν σφάλματα) και η σύνοψη καλύπτει όλη τη μαζική επεξεργασία.
+
+        Returns:
+            dict: Τα συνολικά αποτελέσματα (όπως της process_multiple_files) ή None αν δεν υπάρχει journal.
+        """
+        journal = BatchJournal(output_dir, logger=self.logger).load()
+        if journal.batch is None:
+            if self.logger: self.logger.error(f"Δεν βρέθηκε μαζική επεξεργασία για συνέχιση στον φάκελο '{output_dir}' ({JOURNAL_FILE}).")
+            return None
+        pending = journal.pending_files()
+        if self.logger:
+            self.logger.info(f"Συνέχιση της μαζικής επεξεργασίας της {journal.batch['started_at']}: "
+                             f"{len(journal.finished)} αρχεία ολοκληρωμένα, {len(pending)} απομένουν.")
+        return self.process_multiple_files(journal.batch['files'], output_dir, workers=workers, progress_callback=progress_callback,
+                                           file_callback=file_callback, should_stop=should_stop, row_progress_callback=row_progress_callback,
+                                           resume=True, profile_dir=profile_dir, **journal.batch['settings'])
+
+    def _run_serial(self, jobs, file_kwargs, overall_results, merge_results, backend,
+                    progress_callback=None, file_callback=None, should_stop=None, row_progress_callback=None):
+        """Σειριακή επεξεργασία των εργασιών της process_multiple_files σε αυτή τη διεργασία."""
+        excel_pool = None
+        if backend == BACKEND_COM:
+            from modules.excel_pool import ExcelAppPool
+            excel_pool = ExcelAppPool(logger=self.logger, dispatch=self.com_dispatch)
+        try:
+            for i, (input_file, output_path, job_kwargs) in enumerate(jobs):
+                if should_stop and should_stop():
+                    if self.logger: self.logger.warning("Η επεξεργασία διακόπηκε από τον χρήστη.", category=CATEGORY_UI)
+                    break
+                file_name = os.path.basename(input_file)
+                if file_callback: file_callback(file_name)
+                if progress_callback: progress_callback(i, len(jobs))
+                try:
+                    results = self.process_file(input_file, output_path, excel_pool=excel_pool, row_progress_callback=row_progress_callback,
+                                                should_stop=should_stop, **dict(file_kwargs, **job_kwargs))
+                    merge_results(overall_results, file_name, results)
+                except Exception as e:
+                    overall_results['errors'] += 1
+                    error_msg = f"Κρίσιμο σφάλμα διαχείρισης {file_name}: {str(e)}"
+                    if self.logger: self.logger.error(error_msg, exc_info=True)
+                    overall_results['file_results'][file_name] = {'error': True, 'message': error_msg, 'skipped': False}
+        finally:
+            if excel_pool is not None: excel_pool.shutdown()
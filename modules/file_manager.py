@@ -1,5 +1,6 @@
 import os
 import shutil
+import hashlib
 
 class FileManager:
     @staticmethod
@@ -17,6 +18,24 @@ class FileManager:
         shutil.copy2(file_path, backup_path)
         return backup_path
     
+    @staticmethod
+    def file_sha256(file_path, chunk_size=1024 * 1024):
+        """
+        Υπολογισμός του SHA-256 του περιεχομένου ενός αρχείου.
+
+        Args:
+            file_path (str): Η διαδρομή του αρχείου
+            chunk_size (int): Μέγεθος τμήματος ανάγνωσης σε bytes
+
+        Returns:
+            str: Το hash σε δεκαεξαδική μορφή
+        """
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(chunk_size), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
     @staticmethod
     def validate_excel_file(file_path):
         """
@@ -53,4 +72,19 @@ class FileManager:
         if output_dir is None:
             output_dir = os.path.dirname(input_path)
         
-        return os.path.join(output_dir, f"{name}{suffix}{ext}")
\ No newline at end of file
+        return os.path.join(output_dir, f"{name}{suffix}{ext}")
+
+    @staticmethod
+    def get_partial_path(output_path):
+        """
+        Προσωρινή διαδρομή για την εγγραφή ενός αρχείου εξόδου: ίδιος φάκελος (ώστε το
+        os.replace στο τελικό όνομα να είναι ατομικό) και ίδια επέκταση (για το SaveAs του Excel).
+
+        Args:
+            output_path (str): Η τελική διαδρομή του αρχείου εξόδου
+
+        Returns:
+            str: Η προσωρινή διαδρομή
+        """
+        name, ext = os.path.splitext(output_path)
+        return f"{name}.partial{ext}"
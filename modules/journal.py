@@ -0,0 +1,136 @@
+import os
+import json
+from datetime import datetime
+
+# Όνομα του journal μέσα στον φάκελο εξόδου.
+JOURNAL_FILE = 'splitter_journal.jsonl'
+JOURNAL_VERSION = 1
+
+# Είδη εγγραφών του journal (μία εγγραφή JSON ανά γραμμή).
+EVENT_BATCH = 'batch'
+EVENT_RESUME = 'resume'
+EVENT_FILE_STARTED = 'file_started'
+EVENT_FILE_DONE = 'file_done'
+EVENT_END = 'end'
+
+
+class BatchJournal:
+    """
+    Το journal της τελευταίας μαζικής επεξεργασίας ενός φακέλου εξόδου: τα αρχεία και οι
+    ρυθμίσεις της, και για κάθε αρχείο που ολοκληρώθηκε τα αποτελέσματά του (με τα φύλλα του).
+
+    Κάθε εγγραφή προστίθεται ως μία γραμμή JSON και γράφεται στον δίσκο (fsync) αμέσως, ώστε
+    μετά από κατάρρευση της εφαρμογής ή του Excel να μη χάνεται τίποτα εκτός από το αρχείο που
+    επεξεργαζόταν. Μια μισογραμμένη τελευταία γραμμή αγνοείται κατά τη φόρτωση.
+    """
+
+    def __init__(self, output_dir, logger=None):
+        self.path = os.path.join(output_dir, JOURNAL_FILE)
+        self.logger = logger
+        self.batch = None
+        self.finished = {}
+        self.started = []
+        self.completed = False
+        self._file = None
+        self._torn = False
+
+    def load(self):
+        """Φορτώνει το journal (αν υπάρχει). Ένα journal άλλης έκδοσης ή χωρίς αρχή αγνοείται."""
+        self.batch = None
+        self.finished = {}
+        self.started = []
+        self.completed = False
+        self._torn = False
+        if not os.path.exists(self.path): return self
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            lines = text.splitlines()
+            # Η τελευταία γραμμή έμεινε μισή (κατάρρευση κατά την εγγραφή της).
+            self._torn = bool(text) and not text.endswith('\n')
+        except OSError as e:
+            if self.logger: self.logger.warning(f"Το journal '{self.path}' δεν διαβάστηκε: {str(e)}")
+            return self
+        for line_num, line in enumerate(lines, 1):
+            if not line.strip(): continue
+            try:
+                record = json.loads(line)
+                event = record['event']
+            except (ValueError, TypeError, KeyError) as e:
+                if line_num < len(lines) and self.logger:
+                    self.logger.warning(f"Αγνοείται η γραμμή {line_num} του journal '{self.path}': {str(e)}")
+                continue
+            if event == EVENT_BATCH:
+                if record.get('version') != JOURNAL_VERSION: return self
+                self.batch = {'files': record.get('files', []), 'settings': record.get('settings', {}), 'started_at': record.get('time')}
+            elif self.batch is None:
+                continue
+            elif event == EVENT_FILE_STARTED:
+                self.started.append(record.get('file'))
+            elif event == EVENT_FILE_DONE:
+                results = record.get('results', {})
+                if self.is_finished(results): self.finished[record.get('file')] = results
+                else: self.finished.pop(record.get('file'), None)
+            elif event == EVENT_RESUME:
+                self.completed = False
+            elif event == EVENT_END:
+                self.completed = True
+        return self
+
+    def pending_files(self):
+        """Τα αρχεία εισόδου της μαζικής επεξεργασίας που δεν έχουν ολοκληρωθεί."""
+        if self.batch is None: return []
+        return [path for path in self.batch['files'] if os.path.basename(path) not in self.finished]
+
+    def start(self, input_files, settings):
+        """Ξεκινά νέο journal (αντικαθιστά το προηγούμενο) για τα αρχεία και τις ρυθμίσεις μιας μαζικής επεξεργασίας."""
+        self.close()
+        self.batch = {'files': [os.path.abspath(path) for path in input_files], 'settings': dict(settings),
+                      'started_at': datetime.now().isoformat(timespec='seconds')}
+        self.finished = {}
+        self.started = []
+        self.completed = False
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._append({'event': EVENT_BATCH, 'version': JOURNAL_VERSION, 'files': self.batch['files'], 'settings': self.batch['settings']})
+
+    def resume(self):
+        """Συνεχίζει το journal που φορτώθηκε με τη load (νέες εγγραφές στο τέλος του)."""
+        self.close()
+        self._file = open(self.path, 'a', encoding='utf-8')
+        if self._torn: self._file.write('\n')
+        self._torn = False
+        self.completed = False
+        self._append({'event': EVENT_RESUME, 'finished': len(self.finished)})
+
+    def record_started(self, file_name):
+        self.started.append(file_name)
+        self._append({'event': EVENT_FILE_STARTED, 'file': file_name})
+
+    def record_file(self, file_name, results):
+        """Καταγράφει τα αποτελέσματα ενός αρχείου· στη συνέχιση παραλείπεται μόνο αν is_finished."""
+        if self.is_finished(results): self.finished[file_name] = results
+        else: self.finished.pop(file_name, None)
+        self._append({'event': EVENT_FILE_DONE, 'file': file_name, 'results': results})
+
+    def finish(self):
+        """Σημειώνει το τέλος της μαζικής επεξεργασίας και κλείνει το journal."""
+        self.completed = True
+        self._append({'event': EVENT_END, 'finished': len(self.finished)})
+        self.close()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @staticmethod
+    def is_finished(results):
+        """Ένα αρχείο θεωρείται ολοκληρωμένο (δεν ξαναγίνεται στη συνέχιση) αν δεν διακόπηκε και δεν είχε σφάλματα."""
+        return not results.get('cancelled') and not results.get('error') and results.get('errors', 0) == 0
+
+    def _append(self, record):
+        if self._file is None: return
+        record['time'] = datetime.now().isoformat(timespec='seconds')
+        self._file.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
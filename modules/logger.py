@@ -1,21 +1,136 @@
 
 import os
+import abc
+import atexit
 import logging
+import logging.handlers
+import queue
+import threading
+from collections import deque
 from datetime import datetime
-from PyQt5.QtCore import QObject, pyqtSignal
 
-class Logger(QObject):
-    log_signal = pyqtSignal(str)
+# Ονόματα επιπέδων για τα μηνύματα του UI log ("[INFO] ...").
+LEVEL_NAMES = {logging.DEBUG: 'DEBUG', logging.INFO: 'INFO', logging.WARNING: 'WARNING', logging.ERROR: 'ERROR'}
+
+# Κατηγορία μηνυμάτων για τον χρήστη (ρυθμίσεις, σύνοψη αποτελεσμάτων), που εμφανίζονται στο UI log.
+CATEGORY_UI = 'ui'
+# Μέγιστος αριθμός μηνυμάτων που περιμένουν να εμφανιστούν στο UI log.
+UI_LOG_BUFFER_SIZE = 2000
+
+# Το νήμα εγγραφής (QueueListener) του logger της εφαρμογής· ένα ανά διεργασία.
+_writer = None
+
+
+def start_background_writer(logger):
+    """
+    Μεταφέρει τους handlers του logging.Logger σε νήμα παρασκηνίου: ο logger γράφει μόνο σε
+    ουρά (QueueHandler) και ένας QueueListener γράφει στο αρχείο/κονσόλα. Ο listener
+    σταματά (και αδειάζει την ουρά) στο τέλος του προγράμματος. Η ουρά είναι queue.Queue,
+    ώστε το queue.join() να περιμένει να γραφτούν όσα μηνύματα έχουν σταλεί (βλ. Logger.flush).
+
+    Returns:
+        logging.handlers.QueueListener: ο listener (τα handlers του είναι τα αρχικά).
+    """
+    handlers = list(logger.handlers)
+    for handler in handlers:
+        logger.removeHandler(handler)
+    log_queue = queue.Queue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
+class BaseLogger(abc.ABC):
+    """
+    Κοινή λογική των loggers της εφαρμογής (Logger, QueueLogger των workers, ConsoleLogger του CLI).
+
+    Τα μηνύματα μορφοποιούνται μόνο αν το επίπεδο είναι ενεργό: δέχονται ορίσματα σε στυλ %
+    (logger.debug("Γραμμή %d", row)) ή συνάρτηση χωρίς ορίσματα που επιστρέφει το κείμενο.
+
+    Τα συμβάντα ανά γραμμή (row_event) σε λειτουργία quiet_hot_path δεν γράφονται ένα-ένα,
+    αλλά μετρώνται ανά κατηγορία και γράφονται συγκεντρωτικά με τη flush_row_events.
+    """
+
+    def __init__(self, quiet_hot_path=True):
+        self.quiet_hot_path = quiet_hot_path
+        self.row_events = {}
+
+    def is_enabled(self, level):
+        return True
+
+    @abc.abstractmethod
+    def _write(self, level, message, exc_info, category=None):
+        """Γράφει ένα ήδη μορφοποιημένο μήνυμα (καλείται μόνο για ενεργά επίπεδα)."""
+
+    def _log(self, level, message, args, exc_info, category=None):
+        if not self.is_enabled(level): return
+        if callable(message):
+            message = message()
+        elif args:
+            try:
+                message = message % args
+            except (TypeError, ValueError):
+                message = ' '.join([str(message)] + [str(arg) for arg in args])
+        self._write(level, message, exc_info, category)
+
+    def info(self, message, *args, exc_info=False, category=None):
+        self._log(logging.INFO, message, args, exc_info, category)
+
+    def warning(self, message, *args, exc_info=False, category=None):
+        self._log(logging.WARNING, message, args, exc_info, category)
+
+    def error(self, message, *args, exc_info=False, category=None):
+        self._log(logging.ERROR, message, args, exc_info, category)
+
+    def debug(self, message, *args, exc_info=False, category=None):
+        self._log(logging.DEBUG, message, args, exc_info, category)
+
+    def row_event(self, category, message, *args, level=logging.INFO):
+        """
+        Συμβάν μιας γραμμής (π.χ. μια διάσπαση). Σε λειτουργία quiet_hot_path μόνο μετράται
+        στην κατηγορία του· αλλιώς γράφεται κανονικά στο επίπεδο level.
+        """
+        if self.quiet_hot_path:
+            self.row_events[category] = self.row_events.get(category, 0) + 1
+        else:
+            self._log(level, message, args, False)
+
+    def flush_row_events(self, context=''):
+        """Γράφει (INFO) και μηδενίζει τους μετρητές των συμβάντων ανά γραμμή. Επιστρέφει τους μετρητές."""
+        counts, self.row_events = self.row_events, {}
+        if counts:
+            summary = ', '.join(f"{category}={count}" for category, count in sorted(counts.items()))
+            self._log(logging.INFO, "Συμβάντα γραμμών%s: %s", (f" ({context})" if context else '', summary), False)
+        return counts
+
+    def get_log_file(self):
+        return None
+
 
-    def __init__(self, log_dir=None, log_level=logging.INFO):
-        super().__init__()
+class Logger(BaseLogger):
+    """
+    Logger της εφαρμογής (αρχείο log και κονσόλα), χωρίς εξάρτηση από PyQt5.
+    Το UI εγγράφει με add_listener μια συνάρτηση που δέχεται τα μηνύματα για την οθόνη
+    (π.χ. το emit ενός σήματος Qt).
+
+    Με background=True η εγγραφή στο αρχείο και την κονσόλα γίνεται από νήμα παρασκηνίου,
+    ώστε η επεξεργασία να μην περιμένει τον δίσκο.
+    """
+
+    def __init__(self, log_dir=None, log_level=logging.INFO, background=True, quiet_hot_path=True):
+        global _writer
+        super().__init__(quiet_hot_path)
+        self.listeners = []
+        self.writer = None
 
         if log_dir is None:
             try:
                 script_dir = os.path.dirname(__file__)
                 parent_dir = os.path.dirname(script_dir)
                 log_dir = os.path.join(parent_dir, 'logs')
-            except NameError: 
+            except NameError:
                  log_dir = os.path.join(os.getcwd(), 'logs')
 
 
@@ -23,75 +138,113 @@ class Logger(QObject):
             os.makedirs(log_dir, exist_ok=True)
         except OSError as e:
              print(f"CRITICAL: Could not create log directory '{log_dir}'. Error: {e}")
-             
+
              log_dir = os.getcwd()
 
 
         self.logger = logging.getLogger('invoice_splitter_app')
         self.logger.setLevel(log_level)
-        self.log_file = None 
+        self.log_file = None
+
 
-        
         if not self.logger.handlers:
             try:
                 timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
                 self.log_file = os.path.join(log_dir, f'invoice_splitter_{timestamp}.log')
 
-                
+
                 file_handler = logging.FileHandler(self.log_file, encoding='utf-8')
                 file_format = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s', datefmt='%Y-%m-%d %H:%M:%S')
                 file_handler.setFormatter(file_format)
                 self.logger.addHandler(file_handler)
 
-                
+
                 console_handler = logging.StreamHandler()
                 console_format = logging.Formatter('%(levelname)s: %(message)s')
                 console_handler.setFormatter(console_format)
-                console_handler.setLevel(logging.INFO) 
+                console_handler.setLevel(logging.INFO)
                 self.logger.addHandler(console_handler)
 
-                
-                
+                if background:
+                    _writer = start_background_writer(self.logger)
+                    self.writer = _writer
 
             except Exception as e:
                  print(f"CRITICAL: Failed to configure logging handlers. Error: {e}")
 
-        else: 
-             for handler in self.logger.handlers:
+        else:
+             self.writer = _writer
+             for handler in (_writer.handlers if _writer else self.logger.handlers):
                  if isinstance(handler, logging.FileHandler):
                      self.log_file = handler.baseFilename
                      break
 
-    def _emit_signal(self, level, message):
-        """Εκπέμπει το σήμα για το UI log."""
-        formatted_message = f"[{level}] {message}"
-        try:
-            self.log_signal.emit(formatted_message)
-        except Exception as e:
-            print(f"Error emitting log signal: {e}. Message: {formatted_message}")
-
-    
-    def info(self, message, exc_info=False):
-        self.logger.info(message, exc_info=exc_info)
-        
-        
-        self._emit_signal("INFO", message)
-
-    def warning(self, message, exc_info=False):
-        self.logger.warning(message, exc_info=exc_info)
-        self._emit_signal("WARNING", message) 
-
-    def error(self, message, exc_info=False):
-        
-        self.logger.error(message, exc_info=exc_info)
-        
-        self._emit_signal("ERROR", message)
-
-    def debug(self, message, exc_info=False):
-        self.logger.debug(message, exc_info=exc_info)
-        
-        
+    def is_enabled(self, level):
+        return self.logger.isEnabledFor(level)
+
+    def _write(self, level, message, exc_info, category=None):
+        self.logger.log(level, message, exc_info=exc_info)
+        # Τα μηνύματα DEBUG γράφονται μόνο στο αρχείο.
+        if level > logging.DEBUG and self.listeners: self._emit_signal(level, message, category)
+
+    def add_listener(self, callback, min_level=logging.INFO, categories=None):
+        """
+        Εγγράφει μια συνάρτηση callback(formatted_message) για τα μηνύματα του UI log.
+        Το φιλτράρισμα γίνεται εδώ, πριν τη μορφοποίηση: ο listener λαμβάνει όλα τα μηνύματα
+        από min_level και πάνω, και από τα χαμηλότερα μόνο όσα ανήκουν στις categories.
+        """
+        self.remove_listener(callback)
+        self.listeners.append((callback, min_level, frozenset(categories or ())))
+
+    def remove_listener(self, callback):
+        self.listeners = [listener for listener in self.listeners if listener[0] != callback]
+
+    def _emit_signal(self, level, message, category=None):
+        """Στέλνει το μήνυμα στους listeners του UI log που το δέχονται."""
+        formatted_message = None
+        for callback, min_level, categories in list(self.listeners):
+            if level < min_level and category not in categories: continue
+            if formatted_message is None:
+                formatted_message = f"[{LEVEL_NAMES.get(level, 'INFO')}] {message}"
+            try:
+                callback(formatted_message)
+            except Exception as e:
+                print(f"Error emitting log signal: {e}. Message: {formatted_message}")
+
+    def flush(self):
+        """Περιμένει να γραφτούν όσα μηνύματα είναι ακόμα στην ουρά του νήματος παρασκηνίου."""
+        # Μετά το stop (στο τέλος του προγράμματος) δεν υπάρχει νήμα να αδειάσει την ουρά.
+        if self.writer is not None and getattr(self.writer, '_thread', None) is not None:
+            self.writer.queue.join()
 
     def get_log_file(self):
         """Επιστρέφει τη διαδρομή του τρέχοντος αρχείου log."""
-        return self.log_file if hasattr(self, 'log_file') else None
\ No newline at end of file
+        return self.log_file if hasattr(self, 'log_file') else None
+
+
+class LogRingBuffer:
+    """
+    Ουρά σταθερού μεγέθους για τα μηνύματα του UI log. Το append καλείται από οποιοδήποτε
+    νήμα (listener του Logger) και το drain από το νήμα του UI σε ένα timer, ώστε η οθόνη
+    να ενημερώνεται με ένα μόνο append ανά παρτίδα. Όταν η ουρά γεμίσει, τα παλαιότερα
+    μηνύματα πετιούνται και μετρώνται.
+    """
+
+    def __init__(self, maxlen=UI_LOG_BUFFER_SIZE):
+        self.lines = deque(maxlen=maxlen)
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def append(self, message):
+        with self._lock:
+            if len(self.lines) == self.lines.maxlen: self.dropped += 1
+            self.lines.append(message)
+
+    def drain(self):
+        """Επιστρέφει (μηνύματα, πλήθος που πετάχτηκαν) και αδειάζει την ουρά."""
+        with self._lock:
+            if not self.lines and not self.dropped: return [], 0
+            lines, dropped = list(self.lines), self.dropped
+            self.lines.clear()
+            self.dropped = 0
+        return lines, dropped
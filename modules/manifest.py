@@ -0,0 +1,125 @@
+import os
+import json
+import hashlib
+
+from modules.file_manager import FileManager
+from modules.money import to_cents
+
+# Όνομα του manifest μέσα στον φάκελο εξόδου.
+MANIFEST_FILE = 'splitter_manifest.json'
+MANIFEST_VERSION = 1
+
+
+def settings_sha256(threshold, max_split_value, value_col, prop_cols, split_mode,
+                    auto_numbering=False, invoice_num_col=2, split_seed=None, seed_scope=None):
+    """
+    Hash των ρυθμίσεων που επηρεάζουν το περιεχόμενο ενός αρχείου εξόδου. Η μηχανή, ο τρόπος
+    εγγραφής και το πλήθος διεργασιών δεν περιλαμβάνονται (δίνουν το ίδιο αποτέλεσμα).
+    Τα ποσά κανονικοποιούνται σε λεπτά, ώστε π.χ. 500 και 500.0 να δίνουν το ίδιο hash.
+    """
+    if max_split_value is None: max_split_value = threshold
+    if prop_cols is None: prop_cols = [8, 19]
+    settings = {
+        'threshold': to_cents(threshold), 'max_split_value': to_cents(max_split_value),
+        'value_col': int(value_col), 'prop_cols': [int(c) for c in prop_cols], 'split_mode': split_mode,
+        'auto_numbering': bool(auto_numbering), 'invoice_num_col': int(invoice_num_col),
+        'split_seed': split_seed, 'seed_scope': seed_scope if split_seed is not None else None,
+    }
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class BatchManifest:
+    """
+    Το manifest ενός φακέλου εξόδου: για κάθε αρχείο εξόδου το hash του αρχείου εισόδου,
+    των ρυθμίσεων και του ίδιου του αρχείου εξόδου από την τελευταία επιτυχή επεξεργασία.
+
+    Για να μη διαβάζονται ξανά αμετάβλητα αρχεία, μαζί με κάθε hash κρατούνται το μέγεθος
+    και ο χρόνος τροποποίησης: αν είναι ίδια, το hash δεν ξαναϋπολογίζεται.
+    """
+
+    def __init__(self, output_dir, logger=None):
+        self.path = os.path.join(output_dir, MANIFEST_FILE)
+        self.logger = logger
+        self.entries = {}
+        self.changed = False
+
+    def load(self):
+        """Φορτώνει το manifest (αν υπάρχει). Ένα κατεστραμμένο manifest αγνοείται."""
+        self.entries = {}
+        if not os.path.exists(self.path): return self
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == MANIFEST_VERSION:
+                self.entries = data.get('files', {})
+        except (OSError, ValueError, AttributeError) as e:
+            if self.logger: self.logger.warning(f"Το manifest '{self.path}' δεν διαβάστηκε και θα ξαναδημιουργηθεί: {str(e)}")
+        return self
+
+    def save(self):
+        """Αποθηκεύει το manifest ατομικά (προσωρινό αρχείο και os.replace)."""
+        if not self.changed: return
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'files': self.entries}, f, ensure_ascii=False, indent=1, sort_keys=True)
+        os.replace(temp_path, self.path)
+        self.changed = False
+
+    @staticmethod
+    def _stat(path):
+        stat = os.stat(path)
+        return stat.st_size, stat.st_mtime_ns
+
+    def _hash(self, path, recorded=None):
+        """
+        Επιστρέφει (sha256, μέγεθος, χρόνος τροποποίησης) του αρχείου· το hash της καταχώρησης
+        recorded = (sha256, μέγεθος, χρόνος) χρησιμοποιείται αν το αρχείο δεν έχει αλλάξει.
+        """
+        size, mtime_ns = self._stat(path)
+        if recorded and recorded[1] == size and recorded[2] == mtime_ns:
+            return recorded
+        return FileManager.file_sha256(path), size, mtime_ns
+
+    def input_hash(self, input_path, output_path):
+        """Το hash του αρχείου εισόδου (με τη συντόμευση μεγέθους/χρόνου της προηγούμενης καταχώρησης)."""
+        entry = self.entries.get(os.path.basename(output_path), {})
+        recorded = (entry.get('input_sha256'), entry.get('input_size'), entry.get('input_mtime_ns')) if entry else None
+        return self._hash(input_path, recorded)
+
+    def is_current(self, output_path, input_hash, settings_hash):
+        """
+        True αν το αρχείο εξόδου προέκυψε από την ίδια είσοδο (input_hash από την input_hash)
+        με τις ίδιες ρυθμίσεις και υπάρχει ακόμα αμετάβλητο. Αν τα hashes ταιριάζουν αλλά
+        άλλαξε μόνο ο χρόνος τροποποίησης (π.χ. αντιγραφή), η καταχώρηση ενημερώνεται ώστε
+        την επόμενη φορά να μη χρειαστεί ξανά ανάγνωση.
+        """
+        entry = self.entries.get(os.path.basename(output_path))
+        if not entry or entry.get('input_sha256') != input_hash[0] or entry.get('settings_sha256') != settings_hash:
+            return False
+        if not os.path.exists(output_path):
+            return False
+        recorded = (entry.get('output_sha256'), entry.get('output_size'), entry.get('output_mtime_ns'))
+        output_hash = self._hash(output_path, recorded)
+        if output_hash[0] != entry.get('output_sha256'):
+            return False
+        if output_hash != recorded or (entry.get('input_size'), entry.get('input_mtime_ns')) != input_hash[1:]:
+            entry['input_size'], entry['input_mtime_ns'] = input_hash[1:]
+            entry['output_size'], entry['output_mtime_ns'] = output_hash[1:]
+            self.changed = True
+        return True
+
+    def is_known_output(self, output_path):
+        """True αν το αρχείο εξόδου έχει καταγραφεί στο manifest (δημιουργήθηκε από εδώ)."""
+        return os.path.basename(output_path) in self.entries
+
+    def record(self, input_path, output_path, input_hash, settings_hash):
+        """Καταγράφει ένα αρχείο εξόδου μετά από επιτυχή επεξεργασία (input_hash από την input_hash)."""
+        input_sha256, input_size, input_mtime_ns = input_hash
+        output_sha256, output_size, output_mtime_ns = self._hash(output_path)
+        self.entries[os.path.basename(output_path)] = {
+            'input': os.path.abspath(input_path),
+            'input_sha256': input_sha256, 'input_size': input_size, 'input_mtime_ns': input_mtime_ns,
+            'settings_sha256': settings_hash,
+            'output_sha256': output_sha256, 'output_size': output_size, 'output_mtime_ns': output_mtime_ns,
+        }
+        self.changed = True
@@ -0,0 +1,127 @@
+import os
+import sys
+import json
+import time
+
+from modules.progress import PHASES
+
+# Ονόματα των αρχείων μετρήσεων μέσα στον φάκελο εξόδου (εξαγωγή από το γραφικό περιβάλλον).
+METRICS_JSON_FILE = 'splitter_metrics.json'
+METRICS_PROMETHEUS_FILE = 'splitter_metrics.prom'
+METRICS_PREFIX = 'invoice_splitter'
+
+# Μετρητές διασπάσεων ανά μέθοδο στα αποτελέσματα (βλ. ExcelProcessor._plan_row_splits).
+SPLIT_METHOD_KEYS = {'random': 'random_splits', 'deterministic': 'deterministic_splits'}
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+def peak_memory_bytes():
+    """Η μέγιστη μνήμη (peak RSS / working set) της διεργασίας μέχρι τώρα σε bytes, ή None αν δεν είναι διαθέσιμη."""
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux: KiB, macOS: bytes.
+        return peak if sys.platform == 'darwin' else peak * 1024
+    if sys.platform == 'win32':
+        try:
+            import ctypes
+            from ctypes import wintypes
+
+            class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+                _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                            ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                            ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                            ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                            ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t)]
+
+            counters = PROCESS_MEMORY_COUNTERS()
+            counters.cb = ctypes.sizeof(counters)
+            get_info = ctypes.windll.psapi.GetProcessMemoryInfo
+            get_info.argtypes = [wintypes.HANDLE, ctypes.POINTER(PROCESS_MEMORY_COUNTERS), wintypes.DWORD]
+            if get_info(ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+                return int(counters.PeakWorkingSetSize)
+        except (OSError, AttributeError):
+            pass
+    return None
+
+
+def merge_timings(total, timings):
+    """Προσθέτει τους χρόνους ανά φάση ενός αρχείου στους συνολικούς."""
+    for phase, seconds in (timings or {}).items():
+        total[phase] = total.get(phase, 0.0) + seconds
+
+
+def _atomic_write(path, text):
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(text)
+    os.replace(temp_path, path)
+
+
+def write_json(results, path):
+    """Γράφει τις μετρήσεις μιας μαζικής επεξεργασίας (συνολικά και ανά αρχείο) σε JSON."""
+    metrics = {key: value for key, value in results.items() if key not in ('file_results', 'skipped_details')}
+    metrics['files'] = {
+        name: {key: file_results.get(key) for key in ('processed_rows', 'split_rows', 'skipped_impossible_splits', 'errors', 'timings',
+                                                      'peak_memory_bytes', *SPLIT_METHOD_KEYS.values(), 'sampler_clamped_parts')
+               if key in file_results}
+        for name, file_results in results.get('file_results', {}).items()
+    }
+    _atomic_write(path, json.dumps(metrics, ensure_ascii=False, indent=2, default=str) + '\n')
+
+
+def prometheus_text(results, timestamp=None):
+    """Οι μετρήσεις σε μορφή κειμένου Prometheus (για τον textfile collector του node_exporter)."""
+    lines = []
+
+    def metric(name, help_text, samples, kind='gauge'):
+        samples = [(labels, value) for labels, value in samples if value is not None]
+        if not samples: return
+        lines.append(f"# HELP {METRICS_PREFIX}_{name} {help_text}")
+        lines.append(f"# TYPE {METRICS_PREFIX}_{name} {kind}")
+        for labels, value in samples:
+            label_text = ','.join(f'{key}="{val}"' for key, val in labels.items())
+            lines.append(f"{METRICS_PREFIX}_{name}{{{label_text}}} {value}" if label_text else f"{METRICS_PREFIX}_{name} {value}")
+
+    metric('files', "Files of the last batch by outcome.",
+           [({'status': status}, results.get(key, 0)) for status, key in
+            (('total', 'total_files'), ('processed', 'processed_files'), ('skipped', 'skipped_files'),
+             ('cached', 'cache_hits'), ('cancelled', 'cancelled_files'))])
+    metric('rows_processed', "Rows scanned in the last batch.", [({}, results.get('total_rows_processed', 0))])
+    metric('rows_split', "Rows split in the last batch.", [({}, results.get('total_rows_split', 0))])
+    metric('splits', "Split rows of the last batch by method.",
+           [({'method': method}, results.get(key, 0)) for method, key in SPLIT_METHOD_KEYS.items()])
+    metric('rows_unsplittable', "Rows above the threshold without a valid split in the last batch.",
+           [({}, results.get('skipped_impossible_splits', 0))])
+    metric('sampler_clamped_parts', "N-way split parts clamped to their bounds in the last batch.", [({}, results.get('sampler_clamped_parts', 0))])
+    metric('errors', "Errors in the last batch.", [({}, results.get('errors', 0))])
+    metric('phase_seconds', "Time spent per processing phase in the last batch (summed over files).",
+           [({'phase': phase}, round(seconds, 6)) for phase, seconds in results.get('timings', {}).items()])
+    metric('batch_seconds', "Wall-clock time of the last batch.", [({}, results.get('elapsed_seconds'))])
+    metric('peak_memory_bytes', "Peak resident memory of the processing processes.", [({}, results.get('peak_memory_bytes'))])
+    metric('last_run_timestamp_seconds', "Time the last batch finished.", [({}, int(timestamp if timestamp is not None else time.time()))])
+    return '\n'.join(lines) + '\n'
+
+
+def write_prometheus(results, path):
+    """Γράφει τις μετρήσεις σε αρχείο .prom ατομικά (ο collector δεν βλέπει ποτέ μισό αρχείο)."""
+    _atomic_write(path, prometheus_text(results))
+
+
+def export_metrics(results, output_dir, logger=None):
+    """Γράφει τα METRICS_JSON_FILE και METRICS_PROMETHEUS_FILE στον φάκελο εξόδου· σφάλματα καταγράφονται."""
+    for name, write in ((METRICS_JSON_FILE, write_json), (METRICS_PROMETHEUS_FILE, write_prometheus)):
+        path = os.path.join(output_dir, name)
+        try:
+            write(results, path)
+            if logger: logger.info(f"Μετρήσεις: {path}")
+        except OSError as e:
+            if logger: logger.warning(f"Οι μετρήσεις δεν γράφτηκαν στο '{path}': {str(e)}")
+
+
+def timings_summary(timings):
+    """'open 0.1s, scan 2.3s, ...' με τη σειρά των φάσεων."""
+    return ', '.join(f"{phase} {timings[phase]:.1f}s" for phase in PHASES if phase in timings)
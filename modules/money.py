@@ -0,0 +1,50 @@
+import decimal
+
+# Τα ποσά της διάσπασης κρατούνται ως ακέραια λεπτά (int): οι πράξεις και τα αθροίσματα
+# είναι ακριβή χωρίς decimal context ανά γραμμή, και η στρογγυλοποίηση είναι πάντα
+# ROUND_HALF_UP στο 0.01, όπως με Decimal.quantize(Decimal('0.01'), ROUND_HALF_UP).
+
+CENT = decimal.Decimal('0.01')
+
+
+def to_cents(value):
+    """
+    Μετατρέπει ένα ποσό (int, float, Decimal ή str) σε ακέραια λεπτά με ROUND_HALF_UP.
+    Δίνει το ίδιο αποτέλεσμα με Decimal(str(value)).quantize(CENT, ROUND_HALF_UP).
+
+    Raises:
+        decimal.InvalidOperation: αν η τιμή δεν είναι αριθμός.
+    """
+    if isinstance(value, int) and not isinstance(value, bool):
+        return int(value) * 100
+    text = str(value)
+    if isinstance(value, float) and 'e' not in text and 'n' not in text:
+        negative = text[0] == '-'
+        whole, _, fraction = text.lstrip('-').partition('.')
+        fraction += '00'
+        cents = int(whole) * 100 + int(fraction[:2])
+        if fraction[2:3] >= '5':
+            cents += 1
+        return -cents if negative else cents
+    return int(decimal.Decimal(text).quantize(CENT, rounding=decimal.ROUND_HALF_UP).scaleb(2))
+
+
+def from_cents(cents):
+    """Ακέραια λεπτά -> float (ο πλησιέστερος float, όπως το float(Decimal('12.34')))."""
+    return cents / 100
+
+
+def format_cents(cents):
+    """Ακέραια λεπτά -> κείμενο με δύο δεκαδικά (π.χ. 123456 -> '1234.56')."""
+    sign = '-' if cents < 0 else ''
+    whole, fraction = divmod(abs(cents), 100)
+    return f"{sign}{whole}.{fraction:02d}"
+
+
+def div_round_half_up(numerator, denominator):
+    """Ακέραια διαίρεση με ROUND_HALF_UP (οι ισοπαλίες στρογγυλοποιούνται μακριά από το μηδέν)."""
+    if denominator < 0:
+        numerator, denominator = -numerator, -denominator
+    if numerator >= 0:
+        return (2 * numerator + denominator) // (2 * denominator)
+    return -((-2 * numerator + denominator) // (2 * denominator))
@@ -0,0 +1,1017 @@
+import io
+import re
+import html
+import copy
+import shutil
+import zipfile
+import posixpath
+import xml.etree.ElementTree as ET
+from array import array
+from bisect import bisect_left
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+OOXML_EXTENSIONS = ('.xlsx', '.xlsm')
+
+# Είδη κελιών στα ColumnBlock.
+KIND_EMPTY = 0
+KIND_NUMBER = 1
+KIND_BOOL = 2
+KIND_TEXT = 3
+
+_NS_MAIN = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_NS_DOC_REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_NS_PKG_REL = 'http://schemas.openxmlformats.org/package/2006/relationships'
+_NS_XML = 'http://www.w3.org/XML/1998/namespace'
+
+_TAG_SHEET = f'{{{_NS_MAIN}}}sheet'
+_TAG_ROW = f'{{{_NS_MAIN}}}row'
+_TAG_C = f'{{{_NS_MAIN}}}c'
+_TAG_V = f'{{{_NS_MAIN}}}v'
+_TAG_F = f'{{{_NS_MAIN}}}f'
+_TAG_IS = f'{{{_NS_MAIN}}}is'
+_TAG_T = f'{{{_NS_MAIN}}}t'
+_TAG_R = f'{{{_NS_MAIN}}}r'
+_TAG_SI = f'{{{_NS_MAIN}}}si'
+_TAG_REL = f'{{{_NS_PKG_REL}}}Relationship'
+_ATTR_REL_ID = f'{{{_NS_DOC_REL}}}id'
+_ATTR_XML_SPACE = f'{{{_NS_XML}}}space'
+
+_REL_WORKSHEET = '/worksheet'
+_REL_SHARED_STRINGS = '/sharedStrings'
+_REL_CALC_CHAIN = '/calcChain'
+_REL_TABLE = '/table'
+_REL_OFFICE_DOCUMENT = '/officeDocument'
+
+_CELL_REF_RE = re.compile(r'\$?([A-Z]+)\$?(\d+)')
+_REF_RE = re.compile(
+    r"(?<![\w.$!\]'])"
+    r"(?P<sheet>'(?:[^']|'')+'!|[^\W\d][\w.]*!)?"
+    r"(?:(?P<col>\$?[A-Z]{1,3})(?P<rabs>\$?)(?P<row>\d+)"
+    r"(?::(?P<col2>\$?[A-Z]{1,3})(?P<rabs2>\$?)(?P<row2>\d+))?(?![\w(!\[])"
+    r"|(?P<r1abs>\$?)(?P<r1>\d+):(?P<r2abs>\$?)(?P<r2>\d+)(?![\w(.]))"
+)
+_BLOCK_SIZE = 1 << 20
+_ROOT_OPEN_RE = re.compile(rb'<([\w.-]+:)?worksheet\b[^>]*>')
+_XMLNS_RE = re.compile(rb'\sxmlns(?::([\w.-]+))?="([^"]*)"')
+_SHEET_DATA_OPEN_RE = re.compile(rb'<([\w.-]+:)?sheetData\b[^>]*?(/?)>')
+_ROW_NUM_RE = re.compile(rb'\sr="(\d+)"')
+_ROW_REFS_RE = re.compile(rb'(\sr="[A-Z]*)\d+"')
+_ROW_PREFIX_RE = re.compile(rb'<([\w.-]+:)?row\b')
+_CELL_RE = re.compile(
+    rb'<(?:[\w.-]+:)?c\b(?=[^>]*?\sr="([A-Z]+)\d+")?(?=[^>]*?\st="(\w+)")?'
+    rb'([^>]*?)(?:/>|>(.*?)</(?:[\w.-]+:)?c>)', re.S
+)
+_CELL_ATTR_S_RE = re.compile(rb'\ss="(\d+)"')
+_V_RE = re.compile(rb'<(?:[\w.-]+:)?v>([^<]*)</')
+_T_RE = re.compile(rb'<(?:[\w.-]+:)?t(?:\s[^>]*)?>([^<]*)</')
+_FORMULA_TAG_RE = re.compile(rb'<(?:[\w.-]+:)?f[\s/>]')
+_DIMENSION_RE = re.compile(rb'(<(?:[\w.-]+:)?dimension\b[^>]*?\bref=")([^"]*)(")')
+_REF_ATTR_RE = re.compile(r'(\b(?:ref|sqref)=")([^"]*)(")')
+_FORMULA_ELEM_RE = re.compile(r'(<(?:[\w.-]+:)?(?:formula|f|sqref)>)([^<]*)(</)')
+_DEFINED_NAME_RE = re.compile(r'(<(?:[\w.-]+:)?definedName\b[^>]*>)([^<]*)(</)')
+_CALC_PR_RE = re.compile(r'<((?:[\w.-]+:)?calcPr)\b([^>]*?)(/?)>')
+_ROW_OPEN_NUM_RE = re.compile(rb'<(?:[\w.-]+:)?row\b[^>]*?\sr="(\d+)"')
+_PLAIN_ROW_NUM_RE = re.compile(rb'<row r="(\d+)"')
+_MISSING_REF_RE = re.compile(rb'<(?:[\w.-]+:)?(?:c|row)(?=[\s/>])(?![^>]*?\sr=")')
+
+
+def column_index(letters):
+    """Μετατρέπει γράμματα στήλης (π.χ. 'F') σε αριθμό στήλης (π.χ. 6)."""
+    index = 0
+    for ch in letters:
+        index = index * 26 + (ord(ch) - 64)
+    return index
+
+
+_COLUMN_INDEX_CACHE = {}
+
+
+def _column_index_bytes(letters):
+    index = _COLUMN_INDEX_CACHE.get(letters)
+    if index is None:
+        index = _COLUMN_INDEX_CACHE[letters] = column_index(letters.decode('ascii'))
+    return index
+
+
+def column_letters(index):
+    """Μετατρέπει αριθμό στήλης (π.χ. 6) σε γράμματα στήλης (π.χ. 'F')."""
+    letters = ''
+    while index > 0:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+class ColumnScanUnsupported(Exception):
+    """Το φύλλο δεν μπορεί να διαβαστεί ανά στήλη (π.χ. κελιά χωρίς αναφορά r=...)."""
+
+
+class ColumnBlock:
+    """
+    Οι τιμές κάποιων στηλών για ένα διάστημα γραμμών ενός φύλλου, ως πίνακες NumPy
+    με μία θέση ανά γραμμή (θέση 0 = first_row).
+
+    kinds[col]: KIND_EMPTY / KIND_NUMBER / KIND_BOOL / KIND_TEXT
+    numbers[col]: η αριθμητική τιμή (1/0 για λογικές τιμές, NaN για κείμενο/κενό)
+    codes[col]: ο κωδικός του text_classifier για τα κελιά κειμένου
+    """
+
+    def __init__(self, first_row, size, last_row, columns, shared_strings):
+        self.first_row = first_row
+        self.last_row = last_row
+        self.kinds = {col: np.zeros(size, np.int8) for col in columns}
+        self.numbers = {col: np.full(size, np.nan) for col in columns}
+        self.codes = {col: np.zeros(size, np.uint8) for col in columns}
+        self._sst_index = {col: np.full(size, -1, np.int64) for col in columns}
+        self._texts = {col: {} for col in columns}
+        self._shared_strings = shared_strings
+
+    def value(self, col, row):
+        """Η τιμή ενός κελιού, ίδια με αυτή που δίνει το iter_rows."""
+        pos = row - self.first_row
+        kind = self.kinds[col][pos]
+        if kind == KIND_NUMBER:
+            return float(self.numbers[col][pos])
+        if kind == KIND_BOOL:
+            return bool(self.numbers[col][pos])
+        if kind == KIND_TEXT:
+            index = self._sst_index[col][pos]
+            return self._shared_strings[int(index)] if index >= 0 else self._texts[col][pos]
+        return self._texts[col].get(pos)
+
+    def values(self, col, rows):
+        """Οι τιμές μιας στήλης για πίνακα γραμμών, ίδιες με την value (οι αριθμοί μαζικά)."""
+        positions = rows - self.first_row
+        result = self.numbers[col][positions].tolist()
+        for i in np.nonzero(self.kinds[col][positions] != KIND_NUMBER)[0].tolist():
+            result[i] = self.value(col, int(rows[i]))
+        return result
+
+
+def _iter_sheet_data_blocks(stream, block_size=_BLOCK_SIZE):
+    """Διαβάζει σταδιακά το περιεχόμενο του <sheetData> σε τμήματα που τελειώνουν σε όριο γραμμής."""
+    buffer = stream.read(block_size)
+    while True:
+        open_match = _SHEET_DATA_OPEN_RE.search(buffer)
+        if open_match:
+            break
+        block = stream.read(block_size)
+        if not block:
+            return
+        buffer += block
+    if open_match.group(2):
+        return
+
+    prefix = open_match.group(1) or b''
+    row_close = b'</' + prefix + b'row>'
+    data_close = b'</' + prefix + b'sheetData'
+    buffer = buffer[open_match.end():]
+    while True:
+        end = buffer.find(data_close)
+        if end >= 0:
+            yield buffer[:end]
+            return
+        block = stream.read(block_size)
+        if not block:
+            raise ValueError("Μη έγκυρο XML φύλλου: δεν βρέθηκε το τέλος του <sheetData>.")
+        cut = buffer.rfind(row_close)
+        if cut >= 0:
+            cut += len(row_close)
+            yield buffer[:cut]
+            buffer = buffer[cut:] + block
+        else:
+            buffer += block
+
+
+class RowSplit:
+    """
+    Σχέδιο διάσπασης μιας γραμμής φύλλου, σε συμπαγή μορφή (ένα σχέδιο ανά
+    διασπώμενη γραμμή μένει στη μνήμη μέχρι την αποθήκευση).
+
+    columns: οι στήλες με αριθμητικές τιμές ανά γραμμή εξόδου (tuple).
+    values: οι τιμές, γραμμή προς γραμμή (len(columns) τιμές ανά γραμμή εξόδου).
+            Η πρώτη γραμμή εφαρμόζεται στην αρχική, οι υπόλοιπες στις νέες γραμμές κάτω από αυτή.
+    copy_cols: στήλες που αντιγράφονται (ως τιμές) από την αρχική γραμμή στις νέες.
+    """
+    __slots__ = ('columns', 'values', 'copy_cols')
+
+    def __init__(self, columns, values, copy_cols):
+        self.columns = columns
+        self.values = array('d', values)
+        self.copy_cols = copy_cols
+
+    def __len__(self):
+        return len(self.values) // len(self.columns)
+
+    def part(self, i):
+        """Οι τιμές {στήλη: αριθμός} της i-οστής γραμμής εξόδου."""
+        width = len(self.columns)
+        return dict(zip(self.columns, self.values[i * width:(i + 1) * width]))
+
+    @property
+    def parts(self):
+        return [self.part(i) for i in range(len(self))]
+
+
+class RowMapping:
+    """Αντιστοίχιση αρχικών αριθμών γραμμών στους νέους, μετά την εισαγωγή γραμμών."""
+
+    def __init__(self, extra_rows):
+        self._extra = extra_rows
+        self._rows = sorted(r for r, n in extra_rows.items() if n > 0)
+        self._cumulative = []
+        total = 0
+        for r in self._rows:
+            total += extra_rows[r]
+            self._cumulative.append(total)
+
+    def __bool__(self):
+        return bool(self._rows)
+
+    def new_row(self, row):
+        """Η νέα θέση της γραμμής (οι γραμμές που εισάγονται μπαίνουν κάτω από τη διασπώμενη)."""
+        i = bisect_left(self._rows, row)
+        return row + (self._cumulative[i - 1] if i else 0)
+
+    def last_row(self, row):
+        """Η τελευταία γραμμή του μπλοκ που προκύπτει από την αρχική γραμμή."""
+        return self.new_row(row) + self._extra.get(row, 0)
+
+
+def _split_outside_strings(formula, func):
+    """Εφαρμόζει τη func μόνο στα τμήματα του τύπου που δεν είναι string literals."""
+    parts = formula.split('"')
+    for i in range(0, len(parts), 2):
+        parts[i] = func(parts[i])
+    return '"'.join(parts)
+
+
+def shift_formula(formula, sheet_name, mappings):
+    """
+    Προσαρμόζει τις αναφορές κελιών ενός τύπου μετά από εισαγωγή γραμμών,
+    όπως κάνει το Excel στο EntireRow.Insert.
+
+    Args:
+        formula (str): Ο τύπος (χωρίς το αρχικό '=')
+        sheet_name (str): Το φύλλο στο οποίο ανήκει ο τύπος (None για καθολικά ονόματα)
+        mappings (dict): {όνομα φύλλου: RowMapping}
+    """
+    if not formula or not any(mappings.values()):
+        return formula
+
+    def shift_ref(match):
+        sheet = match.group('sheet')
+        target = sheet_name
+        if sheet:
+            target = sheet[:-1]
+            if target.startswith("'"):
+                target = target[1:-1].replace("''", "'")
+        mapping = mappings.get(target)
+        if not mapping:
+            return match.group(0)
+        prefix = sheet or ''
+        if match.group('row') is not None:
+            ref = f"{prefix}{match.group('col')}{match.group('rabs')}{mapping.new_row(int(match.group('row')))}"
+            if match.group('row2') is not None:
+                ref += f":{match.group('col2')}{match.group('rabs2')}{mapping.new_row(int(match.group('row2')))}"
+            return ref
+        return (f"{prefix}{match.group('r1abs')}{mapping.new_row(int(match.group('r1')))}"
+                f":{match.group('r2abs')}{mapping.new_row(int(match.group('r2')))}")
+
+    return _split_outside_strings(formula, lambda text: _REF_RE.sub(shift_ref, text))
+
+
+def translate_formula(formula, row_offset, col_offset):
+    """Μετακινεί τις σχετικές αναφορές ενός τύπου (για την ανάπτυξη shared formulas)."""
+    if not formula or not (row_offset or col_offset):
+        return formula
+
+    def translate_cell(col, row_abs, row):
+        if not col.startswith('$'):
+            col = column_letters(column_index(col) + col_offset)
+        row = int(row)
+        if not row_abs:
+            row += row_offset
+        return f"{col}{row_abs}{row}"
+
+    def translate_ref(match):
+        prefix = match.group('sheet') or ''
+        if match.group('row') is not None:
+            ref = prefix + translate_cell(match.group('col'), match.group('rabs'), match.group('row'))
+            if match.group('row2') is not None:
+                ref += ':' + translate_cell(match.group('col2'), match.group('rabs2'), match.group('row2'))
+            return ref
+        r1 = int(match.group('r1')) + (0 if match.group('r1abs') else row_offset)
+        r2 = int(match.group('r2')) + (0 if match.group('r2abs') else row_offset)
+        return f"{prefix}{match.group('r1abs')}{r1}:{match.group('r2abs')}{r2}"
+
+    return _split_outside_strings(formula, lambda text: _REF_RE.sub(translate_ref, text))
+
+
+def _format_number(value):
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape_text(text):
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('\r', '&#13;')
+
+
+def _escape_attr(text):
+    return (_escape_text(text).replace('"', '&quot;')
+            .replace('\n', '&#10;').replace('\t', '&#9;'))
+
+
+def _rich_text(elem):
+    """Κείμενο ενός <si> ή <is> (απλό ή rich text, χωρίς phonetic runs)."""
+    if elem is None:
+        return None
+    pieces = []
+    for child in elem:
+        if child.tag == _TAG_T:
+            pieces.append(child.text or '')
+        elif child.tag == _TAG_R:
+            t = child.find(_TAG_T)
+            if t is not None:
+                pieces.append(t.text or '')
+    return ''.join(pieces)
+
+
+def _renumber_row(data, row_num):
+    """Αλλάζει τον αριθμό γραμμής σε όλες τις αναφορές r="..." μιας γραμμής (σε bytes)."""
+    suffix = b'%d"' % row_num
+    return _ROW_REFS_RE.sub(lambda m: m.group(1) + suffix, data)
+
+
+def _split_sheet(stream, block_size=_BLOCK_SIZE):
+    """
+    Διαβάζει σταδιακά το XML ενός φύλλου και επιστρέφει τα τμήματά του ως bytes:
+    ('head', ...) μέχρι το <sheetData>, ('open', ...) την ετικέτα του, ('row', ...) για κάθε
+    γραμμή, ('close', ...) την ετικέτα κλεισίματος και ('tail', ...) το υπόλοιπο έγγραφο.
+    """
+    buffer = stream.read(block_size)
+    while True:
+        open_match = _SHEET_DATA_OPEN_RE.search(buffer)
+        if open_match:
+            break
+        block = stream.read(block_size)
+        if not block:
+            yield 'head', buffer
+            return
+        buffer += block
+
+    yield 'head', buffer[:open_match.start()]
+    yield 'open', open_match.group(0)
+    if open_match.group(2):
+        yield 'tail', buffer[open_match.end():] + stream.read()
+        return
+
+    prefix = open_match.group(1) or b''
+    row_close = b'</' + prefix + b'row>'
+    data_close = b'</' + prefix + b'sheetData'
+    buffer = buffer[open_match.end():]
+    pos = 0
+    eof = False
+    while True:
+        lt = buffer.find(b'<', pos)
+        gt = buffer.find(b'>', lt) if lt >= 0 else -1
+        end = -1
+        if gt >= 0:
+            if buffer.startswith(data_close, lt):
+                yield 'close', buffer[lt:gt + 1]
+                yield 'tail', buffer[gt + 1:] + stream.read()
+                return
+            if buffer.startswith(b'<!--', lt):
+                end = buffer.find(b'-->', lt)
+                if end >= 0:
+                    pos = end + 3
+                    continue
+            elif buffer[gt - 1:gt] == b'/':
+                end = gt + 1
+            else:
+                end = buffer.find(row_close, gt)
+                if end >= 0:
+                    end += len(row_close)
+        if end >= 0:
+            yield 'row', buffer[lt:end]
+            pos = end
+            continue
+        if eof:
+            raise ValueError("Μη έγκυρο XML φύλλου: δεν βρέθηκε το τέλος του <sheetData>.")
+        block = stream.read(block_size)
+        eof = not block
+        buffer = buffer[pos:] + block
+        pos = 0
+
+
+class _XmlWriter:
+    """Σειριοποίηση στοιχείων XML διατηρώντας τα αρχικά prefixes των namespaces."""
+
+    def __init__(self, root_open):
+        self._prefixes = {_NS_XML: 'xml'}
+        for prefix, uri in _XMLNS_RE.findall(root_open):
+            self._prefixes.setdefault(uri.decode('utf-8'), (prefix or b'').decode('utf-8'))
+        self._root_uris = set(self._prefixes)
+
+    def _qname(self, name, used):
+        if name[0] != '{':
+            return name
+        uri, local = name[1:].split('}', 1)
+        prefix = self._prefixes.get(uri)
+        if prefix is None:
+            prefix = f'ns{len(self._prefixes)}'
+            self._prefixes[uri] = prefix
+        if uri not in self._root_uris:
+            used.add(uri)
+        return f'{prefix}:{local}' if prefix else local
+
+    def _write(self, elem, out, used):
+        tag = self._qname(elem.tag, used)
+        out.append('<' + tag)
+        for key, value in elem.attrib.items():
+            out.append(f' {self._qname(key, used)}="{_escape_attr(value)}"')
+        if len(elem) == 0 and not elem.text:
+            out.append('/>')
+        else:
+            out.append('>')
+            if elem.text:
+                out.append(_escape_text(elem.text))
+            for child in elem:
+                self._write(child, out, used)
+                if child.tail:
+                    out.append(_escape_text(child.tail))
+            out.append(f'</{tag}>')
+
+    def tostring(self, elem):
+        out = []
+        used = set()
+        self._write(elem, out, used)
+        if used:
+            declarations = ''.join(
+                f' xmlns:{self._prefixes[uri]}="{_escape_attr(uri)}"' if self._prefixes[uri]
+                else f' xmlns="{_escape_attr(uri)}"'
+                for uri in sorted(used)
+            )
+            head = out[0]
+            out[0] = head + declarations
+        return ''.join(out)
+
+
+class _SharedStrings:
+    """
+    Ο πίνακας κοινόχρηστων strings (sharedStrings.xml) σε συμπαγή μορφή: ένα buffer
+    UTF-8 και οι θέσεις κάθε string, αντί για ένα αντικείμενο str ανά εγγραφή.
+    Τα strings αποκωδικοποιούνται μόνο όταν ζητηθούν.
+    """
+    __slots__ = ('_data', '_offsets')
+
+    def __init__(self, stream=None):
+        data = bytearray()
+        offsets = array('Q', [0])
+        if stream is not None:
+            root = None
+            for event, elem in ET.iterparse(stream, events=('start', 'end')):
+                if root is None:
+                    root = elem
+                elif event == 'end' and elem.tag == _TAG_SI:
+                    data += _rich_text(elem).encode('utf-8')
+                    offsets.append(len(data))
+                    root.clear()
+        self._data = bytes(data)
+        self._offsets = offsets
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        if not 0 <= index < len(self._offsets) - 1:
+            raise IndexError(index)
+        return self._data[self._offsets[index]:self._offsets[index + 1]].decode('utf-8')
+
+
+class OoxmlSheet:
+    """Ένα φύλλο εργασίας του βιβλίου (όνομα και διαδρομή του XML part στο πακέτο)."""
+    __slots__ = ('name', 'part')
+
+    def __init__(self, name, part):
+        self.name = name
+        self.part = part
+
+
+class OoxmlWorkbook:
+    """
+    Ανάγνωση και εγγραφή βιβλίων .xlsx/.xlsm απευθείας από το πακέτο ZIP/XML,
+    χωρίς Microsoft Excel.
+
+    Η εγγραφή (save_as) εισάγει γραμμές όπως το EntireRow.Insert του Excel: προσαρμόζει
+    τις αναφορές σε τύπους, συγχωνευμένα κελιά, μορφοποίηση υπό όρους, επικυρώσεις,
+    υπερσυνδέσμους, πίνακες και ορισμένα ονόματα, και ζητά επανυπολογισμό στο άνοιγμα.
+    Αναφορές μέσα σε γραφήματα και συγκεντρωτικούς πίνακες δεν προσαρμόζονται.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._zip = zipfile.ZipFile(path)
+        self._names = set(self._zip.namelist())
+        self._shared_strings = None
+        self._read_workbook()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+
+    @staticmethod
+    def _rels_path(part):
+        directory, name = posixpath.split(part)
+        return posixpath.join(directory, '_rels', name + '.rels')
+
+    def _read_rels(self, part):
+        """Επιστρέφει {Id: (Type, απόλυτη διαδρομή στόχου)} για τα relationships ενός part."""
+        rels_path = self._rels_path(part)
+        rels = {}
+        if rels_path not in self._names:
+            return rels
+        base_dir = posixpath.dirname(part)
+        root = ET.fromstring(self._zip.read(rels_path))
+        for rel in root.iter(_TAG_REL):
+            if rel.get('TargetMode') == 'External':
+                continue
+            target = rel.get('Target', '')
+            if target.startswith('/'):
+                target = target[1:]
+            else:
+                target = posixpath.normpath(posixpath.join(base_dir, target))
+            rels[rel.get('Id')] = (rel.get('Type', ''), target)
+        return rels
+
+    def _read_workbook(self):
+        package_rels = self._read_rels('')
+        self.workbook_part = next(
+            (target for rel_type, target in package_rels.values() if rel_type.endswith(_REL_OFFICE_DOCUMENT)),
+            'xl/workbook.xml'
+        )
+        self._workbook_rels = self._read_rels(self.workbook_part)
+        self._shared_strings_part = None
+        self._calc_chain_part = None
+        for rel_type, target in self._workbook_rels.values():
+            if rel_type.endswith(_REL_SHARED_STRINGS):
+                self._shared_strings_part = target
+            elif rel_type.endswith(_REL_CALC_CHAIN):
+                self._calc_chain_part = target
+
+        root = ET.fromstring(self._zip.read(self.workbook_part))
+        self.sheets = []
+        for sheet in root.iter(_TAG_SHEET):
+            rel = self._workbook_rels.get(sheet.get(_ATTR_REL_ID))
+            if rel is None or not rel[0].endswith(_REL_WORKSHEET) or rel[1] not in self._names:
+                continue
+            self.sheets.append(OoxmlSheet(sheet.get('name'), rel[1]))
+
+    @property
+    def shared_strings(self):
+        if self._shared_strings is None:
+            if self._shared_strings_part and self._shared_strings_part in self._names:
+                with self._zip.open(self._shared_strings_part) as stream:
+                    self._shared_strings = _SharedStrings(stream)
+            else:
+                self._shared_strings = _SharedStrings()
+        return self._shared_strings
+
+    @staticmethod
+    def _chunk_cell_value(cell_type, inner, shared_strings):
+        """Η τιμή ενός κελιού όπως θα την επέστρεφε το Range.Value (αριθμοί ως float)."""
+        if not inner:
+            return None
+        if cell_type == b'inlineStr':
+            return html.unescape(b''.join(_T_RE.findall(inner)).decode('utf-8'))
+        v = _V_RE.search(inner)
+        if v is None:
+            return None
+        text = v.group(1)
+        if not cell_type or cell_type == b'n':
+            return float(text)
+        if cell_type == b's':
+            return shared_strings[int(text)]
+        if cell_type == b'b':
+            return text == b'1'
+        return html.unescape(text.decode('utf-8'))
+
+    def iter_rows(self, sheet, columns=None, row_filter=None):
+        """
+        Διαβάζει σταδιακά τις γραμμές ενός φύλλου. Η μνήμη που χρησιμοποιείται δεν
+        εξαρτάται από το πλήθος των γραμμών: το XML διαβάζεται σε τμήματα και κάθε
+        γραμμή απορρίπτεται μόλις ελεγχθεί.
+
+        Args:
+            sheet (OoxmlSheet): Το φύλλο
+            columns (set): Οι στήλες που ενδιαφέρουν (None για όλες)
+            row_filter (callable): row_filter(αριθμός γραμμής, {στήλη: τιμή}) -> bool.
+                Καλείται για κάθε γραμμή καθώς διαβάζεται· επιστρέφονται μόνο όσες περνούν.
+
+        Yields:
+            tuple: (αριθμός γραμμής, {στήλη: τιμή})
+        """
+        shared_strings = self.shared_strings
+        cell_value = self._chunk_cell_value
+        row_num = 0
+        with self._zip.open(sheet.part) as stream:
+            for kind, chunk in _split_sheet(stream):
+                if kind != 'row':
+                    continue
+                start_end = chunk.find(b'>') + 1
+                num_match = _ROW_NUM_RE.search(chunk, 0, start_end)
+                row_num = int(num_match.group(1)) if num_match else row_num + 1
+                cells = {}
+                col = 0
+                for letters, cell_type, attrs, inner in _CELL_RE.findall(chunk, start_end):
+                    col = _column_index_bytes(letters) if letters else col + 1
+                    if columns is None or col in columns:
+                        cells[col] = cell_value(cell_type, inner, shared_strings)
+                if row_filter is None or row_filter(row_num, cells):
+                    yield row_num, cells
+
+    @staticmethod
+    def _column_cell_re(columns, plain=False):
+        """
+        Regex για τα κελιά συγκεκριμένων στηλών: (στήλη, γραμμή, t, <v>, κείμενο v, υπόλοιπο).
+        Με plain=True η regex δέχεται μόνο κελιά χωρίς πρόθεμα namespace και με το r="..."
+        ως πρώτο χαρακτηριστικό (η μορφή που γράφει το Excel), και είναι αρκετά πιο γρήγορη.
+        """
+        letters = b'|'.join(column_letters(col).encode('ascii') for col in sorted(columns))
+        if plain:
+            return re.compile(
+                rb'<c r="(' + letters + rb')(\d+)"(?=[^>]*?\st="(\w+)")?[^>]*?'
+                rb'(?:/>|>(?:<f\b[^>]*?(?:/>|>[^<]*</f>))?(<v>([^<]*)</v>)?(.*?)</c>)', re.S
+            )
+        return re.compile(
+            rb'<(?:[\w.-]+:)?c\b(?=[^>]*?\sr="(' + letters + rb')(\d+)")(?=[^>]*?\st="(\w+)")?[^>]*?'
+            rb'(?:/>|>(?:<(?:[\w.-]+:)?f\b[^>]*?(?:/>|>[^<]*</(?:[\w.-]+:)?f>))?'
+            rb'(<(?:[\w.-]+:)?v>([^<]*)</(?:[\w.-]+:)?v>)?(.*?)</(?:[\w.-]+:)?c>)', re.S
+        )
+
+    @staticmethod
+    def _is_plain_block(data):
+        """True αν όλα τα <row>/<c> του τμήματος είναι χωρίς πρόθεμα και ξεκινούν με r="..."."""
+        rows = data.count(b'<row r="')
+        return rows > 0 and rows == data.count(b'<row') and data.count(b'<c r="') == data.count(b'<c')
+
+    def iter_column_blocks(self, sheet, columns, text_classifier):
+        """
+        Διαβάζει σταδιακά συγκεκριμένες στήλες ενός φύλλου σε πίνακες NumPy (ColumnBlock),
+        ένα τμήμα περίπου _BLOCK_SIZE bytes κάθε φορά. Οι αριθμοί μετατρέπονται μαζικά και
+        κάθε κοινόχρηστο string ταξινομείται μία φορά με τον text_classifier(str) -> int (0-254).
+
+        Raises:
+            ColumnScanUnsupported: αν το φύλλο έχει γραμμές/κελιά χωρίς αναφορά r=...
+        """
+        if np is None:
+            raise ColumnScanUnsupported("Η ανάγνωση ανά στήλη απαιτεί NumPy.")
+        columns = sorted(set(columns))
+        pattern = self._column_cell_re(columns)
+        plain_pattern = self._column_cell_re(columns, plain=True)
+        column_keys = {column_letters(col).encode('ascii'): col for col in columns}
+        shared_strings = self.shared_strings
+        sst_codes = np.full(len(shared_strings), 255, np.uint8)
+        cell_value = self._chunk_cell_value
+
+        with self._zip.open(sheet.part) as stream:
+            for data in _iter_sheet_data_blocks(stream):
+                if self._is_plain_block(data):
+                    row_nums = _PLAIN_ROW_NUM_RE.findall(data)
+                    matches = plain_pattern.findall(data)
+                else:
+                    if _MISSING_REF_RE.search(data):
+                        raise ColumnScanUnsupported(f"Το φύλλο '{sheet.name}' έχει κελιά χωρίς αναφορά.")
+                    row_nums = _ROW_OPEN_NUM_RE.findall(data)
+                    matches = pattern.findall(data)
+                if not row_nums:
+                    continue
+                row_nums = np.array(row_nums).astype(np.int64)
+                first_row = int(row_nums.min())
+                last_row = int(row_nums.max())
+                block = ColumnBlock(first_row, last_row - first_row + 1, last_row, columns, shared_strings)
+                if not matches:
+                    yield block
+                    continue
+                letters, rows, types, v_elems, v_texts, rests = map(np.array, zip(*matches))
+                positions = rows.astype(np.int64) - first_row
+                has_v = v_elems != b''
+                for key, col in column_keys.items():
+                    in_col = letters == key
+                    if not in_col.any():
+                        continue
+                    kinds, numbers, codes = block.kinds[col], block.numbers[col], block.codes[col]
+
+                    numeric = in_col & has_v & ((types == b'') | (types == b'n'))
+                    numbers[positions[numeric]] = v_texts[numeric].astype(np.float64)
+                    kinds[positions[numeric]] = KIND_NUMBER
+
+                    boolean = in_col & has_v & (types == b'b')
+                    numbers[positions[boolean]] = v_texts[boolean] == b'1'
+                    kinds[positions[boolean]] = KIND_BOOL
+
+                    shared = in_col & has_v & (types == b's')
+                    if shared.any():
+                        indexes = v_texts[shared].astype(np.int64)
+                        unique = np.unique(indexes)
+                        todo = unique[sst_codes[unique] == 255]
+                        sst_codes[todo] = [text_classifier(shared_strings[index]) for index in todo.tolist()]
+                        codes[positions[shared]] = sst_codes[indexes]
+                        kinds[positions[shared]] = KIND_TEXT
+                        block._sst_index[col][positions[shared]] = indexes
+
+                    # Σπάνιες περιπτώσεις (inline strings, τύποι με κείμενο, σφάλματα): ανά κελί.
+                    other = in_col & ~numeric & ~boolean & ~shared & ((types != b'') | (rests != b''))
+                    for i in np.nonzero(other)[0]:
+                        inner = v_elems[i] + rests[i]
+                        value = cell_value(types[i], inner, shared_strings)
+                        pos = positions[i]
+                        block._texts[col][pos] = value
+                        if value is not None:
+                            kinds[pos] = KIND_TEXT
+                            codes[pos] = text_classifier(value)
+                yield block
+
+    def save_as(self, output_path, plans, progress=None):
+        """
+        Αποθηκεύει το βιβλίο σε νέο αρχείο εφαρμόζοντας τα σχέδια διάσπασης.
+
+        Args:
+            output_path (str): Το αρχείο εξόδου
+            plans (dict): {όνομα φύλλου: {αριθμός γραμμής: RowSplit}}
+            progress (callable): progress(όνομα φύλλου, αριθμός γραμμής) κάθε 1024 γραμμές της εγγραφής
+        """
+        mappings = {
+            name: RowMapping({row: len(split) - 1 for row, split in plan.items()})
+            for name, plan in plans.items()
+        }
+        if not any(mappings.values()):
+            shutil.copyfile(self.path, output_path)
+            return
+
+        sheets_by_part = {sheet.part: sheet for sheet in self.sheets}
+        table_parts = {}
+        for sheet in self.sheets:
+            for rel_type, target in self._read_rels(sheet.part).values():
+                if rel_type.endswith(_REL_TABLE):
+                    table_parts[target] = sheet.name
+        workbook_rels_part = self._rels_path(self.workbook_part)
+
+        with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zout:
+            for info in self._zip.infolist():
+                name = info.filename
+                if name == self._calc_chain_part:
+                    continue
+                out_info = zipfile.ZipInfo(name, date_time=info.date_time)
+                out_info.compress_type = zipfile.ZIP_DEFLATED
+                out_info.external_attr = info.external_attr
+                if name in sheets_by_part:
+                    sheet = sheets_by_part[name]
+                    with io.BufferedWriter(zout.open(out_info, 'w', force_zip64=True), _BLOCK_SIZE) as out:
+                        self._write_sheet(out, sheet, plans.get(sheet.name, {}), mappings, progress)
+                elif name == self.workbook_part:
+                    zout.writestr(out_info, self._rewrite_workbook(self._zip.read(name), mappings))
+                elif name == workbook_rels_part and self._calc_chain_part:
+                    zout.writestr(out_info, self._drop_calc_chain(self._zip.read(name), 'Relationship', 'Target'))
+                elif name == '[Content_Types].xml' and self._calc_chain_part:
+                    zout.writestr(out_info, self._drop_calc_chain(self._zip.read(name), 'Override', 'PartName'))
+                elif name in table_parts:
+                    text = self._zip.read(name).decode('utf-8')
+                    text = _REF_ATTR_RE.sub(lambda m: m.group(1) + shift_formula(m.group(2), table_parts[name], mappings) + m.group(3), text)
+                    zout.writestr(out_info, text.encode('utf-8'))
+                else:
+                    with self._zip.open(info) as src, zout.open(out_info, 'w', force_zip64=True) as dst:
+                        shutil.copyfileobj(src, dst, 1024 * 1024)
+
+    def _drop_calc_chain(self, data, element, attribute):
+        """Αφαιρεί την αναφορά στο calcChain (οι θέσεις των τύπων αλλάζουν)."""
+        calc_chain_name = posixpath.basename(self._calc_chain_part)
+        pattern = re.compile(r'<(?:[\w.-]+:)?' + element + r'\b[^>]*\b' + attribute + r'="[^"]*' + re.escape(calc_chain_name) + r'"[^>]*/>')
+        return pattern.sub('', data.decode('utf-8')).encode('utf-8')
+
+    def _rewrite_workbook(self, data, mappings):
+        text = data.decode('utf-8')
+        text = _DEFINED_NAME_RE.sub(lambda m: m.group(1) + shift_formula(m.group(2), None, mappings) + m.group(3), text)
+
+        def full_calc(match):
+            attrs = match.group(2)
+            if 'fullCalcOnLoad=' in attrs:
+                attrs = re.sub(r'fullCalcOnLoad="[^"]*"', 'fullCalcOnLoad="1"', attrs)
+            else:
+                attrs += ' fullCalcOnLoad="1"'
+            return f'<{match.group(1)}{attrs}{match.group(3)}>'
+        text = _CALC_PR_RE.sub(full_calc, text, count=1)
+        return text.encode('utf-8')
+
+    def _shift_sheet_xml(self, data, sheet_name, mappings):
+        text = data.decode('utf-8')
+        text = _REF_ATTR_RE.sub(lambda m: m.group(1) + shift_formula(m.group(2), sheet_name, mappings) + m.group(3), text)
+        text = _FORMULA_ELEM_RE.sub(lambda m: m.group(1) + shift_formula(m.group(2), sheet_name, mappings) + m.group(3), text)
+        return text.encode('utf-8')
+
+    def _write_sheet(self, out, sheet, plan, mappings, progress=None):
+        mapping = mappings.get(sheet.name) or RowMapping({})
+        root_open = root_close = b''
+        writer = None
+        shared = {}
+        row_num = 0
+        with self._zip.open(sheet.part) as stream:
+            for kind, chunk in _split_sheet(stream):
+                if kind == 'head':
+                    root_match = _ROOT_OPEN_RE.search(chunk)
+                    if root_match:
+                        root_open = root_match.group(0)
+                        root_close = b'</' + (root_match.group(1) or b'') + b'worksheet>'
+                    if mapping:
+                        chunk = _DIMENSION_RE.sub(lambda m: self._shift_dimension(m, mapping), chunk, count=1)
+                    out.write(chunk)
+                elif kind == 'tail':
+                    out.write(self._shift_sheet_xml(chunk, sheet.name, mappings))
+                elif kind != 'row':
+                    out.write(chunk)
+                else:
+                    start_tag = chunk[:chunk.find(b'>') + 1]
+                    num_match = _ROW_NUM_RE.search(start_tag)
+                    row_num = int(num_match.group(1)) if num_match else row_num + 1
+                    if progress is not None and not row_num & 1023: progress(sheet.name, row_num)
+                    split = plan.get(row_num)
+                    if num_match and b'is>' not in chunk and not _FORMULA_TAG_RE.search(chunk):
+                        new_num = mapping.new_row(row_num)
+                        if split is None:
+                            if new_num != row_num:
+                                chunk = _renumber_row(chunk, new_num)
+                            out.write(chunk)
+                            continue
+                        split_chunk = self._split_row_bytes(chunk, start_tag, new_num, split)
+                        if split_chunk is not None:
+                            out.write(split_chunk)
+                            continue
+                    if writer is None:
+                        writer = _XmlWriter(root_open)
+                    row = ET.fromstring(root_open + chunk + root_close)[0]
+                    rows = self._rewrite_row(row, row_num, sheet.name, mapping, mappings, split, shared)
+                    out.write(''.join(writer.tostring(r) for r in rows).encode('utf-8'))
+
+    @staticmethod
+    def _split_row_bytes(chunk, start_tag, new_num, split):
+        """
+        Διάσπαση γραμμής απευθείας στα bytes του XML, για γραμμές χωρίς τύπους και inline strings.
+        Επιστρέφει None αν η γραμμή χρειάζεται πλήρη ανάλυση XML.
+        """
+        if start_tag.endswith(b'/>') or b'extLst' in chunk:
+            return None
+        prefix = (_ROW_PREFIX_RE.match(start_tag).group(1) or b'').decode('ascii')
+        cells = {}
+        for match in _CELL_RE.finditer(chunk, len(start_tag)):
+            if not match.group(1):
+                return None
+            cells[_column_index_bytes(match.group(1))] = match
+        row_close = f'</{prefix}row>'.encode('ascii')
+
+        def number_cell(col, num, number):
+            style = b''
+            original = cells.get(col)
+            if original is not None:
+                style_match = _CELL_ATTR_S_RE.search(original.group(3))
+                if style_match:
+                    style = b' s="' + style_match.group(1) + b'"'
+            return (f'<{prefix}c r="{column_letters(col)}{num}"'.encode('ascii') + style +
+                    f'><{prefix}v>{_format_number(number)}</{prefix}v></{prefix}c>'.encode('ascii'))
+
+        out = []
+        for i in range(len(split)):
+            part = split.part(i)
+            num = new_num + i
+            out.append(_renumber_row(start_tag, num))
+            for col in sorted(cells.keys() | part.keys()):
+                if col in part:
+                    out.append(number_cell(col, num, part[col]))
+                elif i == 0 or col in split.copy_cols:
+                    out.append(_renumber_row(cells[col].group(0), num))
+                else:
+                    style_match = _CELL_ATTR_S_RE.search(cells[col].group(3))
+                    if style_match:
+                        out.append(f'<{prefix}c r="{column_letters(col)}{num}"'.encode('ascii') +
+                                   b' s="' + style_match.group(1) + b'"/>')
+            out.append(row_close)
+        return b''.join(out)
+
+    @staticmethod
+    def _shift_dimension(match, mapping):
+        ref = match.group(2).decode('ascii')
+        start, _, end = ref.partition(':')
+        end = end or start
+        end_match = _CELL_REF_RE.match(end)
+        if end_match:
+            end = f'{end_match.group(1)}{mapping.last_row(int(end_match.group(2)))}'
+        return match.group(1) + f'{start}:{end}'.encode('ascii') + match.group(3)
+
+    def _shift_cell_formula(self, cell, row_num, col, sheet_name, mappings, shared):
+        f = cell.find(_TAG_F)
+        if f is None:
+            return
+        if f.get('t') == 'shared':
+            si = f.get('si')
+            if f.text:
+                shared[si] = (row_num, col, f.text)
+                text = f.text
+            elif si in shared:
+                master_row, master_col, master_text = shared[si]
+                text = translate_formula(master_text, row_num - master_row, col - master_col)
+            else:
+                return
+            for attr in ('t', 'ref', 'si'):
+                f.attrib.pop(attr, None)
+            f.text = shift_formula(text, sheet_name, mappings)
+            return
+        if f.text:
+            f.text = shift_formula(f.text, sheet_name, mappings)
+        if f.get('ref'):
+            f.set('ref', shift_formula(f.get('ref'), sheet_name, mappings))
+
+    @staticmethod
+    def _number_cell(ref, number, template=None):
+        cell = ET.Element(_TAG_C, {'r': ref})
+        if template is not None and template.get('s'):
+            cell.set('s', template.get('s'))
+        v = ET.SubElement(cell, _TAG_V)
+        v.text = _format_number(number)
+        return cell
+
+    @staticmethod
+    def _value_copy(cell, ref):
+        """Αντίγραφο κελιού ως τιμή (χωρίς τύπο), όπως μια ανάθεση Range.Value."""
+        new_cell = ET.Element(_TAG_C, {'r': ref})
+        new_cell.attrib.update((k, v) for k, v in cell.attrib.items() if k not in ('r', 'cm'))
+        cell_type = cell.get('t')
+        v = cell.find(_TAG_V)
+        inline = cell.find(_TAG_IS)
+        if cell_type == 'str':
+            new_cell.set('t', 'inlineStr')
+            is_elem = ET.SubElement(new_cell, _TAG_IS)
+            t = ET.SubElement(is_elem, _TAG_T)
+            t.text = v.text if v is not None and v.text else ''
+            if t.text != t.text.strip():
+                t.set(_ATTR_XML_SPACE, 'preserve')
+        elif inline is not None:
+            new_cell.append(copy.deepcopy(inline))
+        elif v is not None:
+            ET.SubElement(new_cell, _TAG_V).text = v.text
+        else:
+            new_cell.attrib.pop('t', None)
+        return new_cell
+
+    def _rewrite_row(self, row, row_num, sheet_name, mapping, mappings, split, shared):
+        """Επιστρέφει τις γραμμές εξόδου για μια αρχική γραμμή (την ίδια και τις νέες της διάσπασης)."""
+        new_num = mapping.new_row(row_num)
+        cells = {}
+        others = []
+        col = 0
+        for child in list(row):
+            if child.tag != _TAG_C:
+                others.append(child)
+                continue
+            ref = child.get('r')
+            col = column_index(_CELL_REF_RE.match(ref).group(1)) if ref else col + 1
+            self._shift_cell_formula(child, row_num, col, sheet_name, mappings, shared)
+            child.set('r', f'{column_letters(col)}{new_num}')
+            cells[col] = child
+        row.set('r', str(new_num))
+        if split is None:
+            return [row]
+
+        originals = dict(cells)
+        for col, number in split.part(0).items():
+            cells[col] = self._number_cell(f'{column_letters(col)}{new_num}', number, originals.get(col))
+        row[:] = [cells[c] for c in sorted(cells)] + others
+
+        output_rows = [row]
+        for i in range(1, len(split)):
+            part = split.part(i)
+            part_num = new_num + i
+            new_row = ET.Element(_TAG_ROW, dict(row.attrib))
+            new_row.set('r', str(part_num))
+            new_cells = {}
+            for col, cell in originals.items():
+                ref = f'{column_letters(col)}{part_num}'
+                if col in split.copy_cols:
+                    new_cells[col] = self._value_copy(cell, ref)
+                elif cell.get('s'):
+                    new_cells[col] = ET.Element(_TAG_C, {'r': ref, 's': cell.get('s')})
+            for col, number in part.items():
+                new_cells[col] = self._number_cell(f'{column_letters(col)}{part_num}', number, originals.get(col))
+            new_row.extend(new_cells[c] for c in sorted(new_cells))
+            output_rows.append(new_row)
+        return output_rows
@@ -0,0 +1,143 @@
+import os
+import queue
+import logging
+import traceback
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from multiprocessing import util as mp_util
+
+from modules.logger import BaseLogger, LEVEL_NAMES, CATEGORY_UI
+
+# Κατάσταση ανά διεργασία-worker (ορίζεται από το _init_worker).
+_worker = {}
+
+
+class QueueLogger(BaseLogger):
+    """
+    Logger για τις διεργασίες-workers: έχει τις ίδιες μεθόδους με τον Logger της
+    εφαρμογής, αλλά στέλνει τα (ήδη μορφοποιημένα) μηνύματα στη γονική διεργασία μέσω ουράς.
+    """
+
+    def __init__(self, events, debug=False, quiet_hot_path=True):
+        super().__init__(quiet_hot_path)
+        self.events = events
+        self.debug_enabled = debug
+        self.prefix = ''
+
+    def is_enabled(self, level):
+        return level > logging.DEBUG or self.debug_enabled
+
+    def _write(self, level, message, exc_info, category=None):
+        if exc_info:
+            message = f"{message}\n{traceback.format_exc().rstrip()}"
+        self.events.put(('log', LEVEL_NAMES.get(level, 'INFO').lower(), f"{self.prefix}{message}", category))
+
+
+def _init_worker(events, backend, debug, quiet_hot_path=True, report_progress=False, stop_event=None, com_dispatch=None):
+    """
+    Αρχικοποίηση διεργασίας-worker: δικός της ExcelProcessor και (για COM) δικό της pool Excel.
+    Το stop_event (κοινό με τη γονική διεργασία) διακόπτει και τα αρχεία που επεξεργάζονται ήδη.
+    """
+    from modules.excel_processor import ExcelProcessor, BACKEND_COM
+    from modules.excel_pool import ExcelAppPool
+
+    logger = QueueLogger(events, debug, quiet_hot_path)
+    _worker['events'] = events
+    _worker['processor'] = ExcelProcessor(logger, com_dispatch=com_dispatch)
+    _worker['pool'] = None
+    _worker['row_progress'] = (lambda info: events.put(('progress', info))) if report_progress else None
+    _worker['should_stop'] = stop_event.is_set if stop_event is not None else None
+    if backend == BACKEND_COM:
+        pool = ExcelAppPool(logger=logger, dispatch=com_dispatch)
+        _worker['pool'] = pool
+        mp_util.Finalize(pool, pool.shutdown, exitpriority=10)
+
+
+def _run_file(input_file, output_path, file_kwargs, job_kwargs):
+    """Επεξεργάζεται ένα αρχείο μέσα σε διεργασία-worker (job_kwargs: ρυθμίσεις μόνο για αυτό το αρχείο)."""
+    processor = _worker['processor']
+    file_name = os.path.basename(input_file)
+    _worker['events'].put(('file', file_name))
+    processor.logger.prefix = f"[{file_name}] "
+    try:
+        return processor.process_file(input_file, output_path, excel_pool=_worker['pool'], row_progress_callback=_worker['row_progress'],
+                                      should_stop=_worker['should_stop'], **dict(file_kwargs, **job_kwargs))
+    finally:
+        processor.logger.prefix = ''
+
+
+def _drain_events(events, logger, file_callback, row_progress_callback=None):
+    """Προωθεί στη γονική διεργασία τα μηνύματα/συμβάντα των workers."""
+    while True:
+        try:
+            event = events.get_nowait()
+        except queue.Empty:
+            return
+        if event[0] == 'log':
+            if logger: getattr(logger, event[1])(event[2], category=event[3])
+        elif event[0] == 'file':
+            if file_callback: file_callback(event[1])
+        elif event[0] == 'progress':
+            if row_progress_callback: row_progress_callback(event[1])
+
+
+def run_parallel(jobs, file_kwargs, workers, overall_results, merge_results, logger=None, com_dispatch=None,
+                 progress_callback=None, file_callback=None, should_stop=None, row_progress_callback=None):
+    """
+    Επεξεργάζεται τα αρχεία παράλληλα σε `workers` διεργασίες.
+
+    Args:
+        jobs (list): Τριάδες (input_path, output_path, ρυθμίσεις που αλλάζουν μόνο για αυτό το αρχείο).
+        file_kwargs (dict): Ρυθμίσεις που περνούν σε κάθε process_file.
+        overall_results (dict): Τα συνολικά αποτελέσματα, ενημερώνονται με merge_results.
+        merge_results (callable): merge_results(overall_results, file_name, results).
+        progress_callback (callable): progress_callback(done, total) μετά από κάθε αρχείο.
+        file_callback (callable): file_callback(file_name) όταν ένας worker ξεκινά αρχείο.
+        should_stop (callable): Αν επιστρέψει True, τα αρχεία που δεν έχουν ξεκινήσει ακυρώνονται
+            και όσα επεξεργάζονται διακόπτονται στο επόμενο σημείο ελέγχου τους.
+        row_progress_callback (callable): row_progress_callback(info) με την πρόοδο μέσα σε κάθε αρχείο (από τους workers).
+        com_dispatch (callable): Factory εφαρμογών Excel για τη μηχανή COM (βλ. ExcelProcessor)· πρέπει να γίνεται pickle.
+    """
+    total = len(jobs)
+    debug = bool(logger and logger.is_enabled(logging.DEBUG))
+    quiet_hot_path = logger.quiet_hot_path if logger else True
+    context = multiprocessing.get_context('spawn')
+    events = context.Queue()
+    stop_event = context.Event()
+    done_count = 0
+    stopping = False
+
+    if logger: logger.info(f"Παράλληλη επεξεργασία με {workers} διεργασίες.")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker,
+                             initargs=(events, file_kwargs.get('backend'), debug, quiet_hot_path, row_progress_callback is not None, stop_event, com_dispatch)) as executor:
+        futures = {executor.submit(_run_file, input_file, output_path, file_kwargs, job_kwargs): os.path.basename(input_file)
+                   for input_file, output_path, job_kwargs in jobs}
+        pending = set(futures)
+        while pending:
+            finished, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            _drain_events(events, logger, file_callback, row_progress_callback)
+            for future in finished:
+                if future.cancelled():
+                    continue
+                file_name = futures[future]
+                try:
+                    results = future.result()
+                except Exception as e:
+                    error_msg = f"Κρίσιμο σφάλμα διαχείρισης {file_name}: {str(e)}"
+                    if logger: logger.error(error_msg)
+                    overall_results['errors'] += 1
+                    overall_results['file_results'][file_name] = {'error': True, 'message': error_msg, 'skipped': False}
+                else:
+                    merge_results(overall_results, file_name, results)
+                done_count += 1
+                if progress_callback: progress_callback(done_count, total)
+            if not stopping and should_stop and should_stop():
+                stopping = True
+                if logger: logger.warning("Η επεξεργασία διακόπηκε από τον χρήστη.", category=CATEGORY_UI)
+                stop_event.set()
+                for future in pending:
+                    future.cancel()
+                pending = {future for future in pending if not future.cancelled()}
+    _drain_events(events, logger, file_callback, row_progress_callback)
+
+    return overall_results
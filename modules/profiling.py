@@ -0,0 +1,72 @@
+import os
+import re
+import pstats
+import cProfile
+from datetime import datetime
+
+from modules.logger import CATEGORY_UI
+
+# Πόσες συναρτήσεις εμφανίζονται στη σύνοψη του log (ταξινομημένες κατά χρόνο μέσα στη συνάρτηση).
+PROFILE_TOP_N = 15
+PROFILE_EXTENSION = '.prof'
+
+
+def profile_dir_for(logger, fallback_dir):
+    """Ο φάκελος των profiles: δίπλα στο αρχείο log του logger, αλλιώς ο fallback_dir."""
+    log_file = logger.get_log_file() if logger else None
+    return os.path.dirname(os.path.abspath(log_file)) if log_file else fallback_dir
+
+
+def profile_path(profile_dir, file_name):
+    """profile_<αρχείο>_<ημερομηνία ώρα>.prof (χωρίς χαρακτήρες που δεν επιτρέπονται σε ονόματα αρχείων)."""
+    safe_name = re.sub(r'[^\w.-]+', '_', os.path.splitext(file_name)[0])
+    return os.path.join(profile_dir, f"profile_{safe_name}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}{PROFILE_EXTENSION}")
+
+
+def hotspot_summary(stats, top_n=PROFILE_TOP_N):
+    """
+    Οι top_n συναρτήσεις με τον περισσότερο χρόνο μέσα τους (tottime), ως γραμμές κειμένου
+    'κλήσεις  χρόνος  αθροιστικός  συνάρτηση (αρχείο:γραμμή)'.
+    """
+    rows = sorted(stats.stats.items(), key=lambda item: -item[1][2])[:top_n]
+    lines = [f"{'κλήσεις':>10} {'tottime':>9} {'cumtime':>9}  συνάρτηση"]
+    for (file_name, line, func), (_, calls, tottime, cumtime, _) in rows:
+        where = f"{os.path.basename(file_name)}:{line}" if line else file_name
+        lines.append(f"{calls:>10} {tottime:>9.3f} {cumtime:>9.3f}  {func} ({where})")
+    return lines
+
+
+class FileProfiler:
+    """
+    Profiler (cProfile) για την επεξεργασία ενός αρχείου: το profile γράφεται στο profile_dir
+    (ανοίγει με pstats, snakeviz κτλ.) και τα hotspots καταγράφονται στο log, και στο UI log
+    (CATEGORY_UI).
+
+        with FileProfiler(profile_dir, 'τιμολόγια.xlsx', logger):
+            ...
+    """
+
+    def __init__(self, profile_dir, file_name, logger=None, top_n=PROFILE_TOP_N):
+        self.profile_dir = profile_dir
+        self.file_name = file_name
+        self.logger = logger
+        self.top_n = top_n
+        self.profiler = cProfile.Profile()
+        self.path = None
+
+    def __enter__(self):
+        self.profiler.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.profiler.disable()
+        try:
+            os.makedirs(self.profile_dir, exist_ok=True)
+            self.path = profile_path(self.profile_dir, self.file_name)
+            self.profiler.dump_stats(self.path)
+            stats = pstats.Stats(self.profiler)
+            if self.logger:
+                self.logger.info(f"Profile '{self.file_name}' ({stats.total_tt:.2f}s): {self.path}\n" + '\n'.join(hotspot_summary(stats, self.top_n)), category=CATEGORY_UI)
+        except OSError as e:
+            if self.logger: self.logger.warning(f"Το profile του '{self.file_name}' δεν γράφτηκε στο '{self.profile_dir}': {str(e)}", category=CATEGORY_UI)
+        return False
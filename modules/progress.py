@@ -0,0 +1,125 @@
+import time
+
+# Φάσεις της επεξεργασίας ενός αρχείου.
+PHASE_OPEN = 'open'
+PHASE_SCAN = 'scan'
+PHASE_SPLIT = 'split'
+PHASE_WRITE = 'write'
+PHASE_SAVE = 'save'
+PHASES = (PHASE_OPEN, PHASE_SCAN, PHASE_SPLIT, PHASE_WRITE, PHASE_SAVE)
+
+# Ελάχιστο διάστημα (δευτερόλεπτα) ανάμεσα σε δύο αναφορές προόδου (το πολύ 10 ανά δευτερόλεπτο).
+PROGRESS_INTERVAL = 0.1
+
+# Τμήμα της προόδου ενός φύλλου (από, έως) ανά φάση· οι φάσεις αυτές επαναλαμβάνονται ανά φύλλο.
+_SHEET_PHASE_SPAN = {PHASE_SCAN: (0.0, 0.5), PHASE_SPLIT: (0.5, 0.8), PHASE_WRITE: (0.8, 1.0)}
+# Τμήμα της προόδου του αρχείου για το άνοιγμα· η αποθήκευση παίρνει το save_share στο τέλος.
+OPEN_SHARE = 0.02
+DEFAULT_SAVE_SHARE = 0.05
+
+
+class ProcessingCancelled(Exception):
+    """Ζητήθηκε διακοπή (should_stop) και η επεξεργασία του αρχείου σταμάτησε σε σημείο ελέγχου."""
+
+class RowProgress:
+    """
+    Πρόοδος ανά γραμμή για ένα αρχείο, με αναφορές το πολύ μία ανά `interval` δευτερόλεπτα.
+
+    Ο callback δέχεται dict με: file, phase, sheet, rows_done, rows_total (None αν δεν είναι
+    γνωστό), rows_per_second, eta_seconds (None αν δεν υπολογίζεται) και fraction (0..1, η
+    εκτιμώμενη πρόοδος όλου του αρχείου). Η αλλαγή φάσης αναφέρεται πάντα· οι ενημερώσεις
+    γραμμών μέσα σε μια φάση μόνο αν πέρασε το interval, ώστε το update να μπορεί να
+    καλείται σε κάθε γραμμή ή παρτίδα γραμμών.
+
+    Οι ίδιες κλήσεις είναι και σημεία ελέγχου για διακοπή: αν δοθεί should_stop(), ελέγχεται
+    σε κάθε αλλαγή φάσης και το πολύ μία φορά ανά interval μέσα σε μια φάση, και αν επιστρέψει
+    True σηκώνεται ProcessingCancelled.
+
+    Το timings κρατά τον συνολικό χρόνο (δευτερόλεπτα) κάθε φάσης σε όλα τα φύλλα· η τρέχουσα
+    φάση προστίθεται με τη finish.
+    """
+
+    def __init__(self, callback, file_name, interval=PROGRESS_INTERVAL, clock=time.monotonic, save_share=DEFAULT_SAVE_SHARE, should_stop=None):
+        self.callback = callback
+        self.should_stop = should_stop
+        self.file_name = file_name
+        self.interval = interval
+        self.clock = clock
+        # Πόσο από τον χρόνο του αρχείου αναλογεί στην αποθήκευση (εξαρτάται από τη μηχανή).
+        self.save_share = save_share
+        self.phase = None
+        self.sheet = None
+        self.sheet_index = 0
+        self.sheet_count = 1
+        self.rows_done = 0
+        self.rows_total = None
+        self._phase_started = 0.0
+        self._last_report = None
+        self.timings = {}
+
+    def start_sheet(self, name, index, count):
+        """Ορίζει το τρέχον φύλλο (index από 0 έως count-1)."""
+        self.sheet = name
+        self.sheet_index = index
+        self.sheet_count = max(count, 1)
+
+    def start_phase(self, phase, rows_total=None):
+        """Ξεκινά νέα φάση (PHASE_*) με rows_total γραμμές, αν είναι γνωστές."""
+        now = self.clock()
+        self._close_phase(now)
+        self.phase = phase
+        self.rows_done = 0
+        self.rows_total = rows_total
+        self._phase_started = now
+        self._report(now)
+
+    def finish(self):
+        """Τέλος της επεξεργασίας: ο χρόνος της τρέχουσας φάσης προστίθεται στο timings."""
+        self._close_phase(self.clock())
+        self.phase = None
+
+    def _close_phase(self, now):
+        if self.phase is not None:
+            self.timings[self.phase] = self.timings.get(self.phase, 0.0) + now - self._phase_started
+
+    def update(self, rows_done, rows_total=None):
+        """Ενημερώνει τις γραμμές της τρέχουσας φάσης· αναφέρεται μόνο αν πέρασε το interval."""
+        self.rows_done = rows_done
+        if rows_total is not None: self.rows_total = rows_total
+        if self.callback is None and self.should_stop is None: return
+        now = self.clock()
+        if self._last_report is None or now - self._last_report >= self.interval:
+            self._report(now)
+
+    def fraction(self):
+        """Εκτιμώμενη πρόοδος όλου του αρχείου (0..1)."""
+        done = min(self.rows_done / self.rows_total, 1.0) if self.rows_total else 0.0
+        sheets_end = 1.0 - self.save_share
+        if self.phase == PHASE_OPEN:
+            return OPEN_SHARE * done
+        if self.phase == PHASE_SAVE:
+            return sheets_end + self.save_share * done
+        lo, hi = _SHEET_PHASE_SPAN.get(self.phase, (0.0, 1.0))
+        within = (self.sheet_index + lo + (hi - lo) * done) / self.sheet_count
+        return OPEN_SHARE + (sheets_end - OPEN_SHARE) * within
+
+    def snapshot(self, now=None):
+        """Η τρέχουσα κατάσταση ως dict (αυτό που λαμβάνει ο callback)."""
+        if now is None: now = self.clock()
+        elapsed = now - self._phase_started
+        rows_per_second = self.rows_done / elapsed if elapsed > 0 else 0.0
+        eta_seconds = None
+        if self.rows_total and rows_per_second > 0:
+            eta_seconds = max(self.rows_total - self.rows_done, 0) / rows_per_second
+        return {
+            'file': self.file_name, 'phase': self.phase, 'sheet': self.sheet,
+            'rows_done': self.rows_done, 'rows_total': self.rows_total,
+            'rows_per_second': rows_per_second, 'eta_seconds': eta_seconds,
+            'fraction': self.fraction(),
+        }
+
+    def _report(self, now):
+        self._last_report = now
+        if self.should_stop is not None and self.should_stop():
+            raise ProcessingCancelled(f"{self.file_name}: διακοπή στη φάση '{self.phase}'")
+        if self.callback is not None: self.callback(self.snapshot(now))
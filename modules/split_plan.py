@@ -0,0 +1,358 @@
+import hashlib
+import random
+from array import array
+from collections import OrderedDict
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Αποτέλεσμα υπολογισμού διάσπασης ανά γραμμή.
+SPLIT_NONE = 0            # Τιμή κάτω από το όριο
+SPLIT_BELOW_MAX = 1       # Τιμή >= όριο αλλά < μέγιστο κομμάτι: παραμένει
+SPLIT_NOT_MULTIPLE_5 = 2  # 'Ακέραια Διάσπαση' για τιμή που δεν είναι πολλαπλάσιο του 5
+SPLIT_IMPOSSIBLE = 3      # Δεν υπάρχει έγκυρη διάσπαση
+SPLIT_RANDOM_2 = 4
+SPLIT_HALF_2 = 5
+SPLIT_RANDOM_N = 6
+SPLIT_INTEGER_5 = 8
+
+# Μέγιστο πλήθος αποθηκευμένων διασπάσεων στο SplitCache.
+SPLIT_CACHE_SIZE = 100000
+
+# Αναπαραγώγιμες διασπάσεις (seed): από τι εξαρτάται η τυχαιότητα κάθε γραμμής.
+SEED_SCOPE_ROW = 'row'        # seed + hash περιεχομένου αρχείου + φύλλο + γραμμή
+SEED_SCOPE_GLOBAL = 'global'  # seed + ποσό: το ίδιο ποσό διασπάται παντού με τον ίδιο τρόπο
+SEED_SCOPES = (SEED_SCOPE_ROW, SEED_SCOPE_GLOBAL)
+
+# Κάθε γραμμή έχει ένα κλειδί 64 bit· η k-οστή τυχαία τιμή της είναι
+# mix64(κλειδί + (k + 1) * _GOLDEN) (SplitMix64), ίδια στην Python και στο NumPy.
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+_GOLDEN = 0x9E3779B97F4A7C15
+_MIX1 = 0xBF58476D1CE4E5B9
+_MIX2 = 0x94D049BB133111EB
+_UNIT = 1.0 / (1 << 53)
+
+
+def split_method_name(code, N):
+    """Περιγραφή της μεθόδου διάσπασης (για τα μηνύματα καταγραφής)."""
+    if code == SPLIT_RANDOM_2: return "Random (2-way)"
+    if code == SPLIT_HALF_2: return "Half (2-way)"
+    if code == SPLIT_RANDOM_N: return f"Random ({N}-way)"
+    if code == SPLIT_INTEGER_5: return f"Integer x5 ({N}-way)"
+    if code == SPLIT_BELOW_MAX: return "None (Below Max)"
+    return "None"
+
+
+class SplitPlan:
+    """
+    Τα σχέδια διάσπασης πολλών γραμμών σε συμπαγή μορφή.
+
+    methods[i]: ο κωδικός SPLIT_* της γραμμής i
+    offsets[i]:offsets[i+1]: η θέση των κομματιών της γραμμής i στο parts
+                             (κενό διάστημα για γραμμές που δεν διασπώνται)
+    parts: όλα τα κομμάτια σε ακέραια λεπτά, γραμμή προς γραμμή
+    """
+    __slots__ = ('methods', 'offsets', 'parts')
+
+    def __init__(self, methods, offsets, parts):
+        self.methods = methods
+        self.offsets = offsets
+        self.parts = parts
+
+    def __len__(self):
+        return len(self.methods)
+
+    def count(self, i):
+        """Πλήθος κομματιών της γραμμής i (0 αν δεν διασπάται)."""
+        return int(self.offsets[i + 1] - self.offsets[i])
+
+    def parts_of(self, i):
+        """Τα κομμάτια της γραμμής i σε ακέραια λεπτά (list)."""
+        return self.parts[self.offsets[i]:self.offsets[i + 1]].tolist()
+
+    def method_name(self, i):
+        return split_method_name(self.methods[i], self.count(i))
+
+    def split_indexes(self):
+        """Οι θέσεις των γραμμών που διασπώνται (με τουλάχιστον ένα κομμάτι), σε αύξουσα σειρά."""
+        if np is not None and isinstance(self.offsets, np.ndarray):
+            return np.nonzero(np.diff(self.offsets) > 0)[0].tolist()
+        return [i for i in range(len(self.methods)) if self.offsets[i + 1] > self.offsets[i]]
+
+    def unsplit_indexes(self):
+        """Οι θέσεις των γραμμών που δεν διασπώνται (κωδικός έως SPLIT_IMPOSSIBLE), σε αύξουσα σειρά."""
+        if np is not None and isinstance(self.methods, np.ndarray):
+            return np.nonzero(self.methods <= SPLIT_IMPOSSIBLE)[0].tolist()
+        return [i for i, code in enumerate(self.methods) if code <= SPLIT_IMPOSSIBLE]
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Δημιουργία από ζεύγη (κωδικός SPLIT_*, κομμάτια ή None) ανά γραμμή."""
+        methods = array('b')
+        offsets = array('q', [0])
+        parts = array('q')
+        for code, row_parts in rows:
+            methods.append(code)
+            if row_parts: parts.extend(row_parts)
+            offsets.append(len(parts))
+        return cls(methods, offsets, parts)
+
+
+class SplitCache:
+    """
+    Κρυφή μνήμη LRU περιορισμένου μεγέθους για διασπάσεις που εξαρτώνται μόνο από την τιμή
+    και τις ρυθμίσεις (π.χ. 'Ακέραια Διάσπαση'). Κλειδί: (λειτουργία, μέγιστο κομμάτι, τιμή, ...),
+    τιμή: (κωδικός SPLIT_*, tuple κομματιών ή None).
+    """
+
+    def __init__(self, maxsize=SPLIT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is not None: self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key, entry):
+        if self.maxsize <= 0: return
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+
+def _mix64(z):
+    z = ((z ^ (z >> 30)) * _MIX1) & _MASK64
+    z = ((z ^ (z >> 27)) * _MIX2) & _MASK64
+    return z ^ (z >> 31)
+
+
+def seed_key(*parts):
+    """Κλειδί 64 bit από οποιεσδήποτε τιμές (seed, hash αρχείου, όνομα φύλλου, ...)."""
+    digest = hashlib.blake2b('\x1f'.join(str(part) for part in parts).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def row_key(base_key, ident):
+    """Το κλειδί τυχαιότητας μιας γραμμής (ident: αριθμός γραμμής ή ποσό σε λεπτά)."""
+    return _mix64((base_key + (ident & _MASK64) * _GOLDEN) & _MASK64)
+
+
+class SeededRandom:
+    """
+    Οι μέθοδοι random/uniform/shuffle του module random, με τιμές που προκύπτουν μόνο από
+    το κλειδί της γραμμής (βλ. row_key). Δίνει τα ίδια κομμάτια με το plan_splits για το
+    ίδιο κλειδί, ώστε η διάσπαση να μην εξαρτάται από το αν υπάρχει NumPy.
+    """
+    __slots__ = ('key', 'counter')
+
+    def __init__(self, key):
+        self.key = key
+        self.counter = 0
+
+    def random(self):
+        self.counter += 1
+        return (_mix64((self.key + self.counter * _GOLDEN) & _MASK64) >> 11) * _UNIT
+
+    def uniform(self, a, b):
+        return a + (b - a) * self.random()
+
+    def shuffle(self, items):
+        """Ανακατάταξη με ταξινόμηση κατά τυχαίο κλειδί (όπως στο _sample_n_way)."""
+        keys = [self.random() for _ in items]
+        items[:] = [items[i] for i in sorted(range(len(items)), key=keys.__getitem__)]
+
+
+def _mix64_array(z):
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(_MIX1)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(_MIX2)
+    return z ^ (z >> np.uint64(31))
+
+
+def row_keys(base_key, idents):
+    """Η διανυσματική μορφή της row_key για πίνακα αριθμών γραμμών ή ποσών."""
+    idents = np.asarray(idents, dtype=np.int64).astype(np.uint64)
+    return _mix64_array(np.uint64(base_key) + idents * np.uint64(_GOLDEN))
+
+
+def random_keys(count):
+    """Τυχαία κλειδιά γραμμών για διασπάσεις χωρίς seed (από το module random)."""
+    rng = np.random.default_rng(random.getrandbits(64))
+    return rng.integers(0, _MASK64, count, dtype=np.uint64, endpoint=True)
+
+
+def _uniforms(keys, counters):
+    """Οι τυχαίες τιμές [0, 1) των κλειδιών keys στις θέσεις counters (1, 2, ...), όπως το SeededRandom.random."""
+    steps = np.asarray([(counter * _GOLDEN) & _MASK64 for counter in np.atleast_1d(counters).tolist()], dtype=np.uint64)
+    if np.ndim(counters) == 0: steps = steps[0]
+    return (_mix64_array(keys + steps) >> np.uint64(11)).astype(np.float64) * _UNIT
+
+
+def _segment_index(counts):
+    """Για κάθε θέση ενός επίπεδου πίνακα τμημάτων μεγέθους counts: η θέση μέσα στο τμήμα του."""
+    starts = np.cumsum(counts) - counts
+    return np.arange(int(counts.sum()), dtype=np.int64) - np.repeat(starts, counts)
+
+
+def _sample_n_way(values, counts, keys, max_split_cents, epsilon_cents):
+    """
+    Η διανυσματική μορφή του ExcelProcessor.generate_n_splits_normalized για πολλές γραμμές
+    (όλες εφικτές), με τις ίδιες πράξεις κινητής υποδιαστολής: ένα βάρος uniform(0.01, 1.0)
+    ανά κομμάτι, κάθε κομμάτι ανάλογο του βάρους του στο υπόλοιπο ποσό, περιορισμένο ώστε τα
+    επόμενα να μένουν εφικτά. Οι γραμμές επεξεργάζονται ανά θέση κομματιού, όλες μαζί.
+
+    Returns:
+        tuple: (επίπεδος πίνακας κομματιών ανά γραμμή, πλήθος κομματιών που περιορίστηκαν)
+    """
+    capacity = max_split_cents - 1 - epsilon_cents
+    order = np.argsort(-counts, kind='stable')
+    sorted_counts = counts[order]
+    sorted_keys = keys[order]
+    starts = np.cumsum(sorted_counts) - sorted_counts
+    total = int(sorted_counts.sum())
+    max_count = int(sorted_counts[0]) if total else 0
+    # Με φθίνουσα σειρά πλήθους, οι γραμμές με > i κομμάτια είναι οι πρώτες active[i].
+    active = np.searchsorted(-sorted_counts, -np.arange(max_count), side='left').tolist()
+
+    weights = np.empty(total)
+    weights_left = np.zeros(len(order))
+    for i in range(max_count):
+        n = active[i]
+        weight = 0.01 + (1.0 - 0.01) * _uniforms(sorted_keys[:n], i + 1)
+        weights[starts[:n] + i] = weight
+        weights_left[:n] += weight
+
+    out = np.empty(total, np.int64)
+    remaining = values[order] - sorted_counts * epsilon_cents
+    clamped = np.zeros(len(order), np.int64)
+    for i in range(max_count):
+        n = active[i]
+        positions = starts[:n] + i
+        rest = remaining[:n]
+        parts_after = sorted_counts[:n] - 1 - i
+        lower = np.maximum(0, rest - parts_after * capacity)
+        upper = np.minimum(capacity, rest)
+        weight = weights[positions]
+        extra = np.floor(rest * weight / weights_left[:n] + 0.5).astype(np.int64)
+        extra = np.where(parts_after == 0, rest, extra)
+        hit = (extra < lower) | (extra > upper)
+        clamped[:n] += hit
+        extra = np.minimum(np.maximum(extra, lower), upper)
+        out[positions] = epsilon_cents + extra
+        remaining[:n] -= extra
+        weights_left[:n] -= weight
+
+    # Ανακατάταξη των κομματιών μόνο στις γραμμές όπου ενεργοποιήθηκε περιορισμός. Οι γραμμές
+    # με το ίδιο πλήθος κομματιών είναι συνεχόμενες: κάθε ομάδα είναι ένας πίνακας (γραμμές x N)
+    # και ταξινομείται ανά γραμμή κατά τις τυχαίες τιμές N+1..2N, όπως το SeededRandom.shuffle.
+    shuffle_rows = clamped > 0
+    if shuffle_rows.any():
+        group_starts = np.flatnonzero(np.diff(sorted_counts, prepend=0) != 0)
+        group_ends = np.append(group_starts[1:], len(order))
+        for first, last in zip(group_starts.tolist(), group_ends.tolist()):
+            selected = shuffle_rows[first:last]
+            if not selected.any(): continue
+            N = int(sorted_counts[first])
+            block = out[starts[first]:starts[first] + (last - first) * N].reshape(last - first, N)
+            shuffle_keys = _uniforms(sorted_keys[first:last][selected][:, None], np.arange(N + 1, 2 * N + 1))
+            block[selected] = np.take_along_axis(block[selected], np.argsort(shuffle_keys, axis=1, kind='stable'), axis=1)
+
+    # Επιστροφή στη σειρά των γραμμών εισόδου.
+    original_starts = np.empty(len(order), np.int64)
+    original_starts[order] = starts
+    gather = np.repeat(original_starts, counts) + _segment_index(counts)
+    return out[gather], int(clamped.sum())
+
+
+def plan_splits(values_cents, threshold_cents, max_split_cents, split_mode, keys, stats=None):
+    """
+    Υπολογίζει με NumPy τα σχέδια διάσπασης για όλες τις γραμμές μαζί, με τους ίδιους
+    κανόνες με το ExcelProcessor._compute_row_split.
+
+    Args:
+        values_cents: Οι τιμές των γραμμών σε ακέραια λεπτά.
+        keys: Κλειδί τυχαιότητας ανά γραμμή (uint64, βλ. row_keys/random_keys). Για το ίδιο
+              κλειδί τα κομμάτια είναι ίδια με του _compute_row_split με SeededRandom(κλειδί).
+        stats (dict): Αν δοθεί, αυξάνονται οι μετρητές sampler_calls/sampler_clamped_parts/impossible_n_way.
+
+    Returns:
+        SplitPlan
+    """
+    values = np.asarray(values_cents, dtype=np.int64)
+    keys = np.asarray(keys, dtype=np.uint64)
+    epsilon = 1
+    M = max_split_cents
+    methods = np.full(len(values), SPLIT_NONE, np.int8)
+    counts = np.zeros(len(values), np.int64)
+    active = values >= threshold_cents
+    row_parts = []  # (γραμμές, πλήθος ανά γραμμή, επίπεδος πίνακας κομματιών)
+
+    if split_mode == 'integer_5':
+        not_multiple = active & (values % 500 != 0)
+        methods[not_multiple] = SPLIT_NOT_MULTIPLE_5
+        candidates = active & ~not_multiple
+        N = np.maximum(-(-values // M), 2)
+        units = values // 500
+        max_units = max((M - 100) // 500, 0)
+        base = units // N
+        remainder = units % N
+        feasible = (candidates & (units >= N) & (max_units > 0) & (base <= max_units) &
+                    ~((base + 1 > max_units) & (remainder > 0)))
+        methods[candidates & ~feasible] = SPLIT_IMPOSSIBLE
+        rows = np.nonzero(feasible)[0]
+        methods[rows] = SPLIT_INTEGER_5
+        row_counts = N[rows]
+        index = _segment_index(row_counts)
+        parts = (np.repeat(base[rows], row_counts) + (index < np.repeat(remainder[rows], row_counts))) * 500
+        row_parts.append((rows, row_counts, parts))
+    else:
+        methods[active & (values < M)] = SPLIT_BELOW_MAX
+
+        two_way = active & (values >= M) & (values < 2 * M)
+        lower = np.maximum(epsilon, values - M + epsilon)
+        upper = np.minimum(values - epsilon, M - epsilon)
+        possible = two_way & (lower <= upper)
+        methods[two_way & ~possible] = SPLIT_IMPOSSIBLE
+        rows = np.nonzero(possible)[0]
+        methods[rows] = SPLIT_RANDOM_2
+        first = np.floor(lower[rows] + (upper[rows] - lower[rows]) * _uniforms(keys[rows], 1) + 0.5).astype(np.int64)
+        first = np.minimum(np.maximum(first, lower[rows]), upper[rows])
+        parts = np.empty(2 * len(rows), np.int64)
+        parts[0::2] = first
+        parts[1::2] = values[rows] - first
+        row_parts.append((rows, np.full(len(rows), 2, np.int64), parts))
+
+        n_way = active & (values >= 2 * M)
+        N = np.maximum(-(-values // M), 3)
+        feasible = n_way & (values >= N * epsilon) & (values - N * epsilon <= N * (M - 1 - epsilon))
+        impossible = n_way & ~feasible
+        methods[impossible] = SPLIT_IMPOSSIBLE
+        if stats is not None:
+            stats['impossible_n_way'] = stats.get('impossible_n_way', 0) + int(np.count_nonzero(impossible))
+        rows = np.nonzero(feasible)[0]
+        methods[rows] = SPLIT_RANDOM_N
+        if len(rows):
+            parts, clamped = _sample_n_way(values[rows], N[rows], keys[rows], M, epsilon)
+            row_parts.append((rows, N[rows], parts))
+            if stats is not None:
+                stats['sampler_calls'] = stats.get('sampler_calls', 0) + len(rows)
+                stats['sampler_clamped_parts'] = stats.get('sampler_clamped_parts', 0) + clamped
+
+    for rows, row_counts, _ in row_parts:
+        counts[rows] = row_counts
+    offsets = np.zeros(len(values) + 1, np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    all_parts = np.empty(int(offsets[-1]), np.int64)
+    for rows, row_counts, parts in row_parts:
+        if len(rows):
+            all_parts[np.repeat(offsets[rows], row_counts) + _segment_index(row_counts)] = parts
+    return SplitPlan(methods, offsets, all_parts)
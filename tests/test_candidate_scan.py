@@ -0,0 +1,55 @@
+"""Ο διανυσματικός έλεγχος υποψήφιων γραμμών (NumPy) απέναντι στον βρόχο ανά γραμμή."""
+import itertools
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from benchmarks.fake_excel import _Worksheet, _write_xlsx
+from benchmarks.synthetic import write_invoice_workbook, DISTRIBUTION_LOGNORMAL
+from modules.excel_processor import ExcelProcessor
+from modules.ooxml_backend import OoxmlWorkbook
+
+VALUE_COL = 6
+PROP_COLS = [8]
+
+# Τιμές που ελέγχουν τους κανόνες του _is_split_candidate: κείμενα "σύνολα", κενά και
+# κενά κείμενα, μηδενικά, λογικές τιμές και αριθμοί ως κείμενο.
+A_VALUES = [None, '', '  ', 'x', 0, 7, True, False, 'Σύνολα', 'ΣΎΝΟΛΑ μήνα', ' σύνολα']
+B_VALUES = [None, ' ', 'ΤΔΑ-1', 0, 12]
+F_VALUES = [None, 0, -600, 499.99, 500, 500.01, 1e6, True, '600', ' ', 'abc']
+
+
+def assert_same_scan(path, threshold):
+    processor = ExcelProcessor(None)
+    with OoxmlWorkbook(path) as workbook:
+        for sheet in workbook.sheets:
+            expected = processor._scan_sheet_rows(workbook, sheet, threshold, VALUE_COL, PROP_COLS)
+            assert processor._scan_sheet_columns(workbook, sheet, threshold, VALUE_COL, PROP_COLS) == expected
+            assert expected[0], "χωρίς υποψήφιες γραμμές ο έλεγχος δεν συγκρίνει τίποτα"
+
+
+@pytest.mark.parametrize('threshold', [1, 500, 2999.99])
+def test_column_scan_matches_row_scan_on_synthetic_workbook(tmp_path, threshold):
+    path = str(tmp_path / 'invoices.xlsx')
+    write_invoice_workbook(path, 3000, seed=3, totals_every=40, blank_every=13, sheets=2, distribution=DISTRIBUTION_LOGNORMAL)
+    assert_same_scan(path, threshold)
+
+
+def test_column_scan_matches_row_scan_across_blocks(tmp_path):
+    # Αρκετές γραμμές ώστε το φύλλο να διαβάζεται σε πολλά τμήματα (_BLOCK_SIZE).
+    path = str(tmp_path / 'invoices.xlsx')
+    write_invoice_workbook(path, 30000, seed=4)
+    assert_same_scan(path, 500)
+
+
+@pytest.mark.parametrize('threshold', [-1000, 1, 500])
+def test_column_scan_matches_row_scan_on_edge_cells(tmp_path, threshold):
+    rows = [{1: 'Α/Α', 2: 'Τιμολόγιο', VALUE_COL: 9999}]
+    for a, b, f in itertools.product(A_VALUES, B_VALUES, F_VALUES):
+        cells = {col: value for col, value in ((1, a), (2, b), (VALUE_COL, f)) if value is not None}
+        cells[PROP_COLS[0]] = len(rows) * 1.5
+        rows.append(cells)
+    path = str(tmp_path / 'edge.xlsx')
+    _write_xlsx(path, [_Worksheet(None, 'Edge', rows)])
+    assert_same_scan(path, threshold)
@@ -0,0 +1,53 @@
+"""Τα ποσά σε ακέραια λεπτά (modules.money) απέναντι στο Decimal με ROUND_HALF_UP."""
+import decimal
+import random
+
+import pytest
+
+from modules.money import to_cents, from_cents, format_cents, div_round_half_up
+
+D = decimal.Decimal
+
+
+def decimal_cents(value):
+    """Η αναφορά: Decimal(str(value)) σε λεπτά, με ROUND_HALF_UP."""
+    return int((D(str(value)) * 100).to_integral_value(rounding=decimal.ROUND_HALF_UP))
+
+
+@pytest.mark.parametrize('value', [
+    0, 0.0, -0.0, 5, -5, 0.005, 0.015, 0.025, 1.005, 2.675, 12.345, -0.005, -1.235, -12.345,
+    0.1 + 0.2, 499.995, 500.0, 123456789.995, 1e-7, 1.5e-3, 2.5e16, -3.25e-5, 0.994999, 0.995,
+    '12.345', '-0.005', '1e3', D('1.005'), D('-2.675'),
+])
+def test_to_cents_matches_decimal(value):
+    assert to_cents(value) == decimal_cents(value)
+
+
+def test_to_cents_matches_decimal_random_floats():
+    rng = random.Random(0)
+    for _ in range(20000):
+        value = round(rng.uniform(-1e6, 1e6), rng.choice([0, 1, 2, 3, 4, 6]))
+        assert to_cents(value) == decimal_cents(value), value
+
+
+def test_to_cents_rejects_text():
+    with pytest.raises(decimal.InvalidOperation):
+        to_cents('abc')
+
+
+def test_from_cents_and_format_cents():
+    assert from_cents(123456) == float(D('1234.56'))
+    assert format_cents(123456) == '1234.56'
+    assert format_cents(-5) == '-0.05'
+    assert format_cents(0) == '0.00'
+
+
+def test_div_round_half_up_matches_decimal():
+    rng = random.Random(1)
+    pairs = [(n, d) for n in range(-60, 61) for d in range(-9, 10) if d]
+    pairs += [(rng.randint(-10**15, 10**15), rng.choice([-1, 1]) * rng.randint(1, 10**6)) for _ in range(5000)]
+    with decimal.localcontext() as ctx:
+        ctx.prec = 60
+        for numerator, denominator in pairs:
+            expected = int((D(numerator) / D(denominator)).to_integral_value(rounding=decimal.ROUND_HALF_UP))
+            assert div_round_half_up(numerator, denominator) == expected, (numerator, denominator)
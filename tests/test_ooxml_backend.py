@@ -0,0 +1,74 @@
+"""Η προσαρμογή τύπων της μηχανής OOXML και η έξοδός της απέναντι στη μηχανή COM (fake_excel)."""
+import pytest
+
+from benchmarks.bench_com_calls import count_mismatches, FORMULA_WORKBOOK
+from benchmarks.fake_excel import FakeExcel
+from benchmarks.synthetic import write_invoice_workbook
+from modules import excel_processor
+from modules.excel_processor import ExcelProcessor, WRITE_MODES
+from modules.ooxml_backend import RowMapping, shift_formula, translate_formula
+
+# Δύο γραμμές εισάγονται κάτω από τη γραμμή 5 του Sheet1.
+MAPPINGS = {'Sheet1': RowMapping({5: 2})}
+
+
+def test_row_mapping():
+    mapping = RowMapping({5: 2, 8: 1})
+    assert [mapping.new_row(row) for row in (1, 5, 6, 8, 9)] == [1, 5, 8, 10, 12]
+    assert mapping.last_row(5) == 7
+    assert mapping.last_row(6) == 8
+    assert not RowMapping({3: 0})
+
+
+@pytest.mark.parametrize('formula, expected', [
+    ('A5+A6', 'A5+A8'),
+    # Οι απόλυτες και οι μικτές αναφορές μετακινούνται επίσης στην εισαγωγή γραμμών.
+    ('$A$6*B$7+$C8', '$A$8*B$9+$C10'),
+    ('SUM(A2:A10)', 'SUM(A2:A12)'),
+    ('SUM(A6:A10)', 'SUM(A8:A12)'),
+    ('SUM($A$1:$A$5)', 'SUM($A$1:$A$5)'),
+    ('SUM(3:7)+SUM($6:$6)', 'SUM(3:9)+SUM($8:$8)'),
+    ('SUM(A:A)', 'SUM(A:A)'),
+    ('"A6"&A6', '"A6"&A8'),
+    ('LOG10(A6)', 'LOG10(A8)'),
+    ('Sheet1!A6+Sheet2!A6', 'Sheet1!A8+Sheet2!A6'),
+])
+def test_shift_formula_same_sheet(formula, expected):
+    assert shift_formula(formula, 'Sheet1', MAPPINGS) == expected
+
+
+@pytest.mark.parametrize('formula, expected', [
+    ('A6', 'A6'),
+    ('Sheet1!A6+A6', 'Sheet1!A8+A6'),
+    ('SUM(Sheet1!$B$2:B10)*Sheet1!C$6', 'SUM(Sheet1!$B$2:B12)*Sheet1!C$8'),
+])
+def test_shift_formula_other_sheet(formula, expected):
+    assert shift_formula(formula, 'Sheet2', MAPPINGS) == expected
+
+
+def test_shift_formula_quoted_sheet_names():
+    mappings = {'My Sheet': RowMapping({5: 2}), "It's": RowMapping({1: 1})}
+    assert shift_formula("'My Sheet'!B7+'It''s'!A2+B7", 'Other', mappings) == "'My Sheet'!B9+'It''s'!A3+B7"
+    assert shift_formula("B7", 'My Sheet', mappings) == "B9"
+
+
+@pytest.mark.parametrize('formula, row_offset, col_offset, expected', [
+    ('A1+$B$2+C$3+$D4', 2, 1, 'B3+$B$2+D$3+$D6'),
+    ('SUM(A1:A3)', 1, 0, 'SUM(A2:A4)'),
+    ('SUM(1:2)+SUM($1:2)', 1, 0, 'SUM(2:3)+SUM($1:3)'),
+    ('Sheet2!A1&"A1"', 1, 1, 'Sheet2!B2&"A1"'),
+    ('A1', 0, 0, 'A1'),
+])
+def test_translate_formula(formula, row_offset, col_offset, expected):
+    assert translate_formula(formula, row_offset, col_offset) == expected
+
+
+@pytest.mark.parametrize('write_mode', WRITE_MODES)
+@pytest.mark.parametrize('workbook', [{}, FORMULA_WORKBOOK], ids=['values', 'formulas'])
+def test_ooxml_output_matches_com(tmp_path, monkeypatch, write_mode, workbook):
+    # Η λειτουργία εισαγωγής περιμένει 0.2s μετά από κάθε εισαγωγή γραμμών.
+    monkeypatch.setattr(excel_processor.time, 'sleep', lambda seconds: None)
+    input_path = str(tmp_path / 'invoices.xlsx')
+    write_invoice_workbook(input_path, 300, seed=5, **workbook)
+    processor = ExcelProcessor(None, com_dispatch=FakeExcel())
+    assert count_mismatches(processor, input_path, str(tmp_path), write_mode, 5) == 0
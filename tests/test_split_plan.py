@@ -0,0 +1,50 @@
+"""Το διανυσματικό plan_splits απέναντι στο ExcelProcessor._compute_row_split ανά γραμμή."""
+import random
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from modules.excel_processor import ExcelProcessor
+from modules.split_plan import plan_splits, row_keys, seed_key, SeededRandom
+
+SEED = 42
+
+
+def sample_values(max_split_cents, count, split_mode):
+    """Τυχαίες τιμές γύρω από τα όρια των κανόνων (2-way, N-way, πολλαπλάσια του 5)."""
+    rng = random.Random(max_split_cents)
+    M = max_split_cents
+    values = [rng.randint(0, 60 * M + 1000) for _ in range(count)]
+    values += [0, 1, M - 1, M, M + 1, 2 * M - 2, 2 * M - 1, 2 * M, 3 * M - 3, 3 * M, 500, 1000, 50000]
+    if split_mode == 'integer_5':
+        values += [value - value % 500 for value in values]
+    return values
+
+
+@pytest.mark.parametrize('split_mode', ['decimal', 'integer_5'])
+@pytest.mark.parametrize('max_split_cents', [1, 3, 500, 777, 49999, 50000])
+@pytest.mark.parametrize('threshold_cents', [0, 1, 50000])
+def test_plan_splits_matches_compute_row_split(split_mode, max_split_cents, threshold_cents):
+    values = sample_values(max_split_cents, 1500, split_mode)
+    keys = row_keys(seed_key(SEED, 'Τιμολόγια'), range(len(values)))
+    plan_stats = {}
+    plan = plan_splits(values, threshold_cents, max_split_cents, split_mode, keys, stats=plan_stats)
+
+    processor = ExcelProcessor(None)
+    row_stats = {}
+    for i, value in enumerate(values):
+        code, parts = processor._compute_row_split(value, threshold_cents, max_split_cents, split_mode,
+                                                   stats=row_stats, rand=SeededRandom(int(keys[i])))
+        assert (int(plan.methods[i]), plan.parts_of(i)) == (code, parts or []), value
+    assert {key: count for key, count in plan_stats.items() if count} == {key: count for key, count in row_stats.items() if count}
+
+
+def test_plan_splits_parts_are_valid():
+    max_split_cents = 50000
+    values = sample_values(max_split_cents, 5000, 'decimal')
+    plan = plan_splits(values, max_split_cents, max_split_cents, 'decimal', row_keys(seed_key(SEED), range(len(values))))
+    for i in plan.split_indexes():
+        parts = plan.parts_of(i)
+        assert sum(parts) == values[i]
+        assert all(1 <= part < max_split_cents for part in parts)
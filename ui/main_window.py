@@ -1,5 +1,6 @@
 import os
 import sys
+import logging
 import subprocess
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
                              QPushButton, QLabel, QFileDialog, QLineEdit,
@@ -7,7 +8,7 @@ from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QGr
                              QGroupBox, QCheckBox, QMessageBox, QTabWidget,
                              QTextEdit, QSplitter, QApplication, QComboBox, QStyle,
                              QSizePolicy)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QSize, QSettings
+from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal, QSize, QSettings
 from PyQt5.QtGui import QIcon, QFont
 
 def resource_path(relative_path):
@@ -34,13 +35,34 @@ SETTING_OUTPUT_DIR = "paths/outputDir"
 SETTING_INTEGER_SPLIT = "mode/integerSplit"  # Προσθήκη της σταθεράς
 SETTING_AUTO_NUMBERING = "options/autoNumbering"  # Προσθήκη για αυτόματη αρίθμηση
 SETTING_INVOICE_NUM_COL = "settings/invoiceNumColumn"  # Προσθήκη για στήλη αριθμού
+SETTING_BACKEND = "mode/backend"
+SETTING_BULK_WRITE = "mode/bulkWrite"
+SETTING_WORKERS = "mode/workers"
+SETTING_SEED_ENABLED = "mode/seedEnabled"
+SETTING_SPLIT_SEED = "mode/splitSeed"
+SETTING_SEED_SCOPE = "mode/seedScope"
+SETTING_INCREMENTAL = "options/incremental"
+SETTING_ROW_LOG = "options/rowLog"
+SETTING_EXPORT_METRICS = "options/exportMetrics"
+SETTING_PROFILE = "options/profile"
+SETTING_BACKUP_ARCHIVE = "options/backupArchive"
+
+# Κάθε πόσα ms εμφανίζονται στο UI log τα μηνύματα που περιμένουν, και πόσες γραμμές κρατά.
+UI_LOG_FLUSH_INTERVAL_MS = 200
+UI_LOG_MAX_LINES = 5000
 
 try:
     
     
-    from modules.excel_processor import ExcelProcessor
-    from modules.logger import Logger 
+    from modules.excel_processor import (ExcelProcessor, BACKEND_COM, BACKEND_OOXML, WRITE_MODE_INSERT, WRITE_MODE_REBUILD,
+                                         SEED_SCOPE_ROW, SEED_SCOPE_GLOBAL)
+    from modules.logger import Logger, LogRingBuffer, CATEGORY_UI
+    from modules.progress import PHASE_OPEN, PHASE_SCAN, PHASE_SPLIT, PHASE_WRITE, PHASE_SAVE
     from modules.file_manager import FileManager
+    from modules.journal import BatchJournal
+    from modules.metrics import export_metrics, timings_summary, METRICS_JSON_FILE, METRICS_PROMETHEUS_FILE
+    from modules.profiling import profile_dir_for
+    from modules.backup import BackupManager, BACKUP_ARCHIVE_PREFIX
 except ImportError as e:
      
      
@@ -55,15 +77,20 @@ except ImportError as e:
                           f"Λεπτομέρειες σφάλματος: {e}")
      sys.exit(1) 
 
+# Ονόματα των φάσεων επεξεργασίας στην ετικέτα προόδου.
+PHASE_LABELS = {PHASE_OPEN: "άνοιγμα", PHASE_SCAN: "σάρωση", PHASE_SPLIT: "διάσπαση", PHASE_WRITE: "εγγραφή", PHASE_SAVE: "αποθήκευση"}
+
 
 class WorkerThread(QThread):
     """Νήμα εργασίας για την επεξεργασία αρχείων σε παρασκήνιο"""
     progress_signal = pyqtSignal(int, int)
+    row_progress_signal = pyqtSignal(dict)
     file_signal = pyqtSignal(str)
+    backup_signal = pyqtSignal(int, int)
     finished_signal = pyqtSignal(dict)
 
     
-    def __init__(self, processor, files, output_dir, threshold, value_col, prop_cols, overwrite, max_split_value, split_mode, auto_numbering=False, invoice_num_col=2): 
+    def __init__(self, processor, files, output_dir, threshold, value_col, prop_cols, overwrite, max_split_value, split_mode, auto_numbering=False, invoice_num_col=2, backend=BACKEND_COM, write_mode=WRITE_MODE_INSERT, workers=1, split_seed=None, seed_scope=SEED_SCOPE_ROW, incremental=False, resume=False, export_metrics=False, profile=False, backup=False, backup_archive=False): 
         super().__init__()
         self.processor = processor
         self.files = files
@@ -76,66 +103,72 @@ class WorkerThread(QThread):
         self.max_split_value = max_split_value 
         self.auto_numbering = auto_numbering
         self.invoice_num_col = invoice_num_col 
-
-    def run(self):
-        results = {
-            'total_files': len(self.files),
-            'processed_files': 0,
-            'skipped_files': 0,
-            'total_rows_processed': 0,
-            'total_rows_split': 0,
-            'errors': 0,
-            'skipped_impossible_splits': 0, 
-            'multi_splits_performed': 0,    
+        self.backend = backend
+        self.write_mode = write_mode
+        self.workers = workers
+        self.split_seed = split_seed
+        self.seed_scope = seed_scope
+        self.incremental = incremental
+        # Συνέχιση της τελευταίας μαζικής επεξεργασίας του output_dir (αρχεία και ρυθμίσεις από το journal).
+        self.resume = resume
+        # Εξαγωγή των μετρήσεων (JSON και Prometheus) στον output_dir μετά την επεξεργασία.
+        self.export_metrics = export_metrics
+        # Profiler ανά αρχείο· τα profiles γράφονται δίπλα στο αρχείο log.
+        self.profile = profile
+        # Αντίγραφα ασφαλείας των αρχείων εισόδου πριν την επεξεργασία (στο νήμα αυτό, όχι στο UI)·
+        # με backup_archive σε συμπιεσμένο αρχείο στον output_dir.
+        self.backup = backup
+        self.backup_archive = backup_archive
+
+    def empty_results(self, errors):
+        return {
+            'total_files': len(self.files), 'processed_files': 0, 'skipped_files': 0,
+            'total_rows_processed': 0, 'total_rows_split': 0, 'errors': errors,
+            'skipped_impossible_splits': 0, 'multi_splits_performed': 0,
             'file_results': {}
         }
-        
-        for i, input_file in enumerate(self.files):
-             if self.isInterruptionRequested():
-                 if self.processor and self.processor.logger:
-                      self.processor.logger.warning("Η επεξεργασία διακόπηκε από τον χρήστη.")
-                 break
-
-             current_file_name = os.path.basename(input_file)
-             self.file_signal.emit(current_file_name)
-             self.progress_signal.emit(i, len(self.files))
-
-             try:
-                 file_name_base, file_ext = os.path.splitext(current_file_name)
-                 output_name = f"{file_name_base}_διασπασμένο{file_ext}"
-                 output_path = os.path.join(self.output_dir, output_name)
-                 
-                 file_results = self.processor.process_file(
-                     input_file, output_path, self.threshold,
-                     self.value_col, self.prop_cols, self.overwrite,
-                     self.max_split_value, self.split_mode,
-                     self.auto_numbering, self.invoice_num_col
-                 )
-                 if file_results.get('skipped'):
-                     results['skipped_files'] += 1
-                 else:
-                     if file_results.get('errors', 0) == 0: 
-                          results['processed_files'] += 1
-                     results['total_rows_processed'] += file_results.get('processed_rows', 0)
-                     results['total_rows_split'] += file_results.get('split_rows', 0)
-                     
-                     results['skipped_impossible_splits'] += file_results.get('skipped_impossible_splits', 0)
-                     results['multi_splits_performed'] += file_results.get('multi_splits_performed', 0)
-
-                 results['errors'] += file_results.get('errors', 0)
-                 results['file_results'][current_file_name] = file_results
-
-             except Exception as e:
-                 results['errors'] += 1
-                 error_message = f"Απρόσμενο σφάλμα στο WorkerThread κατά την επεξεργασία του {current_file_name}: {str(e)}"
-                 if self.processor and self.processor.logger:
-                     self.processor.logger.error(error_message, exc_info=True) 
-                 else:
-                      print(error_message)
-                 results['file_results'][current_file_name] = {'error': True, 'message': error_message, 'skipped': False}
-
-        
-        self.progress_signal.emit(len(self.files), len(self.files))
+
+    def run(self):
+        try:
+            if self.backup and not self.resume:
+                backup_results = BackupManager(self.processor.logger, self.output_dir if self.backup_archive else None).backup_files(
+                    self.files, progress_callback=self.backup_signal.emit, should_stop=self.isInterruptionRequested)
+                if backup_results['failed'] or backup_results['cancelled']:
+                    # Χωρίς πλήρη αντίγραφα ασφαλείας η επεξεργασία δεν ξεκινά.
+                    results = self.empty_results(len(backup_results['failed']))
+                    results['backup'] = backup_results
+                    self.finished_signal.emit(results)
+                    return
+            callbacks = dict(
+                progress_callback=self.progress_signal.emit,
+                row_progress_callback=self.row_progress_signal.emit,
+                file_callback=self.file_signal.emit,
+                should_stop=self.isInterruptionRequested,
+                profile_dir=profile_dir_for(self.processor.logger, self.output_dir) if self.profile else None
+            )
+            if self.resume:
+                results = self.processor.resume_batch(self.output_dir, workers=self.workers, **callbacks)
+                if results is None: raise RuntimeError(f"Δεν βρέθηκε μαζική επεξεργασία για συνέχιση στον φάκελο '{self.output_dir}'.")
+            else:
+                results = self.processor.process_multiple_files(
+                    self.files, self.output_dir, self.threshold,
+                    self.value_col, self.prop_cols, self.overwrite,
+                    self.max_split_value, self.split_mode,
+                    backend=self.backend, write_mode=self.write_mode,
+                    auto_numbering=self.auto_numbering, invoice_num_col=self.invoice_num_col,
+                    workers=self.workers,
+                    split_seed=self.split_seed, seed_scope=self.seed_scope, incremental=self.incremental,
+                    **callbacks
+                )
+            if self.export_metrics: export_metrics(results, self.output_dir, self.processor.logger)
+        except Exception as e:
+            error_message = f"Απρόσμενο σφάλμα στο WorkerThread: {str(e)}"
+            if self.processor and self.processor.logger:
+                self.processor.logger.error(error_message, exc_info=True)
+            else:
+                 print(error_message)
+            results = self.empty_results(1)
+
         self.finished_signal.emit(results)
 
     def requestInterruption(self):
@@ -179,7 +212,13 @@ class MainWindow(QMainWindow):
 
         
         
-        self.logger.log_signal.connect(self.handle_log_message_for_ui)
+        # Τα μηνύματα για την οθόνη (όλα τα σφάλματα και όσα είναι για τον χρήστη) μπαίνουν σε
+        # ουρά από οποιοδήποτε νήμα και εμφανίζονται ανά παρτίδες από το timer.
+        self.log_buffer = LogRingBuffer()
+        self.logger.add_listener(self.log_buffer.append, min_level=logging.ERROR, categories={CATEGORY_UI})
+        self.log_timer = QTimer(self)
+        self.log_timer.timeout.connect(self.flush_log_buffer)
+        self.log_timer.start(UI_LOG_FLUSH_INTERVAL_MS)
 
         
         self.load_settings() 
@@ -198,7 +237,7 @@ class MainWindow(QMainWindow):
             self.logger.error(f"Αδυναμία δημιουργίας φακέλου εξόδου '{self.output_dir}': {e}")
             
 
-        self.logger.info("Εκκίνηση εφαρμογής Διάσπασης Τιμολογίων")
+        self.logger.info("Εκκίνηση εφαρμογής Διάσπασης Τιμολογίων", category=CATEGORY_UI)
         self.worker = None
     
 
@@ -275,6 +314,15 @@ class MainWindow(QMainWindow):
         self.process_btn.clicked.connect(self.start_processing)
         self.process_btn.setToolTip("Ξεκινά τη διαδικασία διάσπασης για τα επιλεγμένα αρχεία")
         self.execution_layout.addWidget(self.process_btn)
+        self.resume_btn = QPushButton(self.style().standardIcon(QStyle.SP_MediaSeekForward), " Συνέχεια Τελευταίας Επεξεργασίας")
+        self.resume_btn.clicked.connect(self.resume_processing)
+        self.resume_btn.setToolTip("Συνεχίζει τη μαζική επεξεργασία που διακόπηκε στον φάκελο αποθήκευσης (π.χ. μετά από κατάρρευση), μόνο με τα αρχεία που δεν ολοκληρώθηκαν")
+        self.execution_layout.addWidget(self.resume_btn)
+        self.stop_btn = QPushButton(self.style().standardIcon(QStyle.SP_MediaStop), " Διακοπή")
+        self.stop_btn.clicked.connect(self.stop_processing)
+        self.stop_btn.setToolTip("Διακόπτει την επεξεργασία· το αρχείο σε εξέλιξη δεν γράφεται (ούτε μισό)")
+        self.stop_btn.setEnabled(False)
+        self.execution_layout.addWidget(self.stop_btn)
 
         self.params_group = QGroupBox("Παράμετροι Διάσπασης")
         self.settings_layout.addWidget(self.params_group)
@@ -315,6 +363,49 @@ class MainWindow(QMainWindow):
         self.auto_numbering_check = QCheckBox("Αυτόματη αύξουσα αρίθμηση διασπασμένων τιμολογίων")
         self.auto_numbering_check.setToolTip("Αν επιλεγεί, τα διασπασμένα τιμολόγια θα παίρνουν αύξοντες αριθμούς με βάση το προηγούμενο τιμολόγιο")
         self.params_layout.addWidget(self.auto_numbering_check)
+
+        self.backend_layout = QHBoxLayout()
+        self.backend_label = QLabel("Μηχανή επεξεργασίας:")
+        self.backend_layout.addWidget(self.backend_label)
+        self.backend_combo = QComboBox()
+        self.backend_combo.addItem("Microsoft Excel (COM)", BACKEND_COM)
+        self.backend_combo.addItem("Απευθείας XML (.xlsx/.xlsm, χωρίς Excel)", BACKEND_OOXML)
+        self.backend_combo.setToolTip("Η μηχανή COM χρησιμοποιεί το εγκατεστημένο Excel.\nΗ μηχανή XML διαβάζει/γράφει απευθείας αρχεία .xlsx/.xlsm, πολύ γρηγορότερα και χωρίς Excel.")
+        self.backend_combo.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self.backend_layout.addWidget(self.backend_combo)
+        self.params_layout.addLayout(self.backend_layout)
+
+        self.bulk_write_check = QCheckBox("Γρήγορη εγγραφή φύλλου με ένα πέρασμα (μηχανή COM)")
+        self.bulk_write_check.setToolTip("Αντί για εισαγωγή γραμμών ανά διάσπαση, οι γραμμές όλων των διασπάσεων εισάγονται μαζί και γράφονται με μαζική εγγραφή.\nΣυνιστάται για φύλλα με πολλές διασπάσεις.")
+        self.params_layout.addWidget(self.bulk_write_check)
+
+        self.workers_layout = QHBoxLayout()
+        self.workers_label = QLabel("Παράλληλες διεργασίες:")
+        self.workers_layout.addWidget(self.workers_label)
+        self.workers_spinbox = QSpinBox()
+        self.workers_spinbox.setRange(1, max(1, os.cpu_count() or 1))
+        self.workers_spinbox.setToolTip("Πόσα αρχεία επεξεργάζονται ταυτόχρονα, το καθένα σε δική του διεργασία.\nΜε τη μηχανή COM κάθε διεργασία ανοίγει δικό της Excel.")
+        self.workers_spinbox.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self.workers_layout.addWidget(self.workers_spinbox)
+        self.params_layout.addLayout(self.workers_layout)
+
+        self.seed_layout = QHBoxLayout()
+        self.seed_check = QCheckBox("Αναπαραγώγιμες διασπάσεις, seed:")
+        self.seed_check.setToolTip("Με το ίδιο seed, τα ίδια αρχεία διασπώνται πάντα με τον ίδιο τρόπο,\nανεξάρτητα από το πλήθος των παράλληλων διεργασιών.")
+        self.seed_layout.addWidget(self.seed_check)
+        self.seed_spinbox = QSpinBox()
+        self.seed_spinbox.setRange(0, 2147483647)
+        self.seed_layout.addWidget(self.seed_spinbox)
+        self.seed_scope_combo = QComboBox()
+        self.seed_scope_combo.addItem("Ανά γραμμή (αρχείο, φύλλο, γραμμή)", SEED_SCOPE_ROW)
+        self.seed_scope_combo.addItem("Ανά ποσό (ίδιο ποσό, ίδια διάσπαση)", SEED_SCOPE_GLOBAL)
+        self.seed_scope_combo.setToolTip("Ανά γραμμή: η διάσπαση εξαρτάται από το περιεχόμενο του αρχείου, το φύλλο και τη γραμμή.\nΑνά ποσό: κάθε ποσό διασπάται παντού με τον ίδιο τρόπο (και υπολογίζεται μία φορά).")
+        self.seed_scope_combo.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        self.seed_layout.addWidget(self.seed_scope_combo)
+        self.seed_check.toggled.connect(self.seed_spinbox.setEnabled)
+        self.seed_check.toggled.connect(self.seed_scope_combo.setEnabled)
+        self.seed_spinbox.setEnabled(False); self.seed_scope_combo.setEnabled(False)
+        self.params_layout.addLayout(self.seed_layout)
         
         
         self.columns_group = QGroupBox("Αριθμοί Στηλών (π.χ., 1=A, 2=B, 6=F)")
@@ -365,16 +456,34 @@ class MainWindow(QMainWindow):
         self.create_backup_check.setChecked(True)
         self.create_backup_check.setToolTip("Αν επιλεγεί, δημιουργείται αντίγραφο του αρχικού αρχείου πριν τροποποιηθεί")
         self.options_layout.addWidget(self.create_backup_check)
+        self.backup_archive_check = QCheckBox("Αντίγραφα σε συμπιεσμένο αρχείο (zip) στον φάκελο αποθήκευσης")
+        self.backup_archive_check.setToolTip(f"Αντί για '.backup' δίπλα σε κάθε αρχείο, ένα {BACKUP_ARCHIVE_PREFIX}<ώρα>.zip ανά επεξεργασία.\nΑρχεία που δεν άλλαξαν από το τελευταίο αντίγραφο παραλείπονται.")
+        self.backup_archive_check.setEnabled(self.create_backup_check.isChecked())
+        self.create_backup_check.toggled.connect(self.backup_archive_check.setEnabled)
+        self.options_layout.addWidget(self.backup_archive_check)
         self.overwrite_check = QCheckBox("Αντικατάσταση αρχείου εξόδου αν υπάρχει ήδη")
         self.overwrite_check.setChecked(True)
         self.overwrite_check.setToolTip("Αν επιλεγεί, τυχόν υπάρχον αρχείο εξόδου θα αντικατασταθεί.\nΑλλιώς, η επεξεργασία για αυτό το αρχείο θα παραλειφθεί.")
         self.options_layout.addWidget(self.overwrite_check)
+        self.incremental_check = QCheckBox("Επεξεργασία μόνο νέων ή αλλαγμένων αρχείων (manifest)")
+        self.incremental_check.setToolTip("Ο φάκελος εξόδου κρατά ένα manifest με το hash κάθε αρχείου εισόδου, των ρυθμίσεων και της εξόδου.\nΑρχεία που δεν άλλαξαν από την προηγούμενη εκτέλεση παραλείπονται.")
+        self.options_layout.addWidget(self.incremental_check)
+        self.row_log_check = QCheckBox("Αναλυτική καταγραφή κάθε γραμμής στο αρχείο log")
+        self.row_log_check.setToolTip("Αν επιλεγεί, κάθε διάσπαση γράφεται ξεχωριστά στο log (πιο αργό σε μεγάλα αρχεία).\nΑλλιώς, τα συμβάντα ανά γραμμή γράφονται συγκεντρωτικά στο τέλος κάθε αρχείου.")
+        self.options_layout.addWidget(self.row_log_check)
+        self.metrics_check = QCheckBox("Εξαγωγή μετρήσεων επιδόσεων στον φάκελο αποθήκευσης")
+        self.metrics_check.setToolTip(f"Χρόνοι ανά φάση, διασπάσεις ανά μέθοδο και μέγιστη μνήμη κάθε επεξεργασίας\nσε {METRICS_JSON_FILE} και {METRICS_PROMETHEUS_FILE} (Prometheus textfile collector).")
+        self.options_layout.addWidget(self.metrics_check)
+        self.profile_check = QCheckBox("Προφίλ επιδόσεων (profiler) για κάθε αρχείο")
+        self.profile_check.setToolTip("Η επεξεργασία τρέχει με profiler (cProfile, πιο αργά). Το profile κάθε αρχείου (.prof)\nγράφεται δίπλα στο αρχείο log και οι πιο χρονοβόρες συναρτήσεις εμφανίζονται στο Ιστορικό.")
+        self.options_layout.addWidget(self.profile_check)
         
         self.log_group = QGroupBox("Ιστορικό Ενεργειών και Σφαλμάτων")
         self.log_layout.addWidget(self.log_group)
         self.log_group_layout = QVBoxLayout(self.log_group)
         self.log_editor = QTextEdit() 
         self.log_editor.setReadOnly(True)
+        self.log_editor.document().setMaximumBlockCount(UI_LOG_MAX_LINES)
         self.log_editor.setFont(QFont("Courier New", 9))
         self.log_editor.setToolTip("Εμφανίζει τα μηνύματα κατά την εκτέλεση της εφαρμογής")
         self.log_group_layout.addWidget(self.log_editor)
@@ -472,48 +581,16 @@ class MainWindow(QMainWindow):
             self.output_path_edit.setText(output_dir)
             self.logger.info(f"Επιλέχθηκε νέος φάκελος αποθήκευσης: {output_dir}")
      
-    def handle_log_message_for_ui(self, formatted_message):
-        """ Φιλτράρει τα μηνύματα για το UI Log. """
-        
-        show_keywords = [
-            
-            
-            "--- Έναρξη Επεξεργασίας Αρχείων ---",
-            "--- Η επεξεργασία ολοκληρώθηκε ---",
-            "--- Αποτελέσματα Επεξεργασίας ---",
-            "Σύνολο αρχείων προς επεξεργασία:", 
-            "Αρχεία που επεξεργάστηκαν:",   
-            "Αρχεία που παραλείφθηκαν :",  
-            "Σύνολο γραμμών που διασπάστηκαν:", 
-            "Σύνολο αποτυχημένων διασπάσεων:", 
-            "Αποτυχημένες διασπάσεις:",      
-            
-            "Ξεκινά η διαδικασία επεξεργασίας", 
-            "Φάκελος Εξόδου:",               
-            "Όριο Διάσπασης:",               
-            "Μέγιστη Τιμή Μετά:",            
-            "Στήλη Αξίας:",                  
-            "Στήλες Αναλ/κές:",              
-            "Backup:",                       
-            "Overwrite:",                    
-            "Split Mode:",                   # Προσθήκη για να φαίνεται το mode
-            "Οι ρυθμίσεις φορτώθηκαν",
-            "Οι ρυθμίσεις αποθηκεύτηκαν",
-            "Εκκίνηση εφαρμογής",
-            "Κλείσιμο εφαρμογής",
-                        
-        ]
-        
+    def flush_log_buffer(self):
+        """Εμφανίζει με ένα append τα μηνύματα που περιμένουν στην ουρά του UI log."""
+        lines, dropped = self.log_buffer.drain()
+        if not lines: return
         try:
-            if any(keyword in formatted_message for keyword in show_keywords):
-                self.log_editor.append(formatted_message)
-            
-            elif "[ERROR] Αποτυχία generate_n_splits" in formatted_message:
-                pass 
-            elif "[DEBUG]" in formatted_message:
-                pass 
+            if dropped:
+                lines.insert(0, f"[WARNING] ... {dropped} παλαιότερα μηνύματα δεν εμφανίστηκαν (δες το αρχείο log).")
+            self.log_editor.append('\n'.join(lines))
         except Exception as e:
-            print(f"ERROR in handle_log_message_for_ui: {e}. Message was: {formatted_message}")
+            print(f"ERROR in flush_log_buffer: {e}")
 
     
     def clear_log(self):
@@ -524,6 +601,7 @@ class MainWindow(QMainWindow):
         """Άνοιγμα του αρχείου καταγραφής"""
         try:
             log_file = self.logger.get_log_file()
+            self.logger.flush()
             if log_file and os.path.exists(log_file):
                 self.logger.info(f"Προσπάθεια ανοίγματος αρχείου log: {log_file}")
                 if sys.platform == 'win32': os.startfile(log_file)
@@ -579,54 +657,85 @@ class MainWindow(QMainWindow):
             return
         create_backup = self.create_backup_check.isChecked()
         overwrite = self.overwrite_check.isChecked()
+        incremental = self.incremental_check.isChecked()
+        self.logger.quiet_hot_path = not self.row_log_check.isChecked()
         
         use_integer_split = self.integer_split_check.isChecked()
         split_mode = 'integer_5' if use_integer_split else 'decimal'
         
         auto_numbering = self.auto_numbering_check.isChecked()
         invoice_num_col = self.invoice_num_spinbox.value()
+        backend = self.backend_combo.currentData()
+        write_mode = WRITE_MODE_REBUILD if self.bulk_write_check.isChecked() else WRITE_MODE_INSERT
+        workers = self.workers_spinbox.value()
+        split_seed = self.seed_spinbox.value() if self.seed_check.isChecked() else None
+        seed_scope = self.seed_scope_combo.currentData()
         
-        self.logger.info("="*40)
-        self.logger.info(f"Ξεκινά η διαδικασία επεξεργασίας για {len(files_to_process)} αρχεία.")
-        self.logger.info(f"  Φάκελος Εξόδου: {self.output_dir}")
-        self.logger.info(f"  Όριο Διάσπασης: {threshold:.2f} €") 
-        self.logger.info(f"  Μέγιστη Τιμή Μετά: {max_split_value:.2f} €") 
-        self.logger.info(f"  Στήλη Αξίας: {value_col}") 
-        self.logger.info(f"  Στήλες Αναλ/κές: {prop_cols}") 
-        self.logger.info(f"  Backup: {'Ναι' if create_backup else 'Όχι'}") 
-        self.logger.info(f"  Overwrite: {'Ναι' if overwrite else 'Όχι'}") 
-        self.logger.info(f"  Split Mode: {'Ακέραια (x5)' if split_mode == 'integer_5' else 'Δεκαδικά'}")
-        self.logger.info(f"  Αυτόματη Αρίθμηση: {'Ναι' if auto_numbering else 'Όχι'}")
+        self.logger.info("="*40, category=CATEGORY_UI)
+        self.logger.info(f"Ξεκινά η διαδικασία επεξεργασίας για {len(files_to_process)} αρχεία.", category=CATEGORY_UI)
+        self.logger.info(f"  Φάκελος Εξόδου: {self.output_dir}", category=CATEGORY_UI)
+        self.logger.info(f"  Όριο Διάσπασης: {threshold:.2f} €", category=CATEGORY_UI)
+        self.logger.info(f"  Μέγιστη Τιμή Μετά: {max_split_value:.2f} €", category=CATEGORY_UI)
+        self.logger.info(f"  Στήλη Αξίας: {value_col}", category=CATEGORY_UI)
+        self.logger.info(f"  Στήλες Αναλ/κές: {prop_cols}", category=CATEGORY_UI)
+        self.logger.info(f"  Backup: {'Ναι' if create_backup else 'Όχι'}", category=CATEGORY_UI)
+        self.logger.info(f"  Overwrite: {'Ναι' if overwrite else 'Όχι'}", category=CATEGORY_UI)
+        self.logger.info(f"  Μόνο αλλαγμένα (manifest): {'Ναι' if incremental else 'Όχι'}", category=CATEGORY_UI)
+        self.logger.info(f"  Split Mode: {'Ακέραια (x5)' if split_mode == 'integer_5' else 'Δεκαδικά'}", category=CATEGORY_UI)
+        self.logger.info(f"  Backend: {self.backend_combo.currentText()}", category=CATEGORY_UI)
+        self.logger.info(f"  Γρήγορη Εγγραφή: {'Ναι' if write_mode == WRITE_MODE_REBUILD else 'Όχι'}", category=CATEGORY_UI)
+        self.logger.info(f"  Διεργασίες: {workers}", category=CATEGORY_UI)
+        self.logger.info(f"  Seed: {split_seed if split_seed is not None else 'Όχι'}" + (f" ({self.seed_scope_combo.currentText()})" if split_seed is not None else ""), category=CATEGORY_UI)
+        self.logger.info(f"  Αυτόματη Αρίθμηση: {'Ναι' if auto_numbering else 'Όχι'}", category=CATEGORY_UI)
         if auto_numbering:
-            self.logger.info(f"  Στήλη Αριθμού: {invoice_num_col}")
-        self.logger.info("="*40)
+            self.logger.info(f"  Στήλη Αριθμού: {invoice_num_col}", category=CATEGORY_UI)
+        self.logger.info("="*40, category=CATEGORY_UI)
 
         self.tabs.setCurrentWidget(self.log_tab) 
 
-        
-        if create_backup:
-            self.logger.info("Έναρξη δημιουργίας αντιγράφων ασφαλείας...")
-            self.progress_label.setText("Δημιουργία αντιγράφων ασφαλείας...")
-            QApplication.processEvents() 
-            backups_ok = True
-            for idx, file_path in enumerate(files_to_process):
-                self.progress_bar.setValue(int(((idx + 1) / len(files_to_process)) * 100))
-                try:
-                    backup_path = FileManager.create_backup(file_path)
-                    self.logger.info(f"OK Backup: {os.path.basename(backup_path)}")
-                except Exception as e:
-                    self.logger.error(f"Κρίσιμο σφάλμα κατά τη δημιουργία backup για το '{os.path.basename(file_path)}': {str(e)}")
-                    QMessageBox.critical(self, "Σφάλμα Backup", f"Αδυναμία δημιουργίας αντιγράφου ασφαλείας για το αρχείο:\n{file_path}\n\nΣφάλμα: {str(e)}\n\nΗ επεξεργασία θα ακυρωθεί.")
-                    backups_ok = False
-                    break
-            self.progress_bar.setValue(0) 
-            if not backups_ok:
-                 self.logger.error("Η επεξεργασία ακυρώθηκε λόγω αποτυχίας δημιουργίας backup.")
-                 self.progress_label.setText("Η επεξεργασία ακυρώθηκε (σφάλμα backup).")
-                 return 
-            self.logger.info("Ολοκληρώθηκε η δημιουργία αντιγράφων ασφαλείας.")
+        self.start_worker(WorkerThread(
+            self.processor, files_to_process, self.output_dir,
+            threshold, value_col, prop_cols, overwrite,
+            max_split_value, split_mode, auto_numbering, invoice_num_col,
+            backend, write_mode, workers, split_seed, seed_scope, incremental,
+            export_metrics=self.metrics_check.isChecked(), profile=self.profile_check.isChecked(),
+            backup=create_backup, backup_archive=create_backup and self.backup_archive_check.isChecked()
+        ))
+
+    def resume_processing(self):
+        """Συνεχίζει την τελευταία μαζική επεξεργασία του φακέλου εξόδου από το journal της"""
+        if self.worker is not None and self.worker.isRunning():
+             QMessageBox.information(self,"Επεξεργασία σε Εξέλιξη", "Μια διαδικασία επεξεργασίας είναι ήδη σε εξέλιξη. Παρακαλώ περιμένετε να ολοκληρωθεί.")
+             return
 
-        
+        journal = BatchJournal(self.output_dir, logger=self.logger).load() if self.output_dir and os.path.isdir(self.output_dir) else None
+        if journal is None or journal.batch is None:
+            QMessageBox.information(self, "Συνέχεια Επεξεργασίας", f"Δεν βρέθηκε μαζική επεξεργασία για συνέχιση στον φάκελο αποθήκευσης:\n{self.output_dir}")
+            return
+        pending = journal.pending_files()
+        if not pending:
+            QMessageBox.information(self, "Συνέχεια Επεξεργασίας", f"Η τελευταία μαζική επεξεργασία ({journal.batch['started_at']}, {len(journal.batch['files'])} αρχεία) έχει ολοκληρωθεί.")
+            return
+        reply = QMessageBox.question(self, "Συνέχεια Επεξεργασίας",
+                                     f"Μαζική επεξεργασία της {journal.batch['started_at']}:\n"
+                                     f"{len(journal.finished)} αρχεία ολοκληρώθηκαν, {len(pending)} απομένουν.\n\n"
+                                     "Να συνεχιστεί με τις ρυθμίσεις εκείνης της επεξεργασίας;",
+                                     QMessageBox.Yes | QMessageBox.No, QMessageBox.Yes)
+        if reply != QMessageBox.Yes: return
+
+        self.logger.quiet_hot_path = not self.row_log_check.isChecked()
+        self.logger.info("="*40, category=CATEGORY_UI)
+        self.logger.info(f"Συνέχεια μαζικής επεξεργασίας: {len(pending)} από {len(journal.batch['files'])} αρχεία.", category=CATEGORY_UI)
+        self.logger.info(f"  Φάκελος Εξόδου: {self.output_dir}", category=CATEGORY_UI)
+        self.logger.info("="*40, category=CATEGORY_UI)
+        self.tabs.setCurrentWidget(self.log_tab)
+        self.start_worker(WorkerThread(self.processor, journal.batch['files'], self.output_dir,
+                                       workers=self.workers_spinbox.value(), resume=True, export_metrics=self.metrics_check.isChecked(),
+                                       profile=self.profile_check.isChecked(),
+                                       **journal.batch['settings']))
+
+    def start_worker(self, worker):
+        """Ξεκινά το νήμα επεξεργασίας και συνδέει τα σήματά του με το UI"""
         self.set_ui_enabled(False)
         self.progress_bar.setValue(0)
         self.progress_label.setText("Προετοιμασία επεξεργασίας...")
@@ -634,25 +743,27 @@ class MainWindow(QMainWindow):
         self.progress_bar.setFormat("%p%") 
         self.process_btn.setText(" Επεξεργασία σε Εξέλιξη...")
 
-        
-        self.worker = WorkerThread(
-            self.processor, files_to_process, self.output_dir,
-            threshold, value_col, prop_cols, overwrite,
-            max_split_value, split_mode, auto_numbering, invoice_num_col
-        )
-
-        
-        
+        self.worker = worker
         self.worker.progress_signal.connect(self.update_progress)
+        self.worker.row_progress_signal.connect(self.update_row_progress)
         self.worker.file_signal.connect(self.update_file_label)
+        self.worker.backup_signal.connect(self.update_backup_progress)
         self.worker.finished_signal.connect(self.processing_finished)
         self.worker.finished.connect(self.worker.deleteLater) 
 
         self.worker.start() 
     
 
+    def stop_processing(self):
+        """Ζητά διακοπή της επεξεργασίας (και του αρχείου σε εξέλιξη, σε επόμενο σημείο ελέγχου)."""
+        if self.worker is None or not self.worker.isRunning(): return
+        self.stop_btn.setEnabled(False)
+        self.progress_label.setText("Διακοπή... (ολοκληρώνεται το τρέχον βήμα)")
+        self.worker.requestInterruption()
+
     def update_progress(self, current_step, total_steps):
         """Ενημερώνει ΜΟΝΟ την μπάρα προόδου (τιμή και κείμενο)."""
+        self.progress_files = (current_step, total_steps)
         if total_steps > 0:
             
             
@@ -665,6 +776,27 @@ class MainWindow(QMainWindow):
             self.progress_bar.setFormat("%p%")
 
     
+    def update_row_progress(self, info):
+        """Πρόοδος μέσα στο τρέχον αρχείο (φάση, γραμμές, ρυθμός, υπολοιπόμενος χρόνος)."""
+        current_step, total_steps = getattr(self, 'progress_files', (0, 0))
+        if total_steps > 0 and current_step < total_steps:
+            self.progress_bar.setValue(int((current_step + info['fraction']) / total_steps * 100))
+
+        def number(value): return f"{value:,.0f}".replace(',', '.')
+        phase = PHASE_LABELS.get(info['phase'], info['phase'])
+        status_text = f"Επεξεργασία: {info['file']} — {phase}"
+        if info['rows_done']:
+            rows_total = f"/{number(info['rows_total'])}" if info['rows_total'] else ""
+            status_text += f": {number(info['rows_done'])}{rows_total} γραμμές, {number(info['rows_per_second'])} γρ./s"
+            if info['eta_seconds'] is not None:
+                status_text += f", απομένουν ~{int(info['eta_seconds']) + 1} s"
+        self.progress_label.setText(status_text)
+
+    def update_backup_progress(self, done, total):
+        """Πρόοδος των αντιγράφων ασφαλείας (πριν ξεκινήσει η επεξεργασία)."""
+        self.progress_bar.setValue(int(done / total * 100) if total else 0)
+        self.progress_label.setText(f"Δημιουργία αντιγράφων ασφαλείας... ({done}/{total})")
+
     def update_file_label(self, file_name):
         """Ενημερώνει την ετικέτα κειμένου με το τρέχον αρχείο."""
         
@@ -676,25 +808,48 @@ class MainWindow(QMainWindow):
     
     def processing_finished(self, results):
         """Καλείται όταν το νήμα επεξεργασίας ολοκληρώσει"""
-        self.logger.info("--- Η επεξεργασία ολοκληρώθηκε ---") 
+        backup = results.get('backup')
+        if backup is not None:
+            # Η επεξεργασία δεν ξεκίνησε: αποτυχία ή διακοπή των αντιγράφων ασφαλείας.
+            self.set_ui_enabled(True)
+            self.worker = None
+            self.progress_bar.setValue(0)
+            if backup['failed']:
+                self.logger.error("Η επεξεργασία ακυρώθηκε λόγω αποτυχίας δημιουργίας backup.")
+                self.progress_label.setText("Η επεξεργασία ακυρώθηκε (σφάλμα backup).")
+                details = '\n'.join(f"{path}: {message}" for path, message in backup['failed'].items())
+                QMessageBox.critical(self, "Σφάλμα Backup", f"Αδυναμία δημιουργίας αντιγράφου ασφαλείας για τα αρχεία:\n{details}\n\nΗ επεξεργασία ακυρώθηκε.")
+            else:
+                self.logger.warning("Η επεξεργασία ακυρώθηκε κατά τη δημιουργία αντιγράφων ασφαλείας.", category=CATEGORY_UI)
+                self.progress_label.setText("Η επεξεργασία ακυρώθηκε.")
+            return
+        self.logger.info("--- Η επεξεργασία ολοκληρώθηκε ---", category=CATEGORY_UI)
 
         
         processed_ok = results.get('processed_files', 0)
         skipped = results.get('skipped_files', 0)
+        unchanged = results.get('cache_hits', 0)
+        cancelled = results.get('cancelled_files', 0)
         errors = results.get('errors', 0)
         split_rows = results.get('total_rows_split', 0)
         skipped_impossible = results.get('skipped_impossible_splits', 0)
         multi_splits = results.get('multi_splits_performed', 0)
 
         
-        self.logger.info("\n--- Αποτελέσματα Επεξεργασίας ---")
-        self.logger.info(f"Σύνολο αρχείων προς επεξεργασία: {results.get('total_files', 0)}")
-        self.logger.info(f"Αρχεία που επεξεργάστηκαν: {processed_ok}")
-        self.logger.info(f"Αρχεία που παραλείφθηκαν : {skipped}")
-        self.logger.info(f"Σύνολο γραμμών που διασπάστηκαν: {split_rows}")
+        self.logger.info("\n--- Αποτελέσματα Επεξεργασίας ---", category=CATEGORY_UI)
+        self.logger.info(f"Σύνολο αρχείων προς επεξεργασία: {results.get('total_files', 0)}", category=CATEGORY_UI)
+        self.logger.info(f"Αρχεία που επεξεργάστηκαν: {processed_ok}", category=CATEGORY_UI)
+        self.logger.info(f"Αρχεία που παραλείφθηκαν : {skipped}", category=CATEGORY_UI)
+        if unchanged > 0:
+            self.logger.info(f"Αρχεία αμετάβλητα από την προηγούμενη εκτέλεση: {unchanged}", category=CATEGORY_UI)
+        if cancelled > 0:
+            self.logger.info(f"Αρχεία που διακόπηκαν (χωρίς αρχείο εξόδου): {cancelled}", category=CATEGORY_UI)
+        self.logger.info(f"Σύνολο γραμμών που διασπάστηκαν: {split_rows}", category=CATEGORY_UI)
         if multi_splits > 0:
-             self.logger.info(f"  (Εκ των οποίων {multi_splits} διασπάστηκαν σε >2 μέρη)")
-        self.logger.info(f"Σύνολο αποτυχημένων διασπάσεων: {skipped_impossible}")
+             self.logger.info(f"  (Εκ των οποίων {multi_splits} διασπάστηκαν σε >2 μέρη)", category=CATEGORY_UI)
+        self.logger.info(f"Σύνολο αποτυχημένων διασπάσεων: {skipped_impossible}", category=CATEGORY_UI)
+        if results.get('timings'):
+            self.logger.info(f"Χρόνοι ανά φάση: {timings_summary(results['timings'])} (συνολικά {results.get('elapsed_seconds', 0):.1f}s)", category=CATEGORY_UI)
 
         failed_splits_details = []
         for file_name, file_res in results.get('file_results', {}).items():
@@ -702,16 +857,16 @@ class MainWindow(QMainWindow):
                  failed_splits_details.extend(file_res['skipped_details'])
 
         if failed_splits_details:
-            self.logger.info("Αποτυχημένες διασπάσεις:") 
+            self.logger.info("Αποτυχημένες διασπάσεις:", category=CATEGORY_UI)
             unique_failures = set()
             for failure in failed_splits_details:
                  fail_str = f"- Αρχείο: {failure['file']}, Φύλλο: {failure['sheet']}, Γραμμή: {failure['row']}, Ποσό: {failure['value']}"
                  if fail_str not in unique_failures:
-                      self.logger.info(fail_str) 
+                      self.logger.info(fail_str, category=CATEGORY_UI)
                       unique_failures.add(fail_str)
         elif errors > 0 : 
-             self.logger.info(f"Σύνολο σφαλμάτων κατά την επεξεργασία: {errors}")
-        self.logger.info("---------------------------------")
+             self.logger.info(f"Σύνολο σφαλμάτων κατά την επεξεργασία: {errors}", category=CATEGORY_UI)
+        self.logger.info("---------------------------------", category=CATEGORY_UI)
         
 
         
@@ -736,6 +891,8 @@ class MainWindow(QMainWindow):
         msg_title = "Ολοκλήρωση Επεξεργασίας"
         msg_details = (f"Επεξεργάστηκαν: {processed_ok}\n"
                        f"Παραλείφθηκαν: {skipped}\n"
+                       f"Αμετάβλητα (manifest): {unchanged}\n"
+                       f"Διακόπηκαν: {cancelled}\n"
                        f"Αδύνατες Διασπάσεις: {skipped_impossible}\n"
                        f"Σφάλματα: {errors}\n\n"
                        f"Τα νέα αρχεία βρίσκονται:\n{self.output_dir}")
@@ -757,8 +914,12 @@ class MainWindow(QMainWindow):
         self.process_btn.setIcon(self.style().standardIcon(QStyle.SP_MediaPlay)) 
 
     def set_ui_enabled(self, enabled):
-        """Ενεργοποιεί/απενεργοποιεί στοιχεία του UI"""
-        self.split_tab.setEnabled(enabled)
+        """Ενεργοποιεί/απενεργοποιεί στοιχεία του UI (το κουμπί διακοπής μόνο κατά την επεξεργασία)"""
+        self.file_group.setEnabled(enabled)
+        self.output_group.setEnabled(enabled)
+        self.process_btn.setEnabled(enabled)
+        self.resume_btn.setEnabled(enabled)
+        self.stop_btn.setEnabled(not enabled)
         self.settings_tab.setEnabled(enabled)
     
     
@@ -776,10 +937,21 @@ class MainWindow(QMainWindow):
             prop2 = settings.value(SETTING_PROP_COL2, 19, type=int)
             backup = settings.value(SETTING_CREATE_BACKUP, True, type=bool)
             overwrite = settings.value(SETTING_OVERWRITE, False, type=bool)
+            incremental = settings.value(SETTING_INCREMENTAL, False, type=bool)
+            row_log = settings.value(SETTING_ROW_LOG, False, type=bool)
+            export_metrics_enabled = settings.value(SETTING_EXPORT_METRICS, False, type=bool)
+            profile = settings.value(SETTING_PROFILE, False, type=bool)
+            backup_archive = settings.value(SETTING_BACKUP_ARCHIVE, False, type=bool)
             output_dir = settings.value(SETTING_OUTPUT_DIR, default_output, type=str)
             integer_split = settings.value(SETTING_INTEGER_SPLIT, False, type=bool)
             auto_numbering = settings.value(SETTING_AUTO_NUMBERING, False, type=bool)
             invoice_num_col = settings.value(SETTING_INVOICE_NUM_COL, 2, type=int)
+            backend = settings.value(SETTING_BACKEND, BACKEND_COM, type=str)
+            bulk_write = settings.value(SETTING_BULK_WRITE, False, type=bool)
+            workers = settings.value(SETTING_WORKERS, 1, type=int)
+            seed_enabled = settings.value(SETTING_SEED_ENABLED, False, type=bool)
+            split_seed = settings.value(SETTING_SPLIT_SEED, 0, type=int)
+            seed_scope = settings.value(SETTING_SEED_SCOPE, SEED_SCOPE_ROW, type=str)
 
 
             if not os.path.isdir(output_dir): output_dir = default_output
@@ -787,6 +959,14 @@ class MainWindow(QMainWindow):
             self.integer_split_check.setChecked(integer_split)
             self.auto_numbering_check.setChecked(auto_numbering)
             self.invoice_num_spinbox.setValue(invoice_num_col)
+            backend_index = self.backend_combo.findData(backend)
+            self.backend_combo.setCurrentIndex(backend_index if backend_index >= 0 else 0)
+            self.bulk_write_check.setChecked(bulk_write)
+            self.workers_spinbox.setValue(workers)
+            self.seed_check.setChecked(seed_enabled)
+            self.seed_spinbox.setValue(split_seed)
+            seed_scope_index = self.seed_scope_combo.findData(seed_scope)
+            self.seed_scope_combo.setCurrentIndex(seed_scope_index if seed_scope_index >= 0 else 0)
             self.threshold_spinbox.setValue(threshold)
             self.max_split_value_spinbox.setValue(max_split)
             self.value_col_spinbox.setValue(val_col)
@@ -794,10 +974,15 @@ class MainWindow(QMainWindow):
             self.prop_col2_spinbox.setValue(prop2)
             self.create_backup_check.setChecked(backup)
             self.overwrite_check.setChecked(overwrite)
+            self.incremental_check.setChecked(incremental)
+            self.row_log_check.setChecked(row_log)
+            self.metrics_check.setChecked(export_metrics_enabled)
+            self.profile_check.setChecked(profile)
+            self.backup_archive_check.setChecked(backup_archive)
             self.output_dir = output_dir
             self.output_path_edit.setText(output_dir)
 
-            if self.logger: self.logger.info("Οι ρυθμίσεις φορτώθηκαν.")
+            if self.logger: self.logger.info("Οι ρυθμίσεις φορτώθηκαν.", category=CATEGORY_UI)
         except Exception as e:
             if self.logger: self.logger.error(f"Σφάλμα φόρτωσης ρυθμίσεων: {e}", exc_info=True)
             
@@ -815,6 +1000,12 @@ class MainWindow(QMainWindow):
             settings.setValue(SETTING_INTEGER_SPLIT, self.integer_split_check.isChecked())
             settings.setValue(SETTING_AUTO_NUMBERING, self.auto_numbering_check.isChecked())
             settings.setValue(SETTING_INVOICE_NUM_COL, self.invoice_num_spinbox.value())
+            settings.setValue(SETTING_BACKEND, self.backend_combo.currentData())
+            settings.setValue(SETTING_BULK_WRITE, self.bulk_write_check.isChecked())
+            settings.setValue(SETTING_WORKERS, self.workers_spinbox.value())
+            settings.setValue(SETTING_SEED_ENABLED, self.seed_check.isChecked())
+            settings.setValue(SETTING_SPLIT_SEED, self.seed_spinbox.value())
+            settings.setValue(SETTING_SEED_SCOPE, self.seed_scope_combo.currentData())
             
             settings.setValue(SETTING_THRESHOLD, self.threshold_spinbox.value())
             if self.logger: self.logger.debug(f"  Saving Threshold: {self.threshold_spinbox.value()}")
@@ -837,10 +1028,16 @@ class MainWindow(QMainWindow):
             settings.setValue(SETTING_OVERWRITE, self.overwrite_check.isChecked())
             if self.logger: self.logger.debug(f"  Saving Overwrite: {self.overwrite_check.isChecked()}")
 
+            settings.setValue(SETTING_INCREMENTAL, self.incremental_check.isChecked())
+            settings.setValue(SETTING_ROW_LOG, self.row_log_check.isChecked())
+            settings.setValue(SETTING_EXPORT_METRICS, self.metrics_check.isChecked())
+            settings.setValue(SETTING_PROFILE, self.profile_check.isChecked())
+            settings.setValue(SETTING_BACKUP_ARCHIVE, self.backup_archive_check.isChecked())
+
             settings.setValue(SETTING_OUTPUT_DIR, self.output_dir)
             if self.logger: self.logger.debug(f"  Saving Output Dir: {self.output_dir}")
 
-            if self.logger: self.logger.info("Οι ρυθμίσεις αποθηκεύτηκαν.")
+            if self.logger: self.logger.info("Οι ρυθμίσεις αποθηκεύτηκαν.", category=CATEGORY_UI)
         except Exception as e:
              if self.logger: self.logger.error(f"Σφάλμα κατά την αποθήκευση ρυθμίσεων: {e}", exc_info=True)
 
@@ -859,7 +1056,7 @@ class MainWindow(QMainWindow):
             else:
                 event.ignore()
         else:
-            self.logger.info("Κλείσιμο εφαρμογής.")
+            self.logger.info("Κλείσιμο εφαρμογής.", category=CATEGORY_UI)
             
             self.save_settings()
             event.accept()
\ No newline at end of file